@@ -1,13 +1,16 @@
-import asyncio
+import asyncio, time
 from pathlib import Path
-from typing import Optional, Union, Any, Dict
+from typing import Optional, Union, Any, Dict, List, Set
 
 from utils.DB import AsyncFlightDBManager
+from utils.DB.sketches import report_summary, save_report
 from modules.AerolineasARG import FlightDealAnalyzer
 from utils import (
     AsyncMessageHandler,
     AsyncConfigManager,
     NotifyDiscord,
+    PersistentLRUCache,
+    AdmissionController,
     KafkaProducerManager,
     KafkaConsumerManager
 )
@@ -30,6 +33,24 @@ class AerolineasConsumerFlights:
         self.db_flights = AsyncFlightDBManager()
         # --- Checker Deals ---
         self.deals_analyzer:FlightDealAnalyzer = None
+        # --- Write-Behind Buffer: Hash -> (Provider, Price Transitions) ---
+        self.write_buffer:Dict[str, Dict[str, Any]] = dict()
+        self.buffer_waiters:List[asyncio.Future] = list()
+        self.flush_lock = asyncio.Lock()
+        self.flush_timer:Optional[asyncio.Task] = None
+        # --- Size Triggered Flushes, Kept So They Finish Before Shutdown ---
+        self.flush_tasks:Set[asyncio.Task] = set()
+        # --- Latest Calendar Scope Per (Provider, Route, Window), Reconciled After Each Flush ---
+        self.pending_scopes:Dict[tuple, Dict[str, Any]] = dict()
+        # --- Bounded Flight Workers, Sized From The DB Pool ---
+        self.admission:AdmissionController = None
+        self.metrics_task:Optional[asyncio.Task] = None
+        # --- Hot State: Hash -> Fingerprint Of The Current Row ---
+        self.flight_states:Optional[PersistentLRUCache] = None
+        self.skipped_flights:int = 0
+        self.reconciled_flights:int = 0
+        # --- Streaming Quartiles: Persisted Every Few Seconds, Reconciled Against SQL Every Few Hours ---
+        self.sketches_task:Optional[asyncio.Task] = None
         # --- Logger ---
         self.logger = AsyncMessageHandler(
             log_filename = log_name,
@@ -39,34 +60,224 @@ class AerolineasConsumerFlights:
 
 
     async def load_configs(self) -> None:
-        await self.db_flights.connect_db()
+        await self.db_flights.connect_db("ingest", "deals")
         
         configs = AsyncConfigManager()
+        general = await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas")
+        # --- Changes Topic Unless The Producer Only Publishes Snapshots ---
+        calendar_cache = general.get("calendar_cache", dict())
+        source_topic = (
+            "producer_to_etl"
+            if not calendar_cache.get("enabled", True) or calendar_cache.get("publish_mode", "changes") == "snapshot"
+            else "producer_changes"
+        )
         self.configs = {
             "admin": await configs.get_configs("monitor_configs", "admin_configs", "webhooks"),
-            "general": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas"),
-            "kafka_topic": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "kafka_topics", "producer_to_etl"),
+            "general": general,
+            "kafka_topic": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "kafka_topics", source_topic),
             "kafka_topic_notifyer": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "kafka_topics", "etl_to_notifier"),
             "deals_configs": await configs.get_configs("monitor_configs", "flights", "deals_configs"),
         }
         self.kafka_consumer = KafkaConsumerManager(
             topic = self.configs["kafka_topic"]["name"],
             group_id = self.configs["kafka_topic"]["group_id"],
-            max_workers = self.configs["kafka_topic"]["max_workers"]
+            max_workers = self.configs["kafka_topic"]["max_workers"],
+            # --- Buffered Messages Commit Only Once Their Flush Lands ---
+            enable_auto_commit = not self.buffer_configs.get("enabled", False),
+            # --- A Failed Flush Is Retried, Then The Consumer Stops Instead Of Stalling Its Commits ---
+            max_retries = self.buffer_configs.get("max_retries", 3),
+            retry_delay = self.buffer_configs.get("retry_delay_seconds", 1.0)
         )
         self.deals_analyzer = FlightDealAnalyzer(
             configs = self.configs["deals_configs"],
             db_flights = self.db_flights
         )
+        admission_configs = self.configs["general"].get("admission", dict())
+        self.admission = AdmissionController(
+            workers = max(1, self.db_flights.pool_size("ingest") * admission_configs.get("workers_per_connection", 2)),
+            queue_size = admission_configs.get("queue_size", 500)
+        )
+        await self.admission.start()
+        # --- Month Partitions Up To The Scrape Horizon, In Case The Partitions Job Fell Behind ---
+        partitions_configs = await configs.get_configs("monitor_configs", "database", "partitions") or dict()
+        await self.db_flights.ensure_partitions(
+            self.configs["general"]["max_month_scraping"] + partitions_configs.get("extra_months_ahead", 1),
+            pool_name = "ingest"
+        )
+        await self.warm_flight_states()
+        await self.init_price_sketches()
         await self.kafka_producer.connect_broker()
         await self.kafka_consumer.connect_broker()
 
+    async def warm_flight_states(self) -> None:
+        states_configs = self.configs["general"].get("flight_states", dict())
+        if not states_configs.get("enabled", True):
+            return
+
+        max_entries = states_configs.get("max_entries", 200_000)
+        self.flight_states = PersistentLRUCache(max_entries = max_entries)
+        warm_source = states_configs.get("warm_source", "db")
+        parquet_path = Path(states_configs.get("parquet_path", "./FlightsData/AerolineasARG/flights_calendar.parquet"))
+
+        # --- A Stale Export Would Hide Real Changes, Fall Back To The DB ---
+        if warm_source == "parquet" and (
+            not parquet_path.exists()
+            or time.time() - parquet_path.stat().st_mtime > states_configs.get("parquet_max_age_minutes", 60) * 60
+        ):
+            await self.logger.warning(f'Flights Export Missing Or Stale, Warming From DB | Path: {parquet_path}')
+            warm_source = "db"
+
+        if warm_source == "parquet":
+            fingerprints = await asyncio.to_thread(
+                self.db_flights.load_calendar_fingerprints, parquet_path, max_entries
+            )
+        elif warm_source == "db":
+            fingerprints = await self.db_flights.get_calendar_fingerprints(max_entries)
+        else:
+            fingerprints = dict()
+
+        for hash_id, fingerprint in fingerprints.items():
+            self.flight_states.set(hash_id, fingerprint)
+        await self.logger.info(f'Flight States Warmed | Source: {warm_source} | Entries: {len(self.flight_states)}')
+
+    # --- Unknown Hashes Always Reach The DB ---
+    def is_unchanged(self,
+        hash_id:str,
+        flight:Dict[str, Any]
+    ) -> bool:
+
+        if self.flight_states is None:
+            return False
+        if self.flight_states.get(hash_id) != self.db_flights.flight_fingerprint(flight):
+            return False
+        self.skipped_flights += 1
+        return True
+
+    def remember_flight(self,
+        hash_id:str,
+        flight:Optional[Dict[str, Any]]
+    ) -> None:
+
+        if self.flight_states is None:
+            return
+        if flight is None:
+            self.flight_states.pop(hash_id)
+        else:
+            self.flight_states.set(hash_id, self.db_flights.flight_fingerprint(flight))
+
+
+    # --- Changes Carry Their Scope From The Producer, A Full Snapshot Is Its Own Scope ---
+    def calendar_scope(self,
+        message:Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+
+        if not self.configs["general"].get("reconcile_missing", True):
+            return None
+        if message.get("calendar"):
+            return message["calendar"]
+        if message.get("message_type") or not message.get("params") or not message.get("flights"):
+            return None
+
+        provider, flights = message["provider"], message["flights"]
+        return self.db_flights.calendar_scope(
+            provider,
+            message["params"]["fly_from"],
+            message["params"]["fly_to"],
+            [flight["time_departure"] for flight in flights],
+            [
+                self.db_flights.generate_flight_hash(
+                    flight["iata_origin"],
+                    flight["iata_destination"],
+                    flight["time_departure"],
+                    provider,
+                    flight["airline"]
+                )[1]
+                for flight in flights
+                if flight.get("active")
+            ]
+        )
+
+    # --- Inactive Days Inside The Window Are Left To The Window UPDATE ---
+    def outside_scope(self,
+        flight:Dict[str, Any],
+        scope:Optional[Dict[str, Any]]
+    ) -> bool:
+
+        if not scope or flight.get("active") is not False:
+            return True
+        departure = self.db_flights.parse_departure_date(flight["time_departure"])
+        return not (
+            self.db_flights.parse_departure_date(scope["window_start"])
+            <= departure
+            < self.db_flights.parse_departure_date(scope["window_end"])
+        )
+
+    async def reconcile_calendars(self,
+        scopes:List[Dict[str, Any]]
+    ) -> int:
+
+        flipped = await self.db_flights.mark_missing_unavailable(scopes)
+        for hash_id in flipped:
+            self.remember_flight(hash_id, {"active": False})
+        self.reconciled_flights += len(flipped)
+        return len(flipped)
+
+
+# ---------- Price Sketches ----------
+    async def init_price_sketches(self) -> None:
+        sketches_configs = self.configs["general"].get("price_sketches", dict())
+        if not sketches_configs.get("enabled", False):
+            return
+
+        loaded = await self.db_flights.load_price_sketches(sketches_configs.get("relative_accuracy", 0.01))
+        # --- First Run (Or A New Accuracy): Bootstrap From The Exact Prices Once ---
+        if not loaded:
+            await self.reconcile_price_sketches()
+        await self.logger.info(f'Price Sketches Loaded | Groups: {len(self.db_flights.sketches)} | From Table: {loaded}')
+        self.sketches_task = asyncio.create_task(self.maintain_price_sketches())
+
+    async def maintain_price_sketches(self) -> None:
+        sketches_configs = self.configs["general"].get("price_sketches", dict())
+        persist_seconds = sketches_configs.get("persist_seconds", 30)
+        reconcile_seconds = sketches_configs.get("reconcile_hours", 6) * 3600
+        last_reconcile = time.monotonic()
+        while True:
+            await asyncio.sleep(persist_seconds)
+            try:
+                if time.monotonic() - last_reconcile >= reconcile_seconds:
+                    await self.reconcile_price_sketches()
+                    last_reconcile = time.monotonic()
+                await self.db_flights.persist_price_sketches()
+
+            except Exception as err:
+                await self.logger.error(
+                    f'Price Sketches Maintenance Failed | Type: {type(err).__name__} | Message: {str(err)}'
+                )
+
+    async def reconcile_price_sketches(self) -> None:
+        missed_removals = self.db_flights.sketches.missed_removals
+        report = await self.db_flights.reconcile_price_sketches()
+        report_path = self.configs["general"].get("price_sketches", dict()).get(
+            "report_path", "./FlightsData/AerolineasARG/reports/price_sketches.csv"
+        )
+        await asyncio.to_thread(save_report, report, report_path)
+        await self.db_flights.persist_price_sketches()
+        await self.logger.info(
+            f'Price Sketches Reconciled | {report_summary(report)} | Missed Removals: {missed_removals} | Report: {report_path}'
+        )
+
+
+    @property
+    def buffer_configs(self) -> Dict[str, Any]:
+        return self.configs.get("general", dict()).get("write_buffer", dict())
+
 
 # ---------- Main Method. ----------
     async def init_consumer(self) -> None:
         try:
             await self.load_configs()
             await self.logger.critical('Init Module Aerolineas Flights Consumer')
+            self.metrics_task = asyncio.create_task(self.report_metrics())
 
             await self.kafka_consumer.consume_messages(self.handler)
 
@@ -84,29 +295,179 @@ class AerolineasConsumerFlights:
                 hidden_msg = response_webhook
             )
         finally:
+            if self.metrics_task:
+                self.metrics_task.cancel()
+            if self.sketches_task:
+                self.sketches_task.cancel()
+            if self.flush_tasks:
+                await asyncio.gather(*self.flush_tasks, return_exceptions = True)
+            await self.flush_buffer()
+            if self.db_flights.sketches is not None:
+                try:
+                    await self.db_flights.persist_price_sketches()
+                except Exception as err:
+                    await self.logger.error(f'Price Sketches Not Persisted On Shutdown | Message: {str(err)}')
+            if self.admission:
+                await self.admission.close()
             await self.db_flights.disconnect_db()
             await self.kafka_producer.disconnect_broker()
             await self.kafka_consumer.disconnect_broker()
             await self.logger.shutdown()
 
 
+    async def report_metrics(self) -> None:
+        interval = self.configs["general"].get("admission", dict()).get("metrics_interval_seconds", 60)
+        while True:
+            await asyncio.sleep(interval)
+            await self.logger.info(
+                f'Admission: {self.admission.metrics()} | Reconciled Unavailable: {self.reconciled_flights} | DB Pool: {self.db_flights.pool_metrics()} | Statements: {self.db_flights.statements.stats()}'
+            )
+
+
 # ---------- Process Data ----------
     async def handler(self,
         message:Dict[str, Any]
     ) -> None:
         
-        flights = message.get("flights")
-        if not flights:
+        # --- Unchanged Calendar Heartbeat, Nothing To Compare Or Store ---
+        if message.get("message_type") == "seen":
+            return
+
+        scope = self.calendar_scope(message)
+        flights = [
+            flight for flight in message.get("flights") or list()
+            if self.outside_scope(flight, scope)
+        ]
+        if not flights and not scope:
+            return
+
+        if self.buffer_configs.get("enabled", False):
+            # --- Returns Once The Flights Are Flushed, Then The Offset Can Commit ---
+            await self.buffer_flights(message["provider"], flights, scope)
             return
         
-        tasks = list()
+        # --- Waits For Queue Room Under Bursts Instead Of Spawning A Task Per Flight ---
+        await self.admission.map(
+            self.manage_flights,
+            [(message["provider"], flight) for flight in flights]
+        )
+        if scope:
+            await self.reconcile_calendars([scope])
+
+
+    def buffer_flights(self,
+        provider:str,
+        flights:List[Dict[str, Any]],
+        scope:Optional[Dict[str, Any]] = None
+    ) -> asyncio.Future:
+
         for flight in flights:
-            tasks.append(
-                asyncio.create_task(
-                    self.manage_flights(message["provider"], flight)
-                )
+            _, hash_id = self.db_flights.generate_flight_hash(
+                flight["iata_origin"],
+                flight["iata_destination"],
+                flight["time_departure"],
+                provider,
+                flight["airline"]
             )
-        await asyncio.gather(*tasks, return_exceptions = True)
+            # --- Nothing Pending For It & Same As The Stored Row ---
+            if hash_id not in self.write_buffer and self.is_unchanged(hash_id, flight):
+                continue
+            entry = self.write_buffer.setdefault(hash_id, {"provider": provider, "transitions": list()})
+            transitions = entry["transitions"]
+            # --- Same Price As The Last Copy: Last Write Wins. New Price: Keep The Transition ---
+            if transitions and self.price_point(transitions[-1]) == self.price_point(flight):
+                transitions[-1] = flight
+            else:
+                transitions.append(flight)
+
+        # --- Runs After The Batch, So A Vanished Flight Still Buffered From An Older Response Ends Unavailable ---
+        if scope:
+            self.pending_scopes[
+                (scope["provider"], scope["iata_origin"], scope["iata_destination"], scope["window_start"], scope["window_end"])
+            ] = scope
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.buffer_waiters.append(waiter)
+
+        if len(self.write_buffer) >= self.buffer_configs.get("max_flights", 500):
+            flush_task = asyncio.create_task(self.flush_buffer())
+            self.flush_tasks.add(flush_task)
+            flush_task.add_done_callback(self.flush_tasks.discard)
+        elif not self.flush_timer:
+            self.flush_timer = asyncio.create_task(self._flush_after_window())
+        return waiter
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.buffer_configs.get("window_seconds", 2.0))
+        await self.flush_buffer()
+
+    async def flush_buffer(self) -> None:
+        async with self.flush_lock:
+            if self.flush_timer and self.flush_timer is not asyncio.current_task():
+                self.flush_timer.cancel()
+            self.flush_timer = None
+
+            entries, waiters, scopes = self.write_buffer, self.buffer_waiters, self.pending_scopes
+            self.write_buffer, self.buffer_waiters, self.pending_scopes = dict(), list(), dict()
+            if not entries and not waiters:
+                return
+
+            try:
+                results, errors = await self.db_flights.insert_or_update_calendar_batch(
+                    [(entry["provider"], entry["transitions"]) for entry in entries.values()]
+                )
+                for hash_id, entry in entries.items():
+                    self.remember_flight(hash_id, entry["transitions"][-1])
+                for error in errors:
+                    self.remember_flight(error["hash_id"], None)
+                    await self.logger.error(f'Flight Could Not Be Saved While Flushing Buffer | Context: {error}')
+                reconciled = await self.reconcile_calendars(list(scopes.values()))
+
+                # --- Every Price Transition That Reached The History Gets Analyzed, One Deal Context Query ---
+                written = [
+                    (entries[hash_id]["provider"], hash_id, flight)
+                    for hash_id, flight, status in results
+                    if status
+                ]
+                try:
+                    # --- Scored As Arrays, Only The Hits Reach "analyze_flight" ---
+                    hits = await self.deals_analyzer.analyze_batch([flight for _, _, flight in written])
+                    analyze_args = [(*written[index], alerts) for index, alerts in sorted(hits.items())]
+                except Exception as err:
+                    # --- The Rows Are Already Stored, Fall Back To Analyzing Flight By Flight ---
+                    await self.logger.error(
+                        f'Batch Deal Analysis Failed | Type: {type(err).__name__} | Message: {str(err)}'
+                    )
+                    analyze_args = [(*entry, None) for entry in written]
+                await self.admission.map(self.analyze_flight, analyze_args)
+                await self.logger.info(
+                    f'Buffer Flushed | Messages: {len(waiters)} | Flights: {len(entries)} | Writes: {len(results)} | Errors: {len(errors)} | Marked Unavailable: {reconciled} | Skipped Unchanged: {self.skipped_flights}'
+                )
+
+            except Exception as err:
+                for hash_id in entries:
+                    self.remember_flight(hash_id, None)
+                await self.logger.critical(
+                    f'Unknown Fatal Error While Flushing Flights Buffer | Type: {type(err).__name__} | Message: {str(err)}'
+                )
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(err)
+                return
+
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+
+    # --- Seats Alone Never Make A Transition ---
+    @staticmethod
+    def price_point(
+        flight:Dict[str, Any]
+    ) -> tuple:
+
+        offer = flight["offers"][0] if flight.get("active") and flight.get("offers") else {}
+        return flight.get("active"), offer.get("class"), offer.get("price")
 
 
     async def manage_flights(self,
@@ -114,13 +475,42 @@ class AerolineasConsumerFlights:
         flight:Dict[str, Any]
     ) -> None:
         
+        _, hash_id = self.db_flights.generate_flight_hash(
+            flight["iata_origin"],
+            flight["iata_destination"],
+            flight["time_departure"],
+            provider,
+            flight["airline"]
+        )
+        if self.is_unchanged(hash_id, flight):
+            return
+
         try:
             hash_id, status = await self.db_flights.insert_or_update_calendar_entry(provider, flight)
+            self.remember_flight(hash_id, flight)
             if not status:
                 return
-            
-            # --- Check If Any Alerts Are Active ---
-            alerts = await self.deals_analyzer.analyze_deals(flight)
+            await self.analyze_flight(provider, hash_id, flight)
+
+        except Exception as err:
+            self.remember_flight(hash_id, None)
+            await self.logger.critical(
+                f'Unknown Fatal Error While Processing When Check & Saving Deals | Type: {type(err).__name__} | Message: {str(err)}'
+            )
+            raise
+
+
+    async def analyze_flight(self,
+        provider:str,
+        hash_id:str,
+        flight:Dict[str, Any],
+        alerts:Optional[Dict[str, Dict]] = None
+    ) -> None:
+
+        try:
+            # --- Check If Any Alerts Are Active, The Buffer Flush Brings Them Precomputed ---
+            if alerts is None:
+                alerts = await self.deals_analyzer.analyze_deals(flight)
             alerts_actives = [key for key, val in alerts.items() if val["active"]]
 
             if alerts_actives:
@@ -141,7 +531,7 @@ class AerolineasConsumerFlights:
 
         except Exception as err:
             await self.logger.critical(
-                f'Unknown Fatal Error While Processing When Check & Saving Deals | Type: {type(err).__name__} | Message: {str(err)}'
+                f'Unknown Fatal Error While Checking Deals & Sending Notify | Type: {type(err).__name__} | Message: {str(err)}'
             )
             raise
 
@@ -1,29 +1,37 @@
-import asyncio, random
+import asyncio, queue, time
+from collections import Counter
 from pathlib import Path
 from itertools import product
-from asyncio import Condition
 from timeit import default_timer
+from multiprocessing.queues import Queue as ProcessQueue
 from datetime import date, timedelta
 from typing import Optional, Union, Any, Dict, Tuple, List
 
 from utils.DB import DBTokensManager, AsyncFlightDBManager
-from modules.AerolineasARG import AerolineasScraper, FlightQueryParams
+from modules.AerolineasARG import AerolineasScraper, FlightQueryParams, FlightsResult, FlightRecord, TokenPool
 from utils import (
     AsyncMessageHandler,
     AsyncConfigManager,
     NotifyDiscord,
     KafkaProducerManager,
+    PersistentLRUCache,
 
     # --- Exceptions ---
     ExpiredTokenAPI,
+    UnauthorizedTokenAPI,
     RequestsBlocked,
     InvalidPastDate,
     GdsResponseError,
     SiteServiceDown,
-    InvalidRequests
+    InvalidRequests,
+    DBTokensError
 )
 
 
+# --- Results Queue Marker: One (Route, Month) Task Finished ---
+TASK_DONE:str = "task_done"
+
+
 class AerolineasProducerScraperFlights(AerolineasScraper):
     def __init__(self,
         log_name:Optional[str] = "ProducerFlightsCalendar", 
@@ -40,12 +48,16 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
         # --- Tasks Attribute ---
         self.semaphore: asyncio.Semaphore = None
         self.queue = asyncio.Queue()
+        # --- Worker Process Attribute ---
+        self.results_queue:Optional[ProcessQueue] = None
+        # --- Calendar States (Route, Month): Fingerprint + Last Known Flights ---
+        self.calendar_states:Optional[PersistentLRUCache] = None
+        self.cycle_stats:Counter = Counter()
         # --- DB Tokens & Flights ---
         self.db_flights = AsyncFlightDBManager()
         self.db_tokens = DBTokensManager()
         # --- Tokens Attribute ---
-        self.active_bearerTokens = list()
-        self._token_condition = Condition()
+        self.token_pool:TokenPool = None
         # --- Logger ---
         self.logger = AsyncMessageHandler(
             log_filename = log_name,
@@ -54,16 +66,32 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
         )
 
 # ---------- Load Configs ----------
-    async def load_configs(self) -> None:
+    async def load_configs(self,
+        max_workers:Optional[int] = None,
+        persist_states:bool = True,
+        total_processes:int = 1
+    ) -> None:
+
         configs = AsyncConfigManager()
         self.configs = {
             "admin": await configs.get_configs("monitor_configs", "admin_configs", "webhooks"),
             "general": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas"),
             "kafka_topic": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "kafka_topics", "producer_to_etl"),
+            "kafka_topic_changes": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "kafka_topics", "producer_changes"),
             "airports_list": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "airports_scraping")
         }
-        self.max_workers = self.configs["general"].get("max_threads_monitor_month", 1)
+        self.max_workers = max_workers or self.configs["general"].get("max_threads_monitor_month", 1)
         self.semaphore = asyncio.Semaphore(self.max_workers)
+        # --- Every Process Leases The Same Tokens, Each Gets Its Share Of The Per Token Rate ---
+        pool_configs = dict(self.configs["general"].get("tokens_pool", dict()))
+        if pool_configs.get("max_requests_per_second"):
+            pool_configs["max_requests_per_second"] /= max(1, total_processes)
+        self.token_pool = TokenPool(**pool_configs)
+        self.transport.configure(**self.configs["general"].get("http_transport", dict()))
+        # --- Worker Processes Keep It In Memory, The Supervisor Persists It ---
+        self.calendar_states = type(self).create_calendar_cache(self.configs["general"], persist_states)
+        if self.calendar_states is not None:
+            await asyncio.to_thread(self.calendar_states.load)
 
         await self.db_tokens.connect_db()
         await self.db_flights.connect_db()
@@ -79,17 +107,21 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
 
             # --- Load Bearer Tokens ---
             asyncio.create_task(self.load_bearerTokens())
-            await self.wait_load_random_tokens()
+            asyncio.create_task(self.report_tokens_health())
+            await self.token_pool.wait_ready()
             await self.logger.success('Valid Bearer Token Loaded. Starting process...')
 
             while True:
                 start_time = default_timer()
 
                 await self.run_tasks()
+                if self.calendar_states is not None:
+                    await asyncio.to_thread(self.calendar_states.save)
 
                 await self.logger.critical(
-                    f'Finish Cycle, Restart Process... | Lap time: {type(self).format_time_task(default_timer() - start_time)}'
+                    f'Finish Cycle, Restart Process... | Lap time: {type(self).format_time_task(default_timer() - start_time)} | Calendars: {dict(self.cycle_stats)} | Tokens: {self.token_pool.summary()} | Transport: {self.transport.summary()}'
                 )
+                self.cycle_stats.clear()
 
         except Exception as err:
             message_error = f'Error Fatal, Kill Process | Type: {type(err).__name__} | Message: {str(err)}'
@@ -109,8 +141,91 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
             await self.db_tokens.disconnect_db()
             await self.db_flights.disconnect_db()
             await self.kafka_producer.disconnect_broker()
+            await self.transport.aclose()
             await self.logger.shutdown()
 
+    # --- Worker Process Mode ---
+    async def init_worker_process(self,
+        worker_id:int,
+        tasks_queue:ProcessQueue,
+        max_workers:int,
+        results_queue:Optional[ProcessQueue] = None,
+        total_processes:int = 1
+    ) -> None:
+
+        workers:List[asyncio.Task] = list()
+        try:
+            # --- Configs ---
+            await self.load_configs(
+                max_workers = max_workers,
+                persist_states = False,
+                total_processes = total_processes
+            )
+            self.queue = asyncio.Queue(maxsize = self.max_workers)
+            self.results_queue = results_queue
+            await self.logger.critical(f'Init Aerolineas Flights Producer, Worker Process {worker_id} | Workers: {self.max_workers}')
+
+            # --- Load Bearer Tokens ---
+            asyncio.create_task(self.load_bearerTokens())
+            asyncio.create_task(self.report_tokens_health())
+            await self.token_pool.wait_ready()
+            await self.logger.success(f'[Process {worker_id}] Valid Bearer Token Loaded. Waiting Tasks...')
+
+            workers = [
+                asyncio.create_task(self._worker(i))
+                for i in range(self.max_workers)
+            ]
+            await self._feeder(tasks_queue)
+            await self.queue.join()
+
+        except Exception as err:
+            message_error = f'Error Fatal, Kill Worker Process {worker_id} | Type: {type(err).__name__} | Message: {str(err)}'
+            # --- Send Status to Discord ---
+            _, response_webhook = await self.notifyer.error_admin(
+                URL_Webhook = self.configs["admin"]["status_monitors"],
+                store_data = self.configs["general"],
+                problem_logs = message_error
+            )
+            # --- Save Log ---
+            await self.logger.error(
+                message = message_error,
+                hidden_msg = response_webhook
+            )
+
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(
+                *workers,
+                return_exceptions = True
+            )
+            await self.db_tokens.disconnect_db()
+            await self.db_flights.disconnect_db()
+            await self.kafka_producer.disconnect_broker()
+            await self.transport.aclose()
+            await self.logger.shutdown()
+
+    # --- Pull Tasks From Supervisor ---
+    async def _feeder(self,
+        tasks_queue:ProcessQueue
+    ) -> None:
+
+        while True:
+            try:
+                item = await asyncio.to_thread(tasks_queue.get, timeout = 1)
+            except queue.Empty:
+                continue
+
+            # --- Supervisor Shutdown Sentinel ---
+            if item is None:
+                break
+
+            # --- Last Known Calendar State Travels With The Task ---
+            origin, destination, departure_date, calendar_state = item
+            if calendar_state and self.calendar_states is not None:
+                self.calendar_states.set(type(self).calendar_key(origin, destination, departure_date), calendar_state)
+            await self.queue.put((origin, destination, departure_date))
+
     # --- Prepair & Run All Tasks ---
     async def run_tasks(self) -> None:
         # --- Dates & Routes to Fetch Flights ---
@@ -186,6 +301,9 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
 
             finally:
                 self.queue.task_done()
+                # --- Behind Its Calendar State On The Same Queue: The Supervisor Never Counts A State It Missed ---
+                if self.results_queue is not None:
+                    self.results_queue.put(TASK_DONE)
 
 
 # ---------- Scraping Data ----------
@@ -196,8 +314,10 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
         departure_date:date
     ) -> None:
         
-        bearer_token = await self.wait_load_random_tokens()
         async with self.semaphore:
+            bearer_token = await self.token_pool.lease()
+            token_outcome = "error"
+            start_time = default_timer()
             try:
                 flights_status, flights_response = await self.get_flights_month_calendar(
                     FlightQueryParams(
@@ -207,24 +327,24 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
                     ),
                     bearer_token = bearer_token
                 )
-                if not isinstance(flights_response, dict):
-                    print(flights_response)
-                
+                token_outcome = "success" if flights_status else "error"
+                if not isinstance(flights_response, FlightsResult):
+                    await self.logger.warning(
+                        f'Unexpected Calendar Response: {origin}->{destination} on {departure_date} | Response: {flights_response}'
+                    )
+
                 if (
                     not flights_status
-                    or not isinstance(flights_response, dict)
-                    or not flights_response.get("success", False)
+                    or not isinstance(flights_response, FlightsResult)
+                    or not flights_response.success
                 ):
                     return
 
                 # --- Kafka Producer Publish ---
-                await self.kafka_producer.publish_message(
-                    topic = self.configs["kafka_topic"]["name"],
-                    message = flights_response,
-                    key = flights_response["params"]["fly_from"]
-                )
+                await self.publish_calendar(flights_response, departure_date)
 
-            except (RequestsBlocked, InvalidPastDate, ExpiredTokenAPI, GdsResponseError, SiteServiceDown, InvalidRequests) as err:
+            except (RequestsBlocked, InvalidPastDate, ExpiredTokenAPI, UnauthorizedTokenAPI, GdsResponseError, SiteServiceDown, InvalidRequests) as err:
+                token_outcome = TokenPool.outcome_from_error(err)
                 await self.logger.error(
                     f'Error Scraping Flight Calendar. Task: {origin}->{destination} on {departure_date} | Type: {type(err).__name__} | Message: {str(err)}',
                     to_file = False
@@ -237,53 +357,153 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
                 raise
 
             finally:
+                # --- Token Stats & Quarantine ---
+                await self.token_pool.release(
+                    bearer_token,
+                    outcome = token_outcome,
+                    latency = default_timer() - start_time
+                )
                 await asyncio.sleep(self.configs["general"]["delay_error"])
                 return
 
 
+    # --- Publish Only Calendars & Flights That Changed Since Last Cycle ---
+    async def publish_calendar(self,
+        flights_response:FlightsResult,
+        departure_date:date
+    ) -> None:
+
+        params = flights_response.params
+        cache_configs = self.configs["general"].get("calendar_cache", dict())
+        # --- Without State There Is Nothing To Diff, Full Snapshot Only ---
+        if self.calendar_states is None:
+            await self.publish_snapshot(flights_response)
+            return
+
+        cache_key = type(self).calendar_key(params["fly_from"], params["fly_to"], departure_date)
+        previous_state = self.calendar_states.get(cache_key)
+        if not isinstance(previous_state, dict):
+            previous_state = dict()
+        fingerprint = flights_response.fingerprint()
+        publish_mode = cache_configs.get("publish_mode", "changes")
+
+        # --- Periodic Full Resync: An Expired State Diffs Against Nothing, Every Flight Is Sent Again ---
+        full_sync_seconds = cache_configs.get("full_sync_hours", 24) * 3600
+        if full_sync_seconds and time.time() - previous_state.get("synced_at", 0) >= full_sync_seconds:
+            previous_state = dict()
+            self.cycle_stats["full_syncs"] += 1
+
+        if previous_state.get("fingerprint") == fingerprint:
+            self.cycle_stats["unchanged"] += 1
+            if cache_configs.get("heartbeat", True):
+                # --- Same Topic The Consumer Reads In This Mode ---
+                await self.kafka_producer.publish_message(
+                    topic = self.configs["kafka_topic" if publish_mode == "snapshot" else "kafka_topic_changes"]["name"],
+                    message = {
+                        "message_type": "seen",
+                        "provider": flights_response.provider,
+                        "params": params,
+                        "fingerprint": fingerprint
+                    },
+                    key = params["fly_from"]
+                )
+            return
+
+        flights_state, changes = type(self).diff_calendar(flights_response, previous_state.get("flights", dict()))
+        if publish_mode in ("snapshot", "both"):
+            await self.publish_snapshot(flights_response)
+        if publish_mode in ("changes", "both") and changes:
+            await self.kafka_producer.publish_message(
+                topic = self.configs["kafka_topic_changes"]["name"],
+                message = {
+                    "message_type": "changes",
+                    "provider": flights_response.provider,
+                    "params": params,
+                    "shopping_id": flights_response.shopping_id,
+                    "flights": changes,
+                    # --- Full Active Set Of The Window, The Consumer Flips Everything Else In One UPDATE ---
+                    "calendar": AsyncFlightDBManager.calendar_scope(
+                        flights_response.provider,
+                        params["fly_from"],
+                        params["fly_to"],
+                        [state[3] for state in flights_state.values()],
+                        [hash_id for hash_id, state in flights_state.items() if state[0]]
+                    )
+                },
+                key = params["fly_from"]
+            )
+            self.cycle_stats["changed_flights"] += len(changes)
+
+        # --- Remember Only After Kafka Accepted The Messages ---
+        calendar_state = {
+            "fingerprint": fingerprint,
+            "flights": flights_state,
+            "synced_at": previous_state.get("synced_at") or time.time()
+        }
+        self.calendar_states.set(cache_key, calendar_state)
+        if self.results_queue is not None:
+            self.results_queue.put((cache_key, calendar_state))
+
+    async def publish_snapshot(self,
+        flights_response:FlightsResult
+    ) -> None:
+
+        await self.kafka_producer.publish_message(
+            topic = self.configs["kafka_topic"]["name"],
+            message = flights_response,
+            key = flights_response.params["fly_from"]
+        )
+        self.cycle_stats["snapshots"] += 1
+
+
 # ---------- Tokens Methods ----------
-    # --- Load Bearer Tokens ---
+    # --- Load Bearer Tokens (Push Events) ---
     async def load_bearerTokens(self) -> None:
-        flag_message = True
-        
         while True:
-            db_response = await self.get_active_tokens(flag_message)
-            if not db_response:
-                flag_message = False
-                await asyncio.sleep(self.configs["general"]["delay"])
-                continue
-            
-            if type(self).checker_tokens(self.active_bearerTokens, db_response):
-                async with self._token_condition:
-                    self.active_bearerTokens = db_response
-                    self._token_condition.notify_all()
-                await self.logger.info(f'Updated Bearer Tokens: {len(db_response)} active.')
-            await asyncio.sleep(10)
-
-    # --- Get All Tokens Active ---
-    async def get_active_tokens(self,
-        flag_message:bool
-    ) -> Union[List[Dict], List]:
-        
-        db_status, db_response = await self.db_tokens.get_tokens(only_active = True)
-        if not db_status or not db_response:
-            if flag_message:
-                await self.logger.warning('Waiting New Tokens For Testing...')
-            return []
-        return db_response
-
-    # --- Checker Dif. Tokens List ---
-    @staticmethod
-    def checker_tokens(current, new):
-        return sorted(current, key=lambda x: x["bearer_token"]) != sorted(new, key=lambda x: x["bearer_token"])
+            try:
+                async for event, bearer_tokens in self.db_tokens.watch_tokens(
+                    poll_delay = self.configs["general"]["delay"]
+                ):
+                    match event:
+                        case "snapshot":
+                            await self.token_pool.sync(bearer_tokens)
+                        case "add":
+                            for bearer_token, expires_at in bearer_tokens.items():
+                                await self.token_pool.add(bearer_token, expires_at)
+                        case "deactivate":
+                            for bearer_token in bearer_tokens:
+                                await self.token_pool.discard(bearer_token)
+
+                    if not len(self.token_pool):
+                        await self.logger.warning('Waiting New Tokens For Testing...')
+                        continue
+                    await self.logger.info(f'Updated Bearer Tokens ({event}): {len(self.token_pool)} active.')
+
+                # --- Stream Closed Without An Error, Reopen After A Pause (No Hot Loop Against Mongo) ---
+                await self.logger.warning('Bearer Tokens Watch Ended, Reopening...')
+                await asyncio.sleep(self.configs["general"]["delay_error"])
 
-    # --- Wait Random Token ---
-    async def wait_load_random_tokens(self) -> str:
-        async with self._token_condition:
-            while not self.active_bearerTokens:
-                await self._token_condition.wait()
+            except DBTokensError as err:
+                await self.logger.error(
+                    f'Error Watching Bearer Tokens, Retrying... | Type: {type(err).__name__} | Message: {str(err)}'
+                )
+                await asyncio.sleep(self.configs["general"]["delay_error"])
+
+    # --- Share Token Outcomes With Updater ---
+    async def report_tokens_health(self) -> None:
+        while True:
+            await asyncio.sleep(self.configs["general"].get("tokens_health_flush", 5))
+            reports = self.token_pool.drain_reports()
+            if not reports:
+                continue
 
-            return random.choice(self.active_bearerTokens)["bearer_token"]
+            try:
+                await self.db_tokens.report_tokens_health(reports)
+            except DBTokensError as err:
+                await self.logger.error(
+                    f'Error Reporting Tokens Health | Type: {type(err).__name__} | Message: {str(err)}',
+                    to_file = False
+                )
 
 
 # ---------- Tools Methods ----------
@@ -330,6 +550,84 @@ class AerolineasProducerScraperFlights(AerolineasScraper):
             if origin != destination and iata_codes[origin] != iata_codes[destination]
         ]
 
+    # --- Calendar Cache Key ---
+    @staticmethod
+    def calendar_key(
+        origin:str,
+        destination:str,
+        departure_date:date
+    ) -> str:
+        return f'{origin}-{destination}-{departure_date:%Y%m}'
+
+    # --- Per Flight State: [Active, Price, Class, Departure, Arrival, Scale, Origin, Destination] ---
+    @staticmethod
+    def diff_calendar(
+        flights_response:FlightsResult,
+        previous_flights:Dict[str, List[Any]]
+    ) -> Tuple[Dict[str, List[Any]], List[Dict[str, Any]]]:
+
+        flights_state:Dict[str, List[Any]] = dict()
+        changes:List[Dict[str, Any]] = list()
+
+        for flight in flights_response.flights:
+            _, hash_id = AsyncFlightDBManager.generate_flight_hash(
+                flight.iata_origin,
+                flight.iata_destination,
+                flight.time_departure,
+                flights_response.provider,
+                flight.airline
+            )
+            offer = flight.offers[0] if flight.offers else None
+            state = (
+                [True, offer.price if offer else None, offer.flight_class if offer else None, flight.time_departure, flight.time_arrival, flight.scale]
+                if flight.active else [False, None, None, flight.time_departure, None, None]
+            ) + [flight.iata_origin, flight.iata_destination]
+            flights_state[hash_id] = state
+            previous = previous_flights.get(hash_id)
+            if previous == state:
+                continue
+
+            if not flight.active:
+                # --- Only Worth Sending If It Was Active Or Never Seen ---
+                if previous and not previous[0]:
+                    continue
+                change_type = "inactive"
+            elif not previous or not previous[0]:
+                change_type = "new"
+            elif previous[1] != state[1]:
+                change_type = "price"
+            else:
+                change_type = "updated"
+            changes.append({**flight.to_dict(), "change_type": change_type, "hash_id": hash_id})
+
+        # --- Flights Missing From The Response Are Gone ---
+        for hash_id, previous in previous_flights.items():
+            if hash_id in flights_state or not previous[0]:
+                continue
+            flights_state[hash_id] = [False, None, None, previous[3], None, None, previous[6], previous[7]]
+            changes.append(
+                {
+                    **FlightRecord(False, previous[6], previous[7], previous[3]).to_dict(),
+                    "change_type": "inactive",
+                    "hash_id": hash_id
+                }
+            )
+        return flights_state, changes
+
+    @staticmethod
+    def create_calendar_cache(
+        configs:Dict[str, Any],
+        persist:bool = True
+    ) -> Optional[PersistentLRUCache]:
+
+        cache_configs = configs.get("calendar_cache", dict())
+        if not cache_configs.get("enabled", True):
+            return None
+        return PersistentLRUCache(
+            max_entries = cache_configs.get("max_entries", 20_000),
+            path = cache_configs.get("path") if persist else None
+        )
+
     # --- Time Tasks Cycle ---
     @staticmethod
     def format_time_task(
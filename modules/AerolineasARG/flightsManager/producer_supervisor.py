@@ -0,0 +1,238 @@
+import asyncio, os, queue
+import multiprocessing
+from math import ceil
+from pathlib import Path
+from datetime import date
+from timeit import default_timer
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue as ProcessQueue
+from typing import Optional, Union, Any, Dict, List
+
+from modules.AerolineasARG.flightsManager.producer_flights import AerolineasProducerScraperFlights, TASK_DONE
+from utils import (
+    AsyncMessageHandler,
+    AsyncConfigManager,
+    NotifyDiscord,
+    PersistentLRUCache,
+
+    # --- Exceptions ---
+    ProducerWorkerProcessError
+)
+
+
+# ---------- Worker Process Entrypoint ----------
+def run_producer_process(
+    worker_id:int,
+    tasks_queue:ProcessQueue,
+    max_workers:int,
+    results_queue:Optional[ProcessQueue] = None,
+    total_processes:int = 1
+) -> None:
+
+    async def main():
+        producer = AerolineasProducerScraperFlights(
+            log_name = f'ProducerFlightsCalendar_Process{worker_id}'
+        )
+        await producer.init_worker_process(
+            worker_id = worker_id,
+            tasks_queue = tasks_queue,
+            max_workers = max_workers,
+            results_queue = results_queue,
+            total_processes = total_processes
+        )
+
+    asyncio.run(main())
+
+
+class AerolineasProducerSupervisor:
+    def __init__(self,
+        log_name:Optional[str] = "ProducerSupervisor",
+        log_path:Optional[Union[str, Path]] = "./aerolineasARG/FlightsManagers"
+    ):
+        # --- Configs ---
+        self.configs:Dict[str, Dict[str, Any]] = dict()
+        # --- Notify System ---
+        self.notifyer = NotifyDiscord()
+        # --- Worker Processes ---
+        self._context = multiprocessing.get_context("spawn")
+        self.processes:List[BaseProcess] = list()
+        self.tasks_queue:Optional[ProcessQueue] = None
+        self.results_queue:Optional[ProcessQueue] = None
+        # --- Calendar States (Fingerprint + Flights), Single Owner Across Processes ---
+        self.calendar_states:Optional[PersistentLRUCache] = None
+        self.total_processes:int = 1
+        self.workers_per_process:int = 1
+        # --- Logger ---
+        self.logger = AsyncMessageHandler(
+            log_filename = log_name,
+            logs_folder = log_path,
+            printer_msg = "[AerolineasArg][Producer Supervisor] Status:"
+        )
+
+
+# ---------- Load Configs ----------
+    async def load_configs(self) -> None:
+        configs = AsyncConfigManager()
+        self.configs = {
+            "admin": await configs.get_configs("monitor_configs", "admin_configs", "webhooks"),
+            "general": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas"),
+            "airports_list": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas", "airports_scraping")
+        }
+        # --- Split Concurrency Budget Between Processes ---
+        self.total_processes = self.configs["general"].get("producer_processes") or os.cpu_count() or 1
+        self.workers_per_process = max(
+            1,
+            ceil(self.configs["general"].get("max_threads_monitor_month", 1) / self.total_processes)
+        )
+        self.calendar_states = AerolineasProducerScraperFlights.create_calendar_cache(self.configs["general"])
+        if self.calendar_states is not None:
+            await asyncio.to_thread(self.calendar_states.load)
+
+
+# ---------- Main Method. ----------
+    async def init_supervisor(self) -> None:
+        try:
+            # --- Configs ---
+            await self.load_configs()
+            await self.logger.critical(
+                f'Init Module Aerolineas Flights Producer Supervisor | Processes: {self.total_processes} - Workers Per Process: {self.workers_per_process}'
+            )
+            self.start_processes()
+
+            while True:
+                start_time = default_timer()
+
+                await self.dispatch_cycle()
+
+                await self.logger.critical(
+                    f'Finish Cycle, Restart Process... | Lap time: {AerolineasProducerScraperFlights.format_time_task(default_timer() - start_time)}'
+                )
+
+        except Exception as err:
+            message_error = f'Error Fatal, Kill Process | Type: {type(err).__name__} | Message: {str(err)}'
+            # --- Send Status to Discord ---
+            _, response_webhook = await self.notifyer.error_admin(
+                URL_Webhook = self.configs["admin"]["status_monitors"],
+                store_data = self.configs["general"],
+                problem_logs = f'[AerolineasArg][Producer Supervisor] Status: {message_error}'
+            )
+            # --- Save Log ---
+            await self.logger.error(
+                message = message_error,
+                hidden_msg = response_webhook
+            )
+
+        finally:
+            await self.stop_processes()
+            await self.logger.shutdown()
+
+
+# ---------- Manage Processes ----------
+    # --- Spawn Worker Processes ---
+    def start_processes(self) -> None:
+        self.tasks_queue = self._context.Queue()
+        self.results_queue = self._context.Queue()
+
+        for worker_id in range(self.total_processes):
+            process = self._context.Process(
+                target = run_producer_process,
+                args = (worker_id, self.tasks_queue, self.workers_per_process, self.results_queue, self.total_processes),
+                name = f'ProducerFlights-{worker_id}',
+                daemon = True
+            )
+            process.start()
+            self.processes.append(process)
+
+    # --- Stop Worker Processes ---
+    async def stop_processes(self,
+        timeout:float = 30
+    ) -> None:
+
+        if not self.processes:
+            return
+
+        for _ in self.processes:
+            self.tasks_queue.put(None)
+
+        for process in self.processes:
+            await asyncio.to_thread(process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+
+        await self.logger.info(f'All Worker Processes Stopped: {len(self.processes)}')
+        self.processes.clear()
+
+    # --- Check Processes Health ---
+    def check_processes(self) -> None:
+        dead_processes = [p.name for p in self.processes if not p.is_alive()]
+        if dead_processes:
+            raise ProducerWorkerProcessError(
+                context = {
+                    "processes": dead_processes,
+                    "exit_codes": [p.exitcode for p in self.processes if not p.is_alive()]
+                }
+            )
+
+
+# ---------- Distribute Tasks ----------
+    async def dispatch_cycle(self) -> None:
+        # --- Dates & Routes to Fetch Flights ---
+        routes = AerolineasProducerScraperFlights.create_routes(self.configs["airports_list"].items())
+        dates = AerolineasProducerScraperFlights.gen_flight_calendar_dates(self.configs["general"]["max_month_scraping"])
+
+        total_tasks = 0
+        for origin, destination in routes:
+            for departure_date in dates:
+                self.tasks_queue.put((origin, destination, departure_date, self.last_calendar_state(origin, destination, departure_date)))
+                total_tasks += 1
+        await self.logger.info(f'Dispatched {total_tasks} Tasks | Routes: {len(routes)} - Month: {len(dates)}')
+
+        # --- Wait Until Every (Route, Month) Is Processed, Its State Already Collected ---
+        completed_tasks = 0
+        while completed_tasks < total_tasks:
+            self.check_processes()
+            completed_tasks += self.collect_calendar_states()
+            if completed_tasks < total_tasks:
+                await asyncio.sleep(1)
+
+        if self.calendar_states is not None:
+            await asyncio.to_thread(self.calendar_states.save)
+            await self.logger.info(f'Calendar States Saved | Stats: {self.calendar_states.stats()}')
+
+
+# ---------- Calendar States ----------
+    def last_calendar_state(self,
+        origin:str,
+        destination:str,
+        departure_date:date
+    ) -> Optional[Dict[str, Any]]:
+
+        if self.calendar_states is None:
+            return None
+        return self.calendar_states.get(
+            AerolineasProducerScraperFlights.calendar_key(origin, destination, departure_date)
+        )
+
+    # --- Workers Report Every Calendar State They Published, Then The Task Completion ---
+    def collect_calendar_states(self) -> int:
+        completed_tasks = 0
+        while True:
+            try:
+                result = self.results_queue.get_nowait()
+            except queue.Empty:
+                return completed_tasks
+            if result == TASK_DONE:
+                completed_tasks += 1
+                continue
+            cache_key, calendar_state = result
+            if self.calendar_states is not None:
+                self.calendar_states.set(cache_key, calendar_state)
+
+
+
+if __name__ == "__main__":
+    async def main():
+        supervisor = AerolineasProducerSupervisor()
+        await supervisor.init_supervisor()
+
+    asyncio.run(main())
@@ -39,7 +39,7 @@ class NotifyerFlights:
 
 
     async def load_configs(self) -> None:
-        await self.db_flights.connect_db()
+        await self.db_flights.connect_db("notifier")
 
         configs = AsyncConfigManager()
         self.configs = {
@@ -1 +1,9 @@
-from .scrapers import AerolineasScraper, FlightQueryParams
\ No newline at end of file
+from .scrapers import AerolineasScraper, FlightQueryParams
+from .fast_parser import (
+    FlightsResult,
+    FlightRecord,
+    FlightSection,
+    FlightOffer,
+    parse_calendar,
+    parse_one_way
+)
\ No newline at end of file
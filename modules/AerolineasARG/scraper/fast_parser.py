@@ -0,0 +1,390 @@
+import hashlib, orjson
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional, Union, Any, Dict, List, Tuple, Callable
+
+from utils.exceptions import SchemaDriftError
+
+
+AIRLINE = "AerolineasARG"
+PathKey = Union[str, int]
+
+# --- Low Cardinality Values (IATA, Equipment, Flight Numbers) Share One Object ---
+_STRINGS:Dict[Any, Any] = dict()
+
+def intern_value(
+    value:Any
+) -> Any:
+    return _STRINGS.setdefault(value, value)
+
+
+# ---------- Records ----------
+@dataclass(slots = True)
+class FlightSection:
+    flight_number:str
+    departure:str
+    arrival:str
+    origin:str
+    destination:str
+    equipment:Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "flightNumber": self.flight_number,
+            "departure": self.departure,
+            "arrival": self.arrival,
+            "origin": self.origin,
+            "destination": self.destination,
+            "equipment": self.equipment
+        }
+
+
+@dataclass(slots = True)
+class FlightOffer:
+    flight_class:str
+    seat_availability:Any
+    price:int
+    offer_id:Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        offer = {
+            "class": self.flight_class,
+            "seatAvailability": self.seat_availability,
+            "price": self.price
+        }
+        return {"offerId": self.offer_id, **offer} if self.offer_id is not None else offer
+
+
+@dataclass(slots = True)
+class FlightRecord:
+    active:Optional[bool]
+    iata_origin:str
+    iata_destination:str
+    time_departure:str
+    time_arrival:Optional[str] = None
+    scale:Optional[bool] = None
+    total_duration:Optional[int] = None
+    sections:Optional[List[FlightSection]] = None
+    offers:Optional[List[FlightOffer]] = None
+    airline:str = AIRLINE
+
+    # --- Same Shape The Dict Parser Published ---
+    def to_dict(self) -> Dict[str, Any]:
+        flight = {
+            "airline": self.airline,
+            "iata_origin": self.iata_origin,
+            "iata_destination": self.iata_destination,
+            "time_departure": self.time_departure
+        }
+        if self.active is not None:
+            flight = {"active": self.active, **flight}
+        if self.active is False:
+            return flight
+
+        flight.update(
+            {
+                "time_arrival": self.time_arrival,
+                "scale": self.scale,
+                "total_duration": self.total_duration,
+                "sections": [section.to_dict() for section in self.sections],
+                "offers": [offer.to_dict() for offer in self.offers]
+            }
+        )
+        return flight
+
+
+@dataclass(slots = True)
+class FlightsResult:
+    success:bool
+    params:Dict[str, Any]
+    shopping_id:Optional[str]
+    flights:List[FlightRecord]
+    provider:str = AIRLINE
+
+    # --- Only Fields The Consumer Stores, Seats & Shopping Id Change Every Search ---
+    def fingerprint(self) -> str:
+        # --- Order Independent: Each Flight Serialized, Then Sorted ---
+        normalized = sorted(
+            orjson.dumps(
+                (
+                    flight.time_departure,
+                    flight.iata_origin,
+                    flight.iata_destination,
+                    flight.active,
+                    flight.time_arrival,
+                    flight.scale,
+                    flight.total_duration,
+                    [
+                        (section.flight_number, section.departure, section.arrival, section.origin, section.destination, section.equipment)
+                        for section in flight.sections or list()
+                    ],
+                    [(offer.flight_class, offer.price) for offer in flight.offers or list()]
+                )
+            )
+            for flight in self.flights
+        )
+        return hashlib.blake2b(b'\n'.join(normalized), digest_size = 16).hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "success": self.success,
+            "provider": self.provider,
+            "params": self.params,
+            "shopping_id": self.shopping_id,
+            "flights": [flight.to_dict() for flight in self.flights]
+        }
+
+
+# ---------- Compiled Spec ----------
+class CompiledSpec:
+    def __init__(self,
+        name:str,
+        fields:Dict[str, Tuple[PathKey, ...]]
+    ):
+        self.name = name
+        self.fields = fields
+        self.extract:Callable[[Any], Tuple] = type(self)._compile(name, fields)
+
+    # --- One Generated Function, Plain Subscripts, No Per-Field Calls ---
+    @staticmethod
+    def _compile(
+        name:str,
+        fields:Dict[str, Tuple[PathKey, ...]]
+    ) -> Callable[[Any], Tuple]:
+
+        lookups = [
+            "record" + "".join(f'[{key!r}]' for key in path)
+            for path in fields.values()
+        ]
+        source = f'def extract(record):\n    return ({", ".join(lookups)},)\n'
+        namespace:Dict[str, Any] = dict()
+        exec(compile(source, f'<spec {name}>', "exec"), namespace)
+        return namespace["extract"]
+
+    # --- Slow Path, Only After "extract" Failed ---
+    def diagnose(self,
+        record:Any,
+        prefix:str = ""
+    ) -> List[str]:
+
+        missing = list()
+        for path in self.fields.values():
+            value = record
+            for depth, key in enumerate(path):
+                try:
+                    value = value[key]
+                except (KeyError, IndexError, TypeError):
+                    missing.append(prefix + ".".join(map(str, path[:depth + 1])))
+                    break
+        return missing
+
+
+CALENDAR_SPEC = CompiledSpec("calendarOffers", {
+    "segments": ("leg", "segments"),
+    "stops": ("leg", "stops"),
+    "total_duration": ("leg", "totalDuration"),
+    "cabin_class": ("offerDetails", "cabinClass"),
+    "seats": ("offerDetails", "seatAvailability", "seats"),
+    "price": ("offerDetails", "fare", "total")
+})
+CALENDAR_EMPTY_SPEC = CompiledSpec("calendarOffers.empty", {
+    "departure": ("departure",)
+})
+BRANDED_SPEC = CompiledSpec("brandedOffers", {
+    "segments": ("legs", 0, "segments"),
+    "total_duration": ("legs", 0, "totalDuration"),
+    "offers": ("offers",)
+})
+BRANDED_OFFER_SPEC = CompiledSpec("brandedOffers.offers", {
+    "offer_id": ("offerId",),
+    "brand": ("brand",),
+    "seats": ("seatAvailability", "seats"),
+    "price": ("fare", "total")
+})
+SEGMENT_SPEC = CompiledSpec("segments", {
+    "airline": ("airline",),
+    "flight_number": ("flightNumber",),
+    "departure": ("departure",),
+    "arrival": ("arrival",),
+    "origin": ("origin",),
+    "destination": ("destination",),
+    "equipment": ("equipment",)
+})
+
+
+# ---------- Parsers ----------
+def parse_calendar(
+    response:Union[bytes, str, Dict[str, Any]],
+    params:Dict[str, Any]
+) -> Tuple[bool, FlightsResult]:
+
+    payload, raw_flights = _offers_list(response, "calendarOffers", params)
+    origin = intern_value(params["fly_from"])
+    destination = intern_value(params["fly_to"])
+    flights:List[Optional[FlightRecord]] = [None] * len(raw_flights)
+    drift = Counter()
+
+    for index, raw_flight in enumerate(raw_flights):
+        try:
+            if not raw_flight.get("leg"):
+                (departure,) = CALENDAR_EMPTY_SPEC.extract(raw_flight)
+                flights[index] = FlightRecord(False, origin, destination, departure)
+                continue
+
+            segments, stops, total_duration, cabin_class, seats, price = CALENDAR_SPEC.extract(raw_flight)
+            sections = _sections(segments)
+            flights[index] = FlightRecord(
+                True,
+                sections[0].origin,
+                sections[-1].destination,
+                sections[0].departure,
+                sections[-1].arrival,
+                stops >= 1,
+                total_duration,
+                sections,
+                [FlightOffer(intern_value(cabin_class), seats, int(price))]
+            )
+
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as err:
+            if isinstance(raw_flight, dict) and not raw_flight.get("leg"):
+                drift.update(_diagnose(raw_flight, CALENDAR_EMPTY_SPEC, None, err))
+            else:
+                drift.update(_diagnose(raw_flight, CALENDAR_SPEC, "leg.segments", err))
+
+    return _result(payload, "calendarOffers", params, flights, drift)
+
+
+def parse_one_way(
+    response:Union[bytes, str, Dict[str, Any]],
+    params:Dict[str, Any]
+) -> Tuple[bool, FlightsResult]:
+
+    payload, raw_flights = _offers_list(response, "brandedOffers", params)
+    flights:List[Optional[FlightRecord]] = [None] * len(raw_flights)
+    drift = Counter()
+
+    for index, raw_flight in enumerate(raw_flights):
+        try:
+            segments, total_duration, raw_offers = BRANDED_SPEC.extract(raw_flight)
+            sections = _sections(segments)
+            offers:List[Optional[FlightOffer]] = [None] * len(raw_offers)
+            for offer_index, raw_offer in enumerate(raw_offers):
+                offer_id, brand, seats, price = BRANDED_OFFER_SPEC.extract(raw_offer)
+                offers[offer_index] = FlightOffer(
+                    intern_value(brand.get("name", "Class Not Found")),
+                    seats,
+                    int(price),
+                    offer_id
+                )
+
+            flights[index] = FlightRecord(
+                None,
+                sections[0].origin,
+                sections[-1].destination,
+                sections[0].departure,
+                sections[-1].arrival,
+                len(sections) > 1,
+                total_duration,
+                sections,
+                offers
+            )
+
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as err:
+            drift.update(_diagnose(raw_flight, BRANDED_SPEC, "legs.0.segments", err))
+            for raw_offer in raw_flight.get("offers", list()) if isinstance(raw_flight, dict) else list():
+                drift.update(BRANDED_OFFER_SPEC.diagnose(raw_offer, "offers."))
+
+    return _result(payload, "brandedOffers", params, flights, drift)
+
+
+# ---------- Tools ----------
+def _sections(
+    segments:List[Dict[str, Any]]
+) -> List[FlightSection]:
+
+    sections:List[Optional[FlightSection]] = [None] * len(segments)
+    for index, segment in enumerate(segments):
+        airline, flight_number, departure, arrival, origin, destination, equipment = SEGMENT_SPEC.extract(segment)
+        sections[index] = FlightSection(
+            intern_value(airline + str(flight_number)),
+            departure,
+            arrival,
+            intern_value(origin),
+            intern_value(destination),
+            intern_value(equipment)
+        )
+    return sections
+
+
+def _offers_list(
+    response:Union[bytes, str, Dict[str, Any]],
+    root:str,
+    params:Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Any]]:
+
+    try:
+        payload = orjson.loads(response) if isinstance(response, (bytes, str)) else response
+        return payload, payload[root].get("0", list())
+
+    except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as err:
+        raise SchemaDriftError(
+            f'Error, Response Root "{root}" Missing Or Invalid. Data Structure May Have Changed...',
+            context = {
+                "params": params,
+                "error_type": type(err).__name__,
+                "error_msg": str(err)
+            }
+        ) from err
+
+
+def _diagnose(
+    raw_flight:Any,
+    spec:CompiledSpec,
+    segments_path:Optional[str],
+    err:Exception
+) -> List[str]:
+
+    missing = spec.diagnose(raw_flight)
+    if missing or not segments_path:
+        return missing or [f'{spec.name}: {type(err).__name__}']
+
+    segments = raw_flight
+    for key in segments_path.split("."):
+        segments = segments[int(key) if key.isdigit() else key]
+    for segment in segments if isinstance(segments, list) else list():
+        missing.extend(SEGMENT_SPEC.diagnose(segment, f'{segments_path}.'))
+    return missing or [f'{spec.name}: {type(err).__name__}']
+
+
+# --- One Summarized Error Per Response, No Payload Dump ---
+def _result(
+    payload:Dict[str, Any],
+    root:str,
+    params:Dict[str, Any],
+    flights:List[Optional[FlightRecord]],
+    drift:Counter
+) -> Tuple[bool, FlightsResult]:
+
+    if drift:
+        raise SchemaDriftError(
+            f'Error, Response Fields Missing Or Changed. Data Structure May Have Changed... | Root: {root}',
+            context = {
+                "params": params,
+                "records": len(flights),
+                "failed_records": sum(flight is None for flight in flights),
+                "fields": dict(drift.most_common())
+            }
+        )
+
+    try:
+        shopping_id = payload.get("searchMetadata").get("shoppingId")
+    except AttributeError as err:
+        raise SchemaDriftError(
+            f'Error, Response Fields Missing Or Changed. Data Structure May Have Changed... | Root: {root}',
+            context = {
+                "params": params,
+                "fields": {"searchMetadata": 1}
+            }
+        ) from err
+
+    return True, FlightsResult(bool(flights), params, shopping_id, flights)
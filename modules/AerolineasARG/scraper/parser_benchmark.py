@@ -0,0 +1,132 @@
+import argparse, json, tracemalloc
+from timeit import default_timer
+from typing import Any, Callable, Dict, List, Tuple
+
+from modules.AerolineasARG.scraper.scrapers import AerolineasScraper
+from modules.AerolineasARG.scraper.replay_api import FixturesStore
+from modules.AerolineasARG.scraper.fast_parser import parse_calendar, parse_one_way
+from utils import ReplayFixturesError
+
+
+# --- (Dict Parser, Compiled Parser) Per Fixture Shape ---
+PARSERS:Dict[bool, Tuple[Callable, Callable]] = {
+    True: (AerolineasScraper.parsing_flyghts_calendar, parse_calendar),
+    False: (AerolineasScraper.parsing_flyghts, parse_one_way)
+}
+
+
+def params_from_leg(
+    leg:str
+) -> Dict[str, Any]:
+
+    fly_from, fly_to, date = leg.split("-")
+    return {
+        "date": date,
+        "fly_from": fly_from,
+        "fly_to": fly_to,
+        "adults": 1,
+        "infants": 0,
+        "children": 0,
+        "cabin_class": "Economy"
+    }
+
+
+def load_payloads(
+    store:FixturesStore
+) -> List[Tuple[bool, bytes, Dict[str, Any]]]:
+
+    store.load()
+    payloads = [
+        (fixture["flex_dates"], fixture["payload"], params_from_leg(fixture["leg"]))
+        for fixture in store.fixtures("api")
+        if fixture["status_code"] == 200
+    ]
+    if not payloads:
+        raise ReplayFixturesError(
+            f'Error, No Recorded API Responses To Benchmark... | Store: {store.fixtures_path}'
+        )
+    return payloads
+
+
+# --- Both Parsers Must Publish The Same Message ---
+def check_parity(
+    payloads:List[Tuple[bool, bytes, Dict[str, Any]]]
+) -> int:
+
+    mismatches = 0
+    for flex_dates, payload, params in payloads:
+        dict_parser, compiled_parser = PARSERS[flex_dates]
+        _, expected = dict_parser(json.loads(payload), params)
+        _, result = compiled_parser(payload, params)
+        if result.to_dict() != expected:
+            mismatches += 1
+            print(f'Parity Mismatch | Leg: {params["fly_from"]}-{params["fly_to"]}-{params["date"]}')
+    return mismatches
+
+
+def run_parser(
+    payloads:List[Tuple[bool, bytes, Dict[str, Any]]],
+    compiled:bool,
+    rounds:int
+) -> Tuple[float, int, int]:
+
+    # --- Time Covers Decoding Too, Both Parsers Start From Raw Bytes ---
+    start_time = default_timer()
+    for _ in range(rounds):
+        for flex_dates, payload, params in payloads:
+            if compiled:
+                PARSERS[flex_dates][1](payload, params)
+            else:
+                PARSERS[flex_dates][0](json.loads(payload), params)
+    elapsed = default_timer() - start_time
+
+    # --- Memory Held By One Round Of Parsed Results ---
+    tracemalloc.start()
+    results = [
+        PARSERS[flex_dates][1](payload, params) if compiled
+        else PARSERS[flex_dates][0](json.loads(payload), params)
+        for flex_dates, payload, params in payloads
+    ]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return elapsed, retained, peak
+
+
+def benchmark(
+    store:FixturesStore,
+    rounds:int = 200
+) -> Dict[str, Dict[str, float]]:
+
+    payloads = load_payloads(store)
+    mismatches = check_parity(payloads)
+    total_parsed = len(payloads) * rounds
+
+    report = dict()
+    for name, compiled in (("dict_parser", False), ("compiled_parser", True)):
+        elapsed, retained, peak = run_parser(payloads, compiled, rounds)
+        report[name] = {
+            "seconds": round(elapsed, 4),
+            "responses_per_second": round(total_parsed / elapsed, 1),
+            "retained_kb": round(retained / 1024, 1),
+            "peak_kb": round(peak / 1024, 1)
+        }
+
+    report["summary"] = {
+        "payloads": len(payloads),
+        "rounds": rounds,
+        "parity_mismatches": mismatches,
+        "speedup": round(report["dict_parser"]["seconds"] / report["compiled_parser"]["seconds"], 2)
+    }
+    return report
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Calendar/One-Way Parser Benchmark Over Recorded Fixtures")
+    parser.add_argument("--fixtures", default = "./FlightsData/AerolineasARG/fixtures")
+    parser.add_argument("--rounds", type = int, default = 200)
+    args = parser.parse_args()
+
+    for section, values in benchmark(FixturesStore(args.fixtures), args.rounds).items():
+        print(f'[{section}] ' + " | ".join(f'{key}: {value}' for key, value in values.items()))
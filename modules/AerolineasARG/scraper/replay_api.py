@@ -0,0 +1,480 @@
+import asyncio, argparse, json, random, re, jwt
+from pathlib import Path
+from time import time
+from datetime import date, datetime
+from contextlib import suppress
+from collections import defaultdict, Counter
+from urllib.parse import urlsplit, parse_qsl
+from typing import Optional, Union, Literal, Any, Dict, List, Tuple
+
+from modules.AerolineasARG.scraper.scrapers import AerolineasScraper, FlightQueryParams
+from utils import (
+    AsyncMessageHandler,
+
+    # --- Exceptions ---
+    ScrapersError,
+    ReplayFixturesError
+)
+
+
+FixtureKind = Literal["api", "site"]
+TokenMode = Literal["strict", "any", "off"]
+
+# --- Same Payloads The Live API Sends, Parsed By "check_status_code" ---
+ERROR_RESPONSES:Dict[int, Union[Dict[str, Any], str]] = {
+    400: {"description": "shopping.search.legs.past-date", "errorMessage": ""},
+    401: {"errorMessage": "core.gateway.access-denied"},
+    403: {"errorMessage": "forbidden"},
+    429: {"errorMessage": "too many requests"},
+    500: {"errorMessage": "gds.flight.error.internal"},
+    502: "<html><body><h1>502 Bad Gateway</h1></body></html>"
+}
+REASON_PHRASES = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+    404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error", 502: "Bad Gateway"
+}
+SITE_TOKEN_PATTERN = re.compile(r'(window\.__ACCESS_TOKEN__\s*=\s*")[^"]+(")')
+SITE_FALLBACK_HTML = '<html><head><script>window.__ACCESS_TOKEN__ = "{token}";</script></head><body></body></html>'
+
+
+# ---------- Fixtures Store ----------
+class FixturesStore:
+    def __init__(self,
+        fixtures_path:Union[str, Path] = "./FlightsData/AerolineasARG/fixtures"
+    ):
+        self.fixtures_path = Path(fixtures_path)
+        self._fixtures:Dict[Tuple[FixtureKind, bool, str], Dict[str, Any]] = dict()
+        self._groups:Dict[Tuple[FixtureKind, bool], List[Dict[str, Any]]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def fixtures(self,
+        kind:Optional[FixtureKind] = None
+    ) -> List[Dict[str, Any]]:
+        return [fixture for fixture in self._fixtures.values() if kind is None or fixture["kind"] == kind]
+
+    # --- Read Every Fixture Once, Replay Never Touches Disk ---
+    def load(self) -> int:
+        self._fixtures.clear()
+        self._groups.clear()
+        for fixture_file in sorted(self.fixtures_path.glob("*.json")):
+            try:
+                fixture = json.loads(fixture_file.read_text(encoding = "utf-8"))
+                self._index(fixture)
+            except (ValueError, KeyError) as err:
+                raise ReplayFixturesError(
+                    f'Error, Invalid Fixture File... | File: {fixture_file.name}',
+                    context = {
+                        "error_type": type(err).__name__,
+                        "error_msg": str(err)
+                    }
+                ) from err
+        return len(self._fixtures)
+
+    async def save(self,
+        url:str,
+        status_code:int,
+        body:Union[Dict[str, Any], str]
+    ) -> Path:
+
+        kind, flex_dates, leg = type(self).fixture_key(url)
+        fixture = {
+            "url": url,
+            "kind": kind,
+            "flex_dates": flex_dates,
+            "leg": leg,
+            "status_code": status_code,
+            "recorded_at": datetime.now().isoformat(),
+            "body": body
+        }
+        fixture_file = self.fixtures_path / f'{kind}_{"calendar" if flex_dates else "day"}_{leg}.json'
+        await asyncio.to_thread(self._write, fixture_file, fixture)
+        self._index(fixture)
+        return fixture_file
+
+    # --- Exact Match, Else Any Recorded Response Of The Same Shape ---
+    def lookup(self,
+        kind:FixtureKind,
+        flex_dates:bool,
+        leg:str
+    ) -> Optional[Dict[str, Any]]:
+
+        fixture = self._fixtures.get((kind, flex_dates, leg))
+        if fixture:
+            return fixture
+        group = self._groups.get((kind, flex_dates))
+        return random.choice(group) if group else None
+
+    def _index(self,
+        fixture:Dict[str, Any]
+    ) -> None:
+
+        key = (fixture["kind"], fixture["flex_dates"], fixture["leg"])
+        previous = self._fixtures.get(key)
+        if previous:
+            self._groups[key[:2]].remove(previous)
+        # --- Pre-Encode Bodies So Replay Cost Stays Out Of Benchmarks ---
+        fixture["payload"] = (
+            fixture["body"] if isinstance(fixture["body"], str)
+            else json.dumps(fixture["body"])
+        ).encode()
+        self._fixtures[key] = fixture
+        self._groups[key[:2]].append(fixture)
+
+    def _write(self,
+        fixture_file:Path,
+        fixture:Dict[str, Any]
+    ) -> None:
+
+        self.fixtures_path.mkdir(parents = True, exist_ok = True)
+        fixture_file.write_text(json.dumps(fixture, ensure_ascii = False), encoding = "utf-8")
+
+    @staticmethod
+    def fixture_key(
+        url:str
+    ) -> Tuple[FixtureKind, bool, str]:
+
+        split_url = urlsplit(url)
+        query = dict(parse_qsl(split_url.query))
+        return (
+            "api" if "/flights/offers" in split_url.path else "site",
+            query.get("flexDates", "false") == "true",
+            query.get("leg", "")
+        )
+
+
+# ---------- Record Mode ----------
+class AerolineasRecorderScraper(AerolineasScraper):
+    def __init__(self,
+        store:FixturesStore
+    ):
+        super().__init__()
+        self.store = store
+        self.recorded:int = 0
+
+    # --- Every Live Response Goes To The Store, Errors Included ---
+    async def fetch_GET(self,
+        url:str,
+        **kwargs
+    ) -> Tuple[Any, Any]:
+
+        status_code, response = await super().fetch_GET(url = url, **kwargs)
+        if status_code:
+            await self.store.save(url, status_code, response)
+            self.recorded += 1
+        return status_code, response
+
+    # --- Full Page Goes Through "fetch_GET", Streaming Does Not ---
+    async def get_new_bearer_token(self,
+        params:FlightQueryParams
+    ) -> Tuple[bool, str]:
+        return await self.get_new_bearer_token_full(params)
+
+
+# ---------- Replay Server ----------
+class AerolineasReplayServer:
+    def __init__(self,
+        store:FixturesStore,
+        host:str = "127.0.0.1",
+        port:int = 8085,
+        latency:Tuple[float, float] = (0.0, 0.0),
+        error_rates:Optional[Dict[int, float]] = None,
+        token_mode:TokenMode = "strict",
+        token_ttl:float = 3600,
+        token_secret:str = "cronos-replay"
+    ):
+        self.store = store
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rates = error_rates or dict()
+        self.token_mode = token_mode
+        self.token_ttl = token_ttl
+        self.token_secret = token_secret
+        # --- Stats ---
+        self.stats:Counter = Counter()
+        self._server:Optional[asyncio.AbstractServer] = None
+        # --- Logger ---
+        self.logger = AsyncMessageHandler(
+            log_filename = "ReplayServer",
+            logs_folder = "./aerolineasARG/Replay",
+            printer_msg = "[AerolineasArg][Replay Server] Status:"
+        )
+
+        unknown_codes = set(self.error_rates) - set(ERROR_RESPONSES)
+        if unknown_codes:
+            raise ReplayFixturesError(
+                f'Error, Cannot Inject Unknown Status Codes... | Codes: {sorted(unknown_codes)}'
+            )
+
+
+# ---------- Main Method. ----------
+    async def init_server(self) -> None:
+        try:
+            total_fixtures = await asyncio.to_thread(self.store.load)
+            self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+            await self.logger.critical(
+                f'Init Replay Server | Listen: http://{self.host}:{self.port} - Fixtures: {total_fixtures} - Tokens: {self.token_mode} - Errors: {self.error_rates}'
+            )
+            async with self._server:
+                await self._server.serve_forever()
+
+        finally:
+            await self.logger.info(f'Replay Server Stopped | Stats: {dict(self.stats)}')
+            await self.logger.shutdown()
+
+
+# ---------- HTTP Handling ----------
+    # --- Keep-Alive Connection, One Request After Another ---
+    async def handle_connection(self,
+        reader:asyncio.StreamReader,
+        writer:asyncio.StreamWriter
+    ) -> None:
+
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, value in (line.split(":", 1) for line in header_lines if ":" in line)
+                }
+                content_length = int(headers.get("content-length", 0))
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                status_code, content_type, payload = await self.handle_request(method, target, headers)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(type(self).build_response(status_code, content_type, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def handle_request(self,
+        method:str,
+        target:str,
+        headers:Dict[str, str]
+    ) -> Tuple[int, str, bytes]:
+
+        self.stats["requests"] += 1
+        if self.latency[1] > 0:
+            await asyncio.sleep(random.uniform(*self.latency))
+
+        kind, flex_dates, leg = FixturesStore.fixture_key(target)
+        if method != "GET" or not leg:
+            return self._respond(404, {"errorMessage": "replay.route.not-found"})
+
+        # --- Injected Failures First, Like An Unstable Upstream ---
+        injected_code = self._pick_error(kind)
+        if injected_code:
+            self.stats["injected"] += 1
+            return self._respond(injected_code, ERROR_RESPONSES[injected_code])
+
+        if kind == "site":
+            return self._serve_site(flex_dates, leg)
+
+        token_error = self._check_token(headers.get("authorization", ""))
+        if token_error:
+            return self._respond(401, {"errorMessage": token_error})
+
+        if type(self).is_past_date(leg):
+            return self._respond(400, ERROR_RESPONSES[400])
+
+        fixture = self.store.lookup(kind, flex_dates, leg)
+        if not fixture:
+            return self._respond(404, {"errorMessage": "replay.fixture.not-found"})
+        self.stats[fixture["status_code"]] += 1
+        return fixture["status_code"], "application/json", fixture["payload"]
+
+    # --- Flights Page With A Token Minted By The Server ---
+    def _serve_site(self,
+        flex_dates:bool,
+        leg:str
+    ) -> Tuple[int, str, bytes]:
+
+        bearer_token = self.mint_token()
+        fixture = self.store.lookup("site", flex_dates, leg)
+        if fixture and fixture["status_code"] == 200:
+            html = SITE_TOKEN_PATTERN.sub(rf'\g<1>{bearer_token}\g<2>', fixture["body"])
+        else:
+            html = SITE_FALLBACK_HTML.format(token = bearer_token)
+
+        self.stats["tokens_minted"] += 1
+        self.stats[200] += 1
+        return 200, "text/html; charset=utf-8", html.encode()
+
+    def _respond(self,
+        status_code:int,
+        body:Union[Dict[str, Any], str]
+    ) -> Tuple[int, str, bytes]:
+
+        self.stats[status_code] += 1
+        if isinstance(body, str):
+            return status_code, "text/html; charset=utf-8", body.encode()
+        return status_code, "application/json", json.dumps(body).encode()
+
+
+# ---------- Tokens ----------
+    def mint_token(self) -> str:
+        now = time()
+        return jwt.encode(
+            {"iat": int(now), "exp": int(now + self.token_ttl), "jti": random.getrandbits(64)},
+            self.token_secret,
+            algorithm = "HS256"
+        )
+
+    # --- Same Messages The Gateway Returns ---
+    def _check_token(self,
+        authorization:str
+    ) -> Optional[str]:
+
+        if self.token_mode == "off":
+            return None
+        if not authorization.startswith("Bearer ") or not authorization[7:].strip():
+            return "unauthorized"
+        if self.token_mode == "any":
+            return None
+
+        try:
+            jwt.decode(authorization[7:].strip(), self.token_secret, algorithms = ["HS256"])
+            return None
+        except jwt.ExpiredSignatureError:
+            return "core.gateway.access-denied"
+        except jwt.InvalidTokenError:
+            return "unauthorized"
+
+
+# ---------- Tools ----------
+    def _pick_error(self,
+        kind:FixtureKind
+    ) -> Optional[int]:
+
+        for status_code, rate in self.error_rates.items():
+            # --- Site Page Has No Auth Or Search Validation ---
+            if kind == "site" and status_code in (400, 401):
+                continue
+            if random.random() < rate:
+                return status_code
+        return None
+
+    @staticmethod
+    def is_past_date(
+        leg:str
+    ) -> bool:
+        try:
+            return datetime.strptime(leg.rsplit("-", 1)[-1], "%Y%m%d").date() < date.today()
+        except ValueError:
+            return False
+
+    @staticmethod
+    def build_response(
+        status_code:int,
+        content_type:str,
+        payload:bytes,
+        keep_alive:bool = True
+    ) -> bytes:
+        head = (
+            f'HTTP/1.1 {status_code} {REASON_PHRASES.get(status_code, "Unknown")}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+            f'\r\n'
+        )
+        return head.encode("latin-1") + payload
+
+
+# ---------- Record Live Responses ----------
+async def record_fixtures(
+    store:FixturesStore,
+    routes:List[Tuple[str, str]],
+    dates:List[str],
+    one_way:bool = False
+) -> int:
+
+    logger = AsyncMessageHandler(
+        log_filename = "ReplayRecorder",
+        logs_folder = "./aerolineasARG/Replay",
+        printer_msg = "[AerolineasArg][Replay Recorder] Status:"
+    )
+    recorder = AerolineasRecorderScraper(store)
+    try:
+        first_origin, first_destination = routes[0]
+        _, bearer_token = await recorder.get_new_bearer_token(
+            FlightQueryParams(date = dates[0], fly_from = first_origin, fly_to = first_destination)
+        )
+
+        for origin, destination in routes:
+            for departure_date in dates:
+                params = FlightQueryParams(date = departure_date, fly_from = origin, fly_to = destination)
+                try:
+                    await recorder.get_flights_month_calendar(params, bearer_token)
+                    if one_way:
+                        await recorder.get_flights_one_way(params, bearer_token)
+                except ScrapersError as err:
+                    # --- Error Response Is Already Recorded ---
+                    await logger.warning(f'Recorded Error Response | Route: {origin}-{destination} - Date: {departure_date} | {type(err).__name__}')
+
+        await logger.success(f'Recording Finished | Responses: {recorder.recorded} - Store: {store.fixtures_path}')
+        return recorder.recorded
+
+    finally:
+        await recorder.transport.aclose()
+        await logger.shutdown()
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Aerolineas API Record/Replay")
+    parser.add_argument("--fixtures", default = "./FlightsData/AerolineasARG/fixtures")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    record_parser = commands.add_parser("record")
+    record_parser.add_argument("--routes", nargs = "+", required = True, help = "AEP-COR COR-AEP ...")
+    record_parser.add_argument("--dates", nargs = "+", required = True, help = "YYYYMMDD ...")
+    record_parser.add_argument("--one-way", action = "store_true")
+
+    serve_parser = commands.add_parser("serve")
+    serve_parser.add_argument("--host", default = "127.0.0.1")
+    serve_parser.add_argument("--port", type = int, default = 8085)
+    serve_parser.add_argument("--latency", type = float, nargs = 2, default = (0.0, 0.0), help = "Min Max Seconds")
+    serve_parser.add_argument("--error", action = "append", default = list(), help = "STATUS=RATE, e.g. 429=0.02")
+    serve_parser.add_argument("--tokens", choices = ["strict", "any", "off"], default = "strict")
+    serve_parser.add_argument("--token-ttl", type = float, default = 3600)
+    args = parser.parse_args()
+
+    async def main():
+        store = FixturesStore(args.fixtures)
+        if args.command == "record":
+            await record_fixtures(
+                store,
+                routes = [tuple(route.split("-", 1)) for route in args.routes],
+                dates = args.dates,
+                one_way = args.one_way
+            )
+        else:
+            server = AerolineasReplayServer(
+                store,
+                host = args.host,
+                port = args.port,
+                latency = tuple(args.latency),
+                error_rates = {int(code): float(rate) for code, rate in (item.split("=", 1) for item in args.error)},
+                token_mode = args.tokens,
+                token_ttl = args.token_ttl
+            )
+            await server.init_server()
+
+    asyncio.run(main())
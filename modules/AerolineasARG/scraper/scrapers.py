@@ -1,8 +1,9 @@
-import asyncio, re
+import asyncio, re, dotenv
 from dataclasses import dataclass
-from typing import Dict, Any, Union, Tuple
+from typing import Optional, Dict, Any, Union, Tuple, AsyncIterator
 
-from utils.fetchsmethods import FetchsMethodsClass
+from utils.fetchsmethods import PooledFetchsMethodsClass, TRANSPORT_ERRORS
+from modules.AerolineasARG.scraper.fast_parser import FlightsResult, parse_calendar, parse_one_way
 from utils.exceptions import (
     ScrapersError,
     UnauthorizedTokenAPI,
@@ -18,6 +19,11 @@ from utils.exceptions import (
 )
 
 
+# --- Bearer Token Inside Flights HTML Page ---
+TOKEN_MARKER = b'window.__ACCESS_TOKEN__'
+TOKEN_PATTERN = re.compile(rb'window\.__ACCESS_TOKEN__\s*=\s*"([^"]+)"')
+TOKEN_MAX_CARRY = 64 * 1024
+
 
 @dataclass(slots = True)
 class FlightQueryParams:
@@ -41,17 +47,50 @@ class FlightQueryParams:
         }
 
 
-class AerolineasScraper(FetchsMethodsClass):
+class AerolineasScraper(PooledFetchsMethodsClass):
+    # --- Overridable From .env, Point To Replay Server For Offline Runs ---
+    api_url:str = dotenv.dotenv_values().get("AEROLINEAS_API_URL") or "https://api.aerolineas.com.ar/v1/flights/"
+    site_url:str = dotenv.dotenv_values().get("AEROLINEAS_SITE_URL") or "https://www.aerolineas.com.ar/flights-"
+
     def __init__(self):
         super().__init__()
 
 
 # ---------- Scraping Data ----------
-    # --- Get BearerTokens ---
+    # --- Get BearerTokens (Streaming, Stops At First Match) ---
     async def get_new_bearer_token(self,
         params:FlightQueryParams
     ) -> Tuple[bool, str]:
 
+        url = self.gen_url_flyghts(
+            params = params.to_dict(),
+            use_api = False
+        )
+        try:
+            async with self.transport.stream(
+                "GET",
+                url,
+                headers = type(self).ordered_headers(url, self.gen_new_headers()),
+                timeout = 10
+            ) as response:
+                if response.status != 200:
+                    content = await self.transport.read_decoded(response)
+                    type(self).check_status_code(
+                        response.status,
+                        content.decode("utf-8", errors = "replace"),
+                        params = params.to_dict()
+                    )
+                # --- Leaving Early Resets The Stream (HTTP/2) Or Drops The Connection (HTTP/1.1) ---
+                return await type(self).parsing_token_bearer_stream(self.transport.iter_decoded(response))
+
+        except TRANSPORT_ERRORS as err:
+            return False, f'Requests Error, "Bearer Token" Could Not Be Retrieved... | {type(err).__name__}: {str(err)}'
+
+    # --- Get BearerTokens (Full Page) ---
+    async def get_new_bearer_token_full(self,
+        params:FlightQueryParams
+    ) -> Tuple[bool, str]:
+
         status_code, response = await self.fetch_GET(
             url = self.gen_url_flyghts(
                 params = params.to_dict(),
@@ -76,7 +115,7 @@ class AerolineasScraper(FetchsMethodsClass):
     async def get_flights_one_way(self,
         params:FlightQueryParams,
         bearer_token:str
-    ) -> Tuple[bool, Union[Dict, str]]:
+    ) -> Tuple[bool, Union[FlightsResult, str]]:
 
         status_code, response = await self.fetch_GET(
             url = self.gen_url_flyghts(
@@ -114,13 +153,13 @@ class AerolineasScraper(FetchsMethodsClass):
             return False, f'Requests Error, Retrieving Flight Details... | {response}'
         
         type(self).check_status_code(status_code, response, params.to_dict())
-        return type(self).parsing_flyghts(response, params.to_dict())
+        return parse_one_way(response, params.to_dict())
 
     # --- Get Monthly Details ---
     async def get_flights_month_calendar(self,
         params:FlightQueryParams,
         bearer_token:str
-    ) -> Tuple[bool, Union[Dict, str]]:
+    ) -> Tuple[bool, Union[FlightsResult, str]]:
         
         status_code, response = await self.fetch_GET(
             url = self.gen_url_flyghts(
@@ -159,10 +198,11 @@ class AerolineasScraper(FetchsMethodsClass):
             return False, f'Request Error, Retrieving Calendar Details... | {response}'
 
         type(self).check_status_code(status_code, response, params.to_dict())
-        return type(self).parsing_flyghts_calendar(response, params.to_dict())
+        return parse_calendar(response, params.to_dict())
 
 
 # ---------- Parsing Data ----------
+    # --- Dict Based Parsers, Reference For "fast_parser" Parity & Benchmarks ---
     # --- Flights One Way ---
     @staticmethod
     def parsing_flyghts(
@@ -317,25 +357,49 @@ class AerolineasScraper(FetchsMethodsClass):
             )
         return True, match.group(1)
 
+    # --- Bearer Tokens From Response Chunks ---
+    @staticmethod
+    async def parsing_token_bearer_stream(
+        chunks:AsyncIterator[bytes]
+    ) -> Tuple[bool, str]:
+
+        carry = b''
+        async for chunk in chunks:
+            data = carry + chunk
+            match = TOKEN_PATTERN.search(data)
+            if match:
+                return True, match.group(1).decode()
+
+            # --- Keep Only What Could Be A Match Straddling Chunks ---
+            marker_index = data.rfind(TOKEN_MARKER)
+            carry = data[marker_index:] if marker_index != -1 else data[-(len(TOKEN_MARKER) - 1):]
+            if len(carry) > TOKEN_MAX_CARRY:
+                carry = carry[-(len(TOKEN_MARKER) - 1):]
+
+        raise CannotGetBearerTokenError(
+            f'Error, Couldn´t Get "Bearer Token" From Resp., Structure May Have Changed...',
+            context = {
+                "error_type": f'The HTML Has Changed And Is Not Compatible With Current Search Format For "Bearer Token".',
+                "error_msg": f'Stream Ended Without Match'
+            }
+        )
+
 
 # ---------- Tools ----------
     # --- Gen. Query URL ---
-    @staticmethod
-    def gen_url_flyghts( 
+    @classmethod
+    def gen_url_flyghts(cls,
         params:Dict[str, Any],
         use_api:bool = True,
         flex_dates:str = "false"
     ) -> str:
 
-        api_url = "https://api.aerolineas.com.ar/v1/flights/"
-        site_url = "https://www.aerolineas.com.ar/flights-"
-
         missing_params = [param for param in ['date', 'fly_from', 'fly_to'] if not params.get(param, None)]
         if missing_params:
             raise ScrapersError(
                 f'Missing required parameters to create Query Valid... "{", ".join(missing_params)}"'
             )
-        return f'{api_url if use_api else site_url}offers?adt={params["adults"]}&inf={params["infants"]}&chd={params["children"]}&flexDates={flex_dates}&cabinClass={params["cabin_class"]}&flightType=ONE_WAY&leg={params["fly_from"]}-{params["fly_to"]}-{params["date"]}'
+        return f'{cls.api_url if use_api else cls.site_url}offers?adt={params["adults"]}&inf={params["infants"]}&chd={params["children"]}&flexDates={flex_dates}&cabinClass={params["cabin_class"]}&flightType=ONE_WAY&leg={params["fly_from"]}-{params["fly_to"]}-{params["date"]}'
 
     # --- Checker Status Code ---
     @staticmethod
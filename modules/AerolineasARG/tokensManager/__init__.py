@@ -1,2 +1,3 @@
 #from .finder_tokens import FinderBearerTokens
-#from .updater_tokens import UpdaterBearerTokens
\ No newline at end of file
+#from .updater_tokens import UpdaterBearerTokens
+from .token_pool import TokenPool, TokenHealth
\ No newline at end of file
@@ -1,4 +1,5 @@
 import asyncio
+from math import ceil
 from pathlib import Path
 from typing import Optional, Union, Any, Dict, Tuple
 
@@ -36,6 +37,9 @@ class FinderBearerTokens(AerolineasScraper):
         self.db_tokens = DBTokensManager()
         # --- Configs ---
         self.configs:Dict[str, Dict[str, Any]] = dict()
+        # --- Harvest Attribute ---
+        self.semaphore:asyncio.Semaphore = None
+        self.target_size:int = 1
         # --- Logger ---
         self.logger = AsyncMessageHandler(
             log_filename = log_name, 
@@ -51,6 +55,9 @@ class FinderBearerTokens(AerolineasScraper):
             "admin": await configs.get_configs("monitor_configs", "admin_configs", "webhooks"),
             "general": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas")
         }
+        self.transport.configure(**self.configs["general"].get("http_transport", dict()))
+        self.semaphore = asyncio.Semaphore(self.configs["general"].get("tokens_harvest_parallelism", 1))
+        self.target_size = type(self).target_pool_size(self.configs["general"])
         # --- Init DB Tokens ---
         await self.db_tokens.connect_db()
 
@@ -61,7 +68,7 @@ class FinderBearerTokens(AerolineasScraper):
             # --- Configs ---
             await self.load_configs()
             # --- Init Monitor ---
-            await self.logger.critical("Init Module Aerolineas Tokens Finder")
+            await self.logger.critical(f'Init Module Aerolineas Tokens Finder | Target Pool Size: {self.target_size}')
 
             await self.search_new_tokens()
 
@@ -82,6 +89,7 @@ class FinderBearerTokens(AerolineasScraper):
         
         finally:
             await self.db_tokens.disconnect_db()
+            await self.transport.aclose()
             await self.logger.shutdown()
 
 
@@ -89,17 +97,43 @@ class FinderBearerTokens(AerolineasScraper):
     # --- Manager ---
     async def search_new_tokens(self) -> None:
         flag_message = True
+        refresh_margin = self.configs["general"].get("tokens_refresh_margin", 0)
 
         while True:
-            try:
-                await self._try_get_new_token()
-                flag_message = True
+            usable_tokens = await self.db_tokens.count_usable_tokens(refresh_margin)
+            missing_tokens = self.target_size - usable_tokens
 
-            except TokenAlreadyExists:
+            # --- Pool Full, Stay Idle ---
+            if missing_tokens <= 0:
                 if flag_message:
                     flag_message = False
-                    await self.logger.warning("Waiting For New Tokens...", to_file = False)
-                await asyncio.sleep(10)
+                    await self.logger.warning(
+                        f'Token Pool Full ({usable_tokens}/{self.target_size}), Waiting...',
+                        to_file = False
+                    )
+                await asyncio.sleep(self.configs["general"]["delay"])
+                continue
+
+            flag_message = True
+            await self.logger.info(f'Token Pool Short ({usable_tokens}/{self.target_size}), Harvesting {missing_tokens} Tokens...')
+            async with asyncio.TaskGroup() as group:
+                harvest_tasks = [
+                    group.create_task(self._harvest_token())
+                    for _ in range(missing_tokens)
+                ]
+
+            # --- Only Duplicates/Errors, Avoid Hammering The Site ---
+            if not any(task.result() for task in harvest_tasks):
+                await asyncio.sleep(self.configs["general"]["delay"])
+
+    # --- Harvest Single Token (Bounded Parallelism) ---
+    async def _harvest_token(self) -> bool:
+        async with self.semaphore:
+            try:
+                return await self._try_get_new_token()
+
+            except TokenAlreadyExists:
+                await self.logger.warning("Token Already Exists, Discarded...", to_file = False)
 
             except (RequestsBlocked, InvalidPastDate, GdsResponseError, SiteServiceDown) as err:
                 await self.logger.error(f'Error Searching "Bearer Token" | Type: {type(err).__name__} | Message: {str(err)}')
@@ -110,9 +144,10 @@ class FinderBearerTokens(AerolineasScraper):
                     f'Unhandled Error While Searching Token | Type: {type(err).__name__} | Message: {str(err)}'
                 )
                 raise
+            return False
 
     # --- Get New Token ---
-    async def _try_get_new_token(self) -> None:
+    async def _try_get_new_token(self) -> bool:
         status, response_token = await self.find_new_token()
         
         if not status:
@@ -121,17 +156,36 @@ class FinderBearerTokens(AerolineasScraper):
                 to_file = False
             )
             await asyncio.sleep(self.configs["general"]["delay_error"])
-            return
-
-        exists_token, _ = await self.db_tokens.check_token_exists(response_token)
-        if exists_token:
-            raise TokenAlreadyExists
+            return False
 
+        # --- Unique Index On "bearer_token": A Duplicate Raises "TokenAlreadyExists" ---
         _, message_saved = await self.db_tokens.set_token(response_token)
         await self.logger.success(
             message = f'{message_saved}: ...{response_token[-25:]}',
             hidden_msg = f'Bearer Token: {response_token}'
         )
+        return True
+
+
+# ---------- Tools ----------
+    # --- Tokens Needed By Producer Concurrency & Per-Token Rate Limit ---
+    @staticmethod
+    def target_pool_size(
+        configs:Dict[str, Any]
+    ) -> int:
+
+        if configs.get("tokens_target_size"):
+            return configs["tokens_target_size"]
+
+        # --- Each Producer Worker Sends ~1 Request Per "delay_error" Seconds ---
+        producer_rate = configs.get("max_threads_monitor_month", 1) / max(configs.get("delay_error", 1), 1)
+        token_rate = configs.get("tokens_pool", dict()).get("max_requests_per_second")
+        needed_tokens = ceil(producer_rate / token_rate) if token_rate else 1
+
+        return max(
+            configs.get("tokens_target_min", 1),
+            min(needed_tokens, configs.get("tokens_target_max", needed_tokens))
+        )
 
 
 # ---------- Scraping Data ----------
@@ -0,0 +1,268 @@
+import asyncio
+from time import monotonic, time
+from datetime import datetime
+from collections import deque, defaultdict, Counter
+from dataclasses import dataclass, field
+from typing import Optional, Deque, Dict, Any, Literal
+
+from utils.exceptions import (
+    ExpiredTokenAPI,
+    UnauthorizedTokenAPI,
+    RequestsBlocked
+)
+
+
+TokenOutcome = Literal["success", "expired", "unauthorized", "blocked", "error"]
+
+
+@dataclass(slots = True)
+class TokenHealth:
+    bearer_token:str
+    expires_at:Optional[float] = None
+    in_flight:int = 0
+    total_leases:int = 0
+    latency:float = 0.0
+    failures:Deque[float] = field(default_factory = deque)
+    next_lease_at:float = 0.0
+    quarantined_until:float = 0.0
+
+    def recent_failures(self,
+        now:float,
+        window:float
+    ) -> int:
+
+        while self.failures and now - self.failures[0] > window:
+            self.failures.popleft()
+        return len(self.failures)
+
+    def is_available(self,
+        now:float,
+        expiry_limit:float = 0.0
+    ) -> bool:
+        return (
+            self.quarantined_until <= now
+            and self.next_lease_at <= now
+            and (self.expires_at is None or self.expires_at > expiry_limit)
+        )
+
+
+class TokenPool:
+    def __init__(self,
+        max_requests_per_second:Optional[float] = None,
+        quarantine_seconds:float = 600,
+        blocked_cooldown:float = 60,
+        failures_window:float = 60,
+        max_failures:int = 3,
+        expiry_margin:float = 30,
+        latency_smoothing:float = 0.2
+    ):
+        self._tokens:Dict[str, TokenHealth] = dict()
+        self._condition = asyncio.Condition()
+        self._reports:Dict[str, Counter] = defaultdict(Counter)
+        # --- Limits ---
+        self.lease_interval = 1 / max_requests_per_second if max_requests_per_second else 0.0
+        self.quarantine_seconds = quarantine_seconds
+        self.blocked_cooldown = blocked_cooldown
+        self.failures_window = failures_window
+        self.max_failures = max_failures
+        self.expiry_margin = expiry_margin
+        self.latency_smoothing = latency_smoothing
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self,
+        bearer_token:str
+    ) -> bool:
+        return bearer_token in self._tokens
+
+
+# ---------- Manage Tokens ----------
+    # --- Replace Active Tokens, Keep Known Stats ---
+    async def sync(self,
+        bearer_tokens:Dict[str, Optional[datetime]]
+    ) -> bool:
+
+        async with self._condition:
+            current_tokens = set(self._tokens)
+            if bearer_tokens.keys() == current_tokens:
+                return False
+
+            for bearer_token in current_tokens - bearer_tokens.keys():
+                del self._tokens[bearer_token]
+            for bearer_token in bearer_tokens.keys() - current_tokens:
+                self._tokens[bearer_token] = TokenHealth(
+                    bearer_token,
+                    expires_at = type(self)._to_timestamp(bearer_tokens[bearer_token])
+                )
+
+            self._condition.notify_all()
+            return True
+
+    # --- Add Single Token ---
+    async def add(self,
+        bearer_token:str,
+        expires_at:Optional[datetime] = None
+    ) -> bool:
+
+        async with self._condition:
+            if bearer_token in self._tokens:
+                return False
+            self._tokens[bearer_token] = TokenHealth(
+                bearer_token,
+                expires_at = type(self)._to_timestamp(expires_at)
+            )
+            self._condition.notify_all()
+            return True
+
+    # --- Remove Single Token ---
+    async def discard(self,
+        bearer_token:str
+    ) -> bool:
+
+        async with self._condition:
+            return self._tokens.pop(bearer_token, None) is not None
+
+    # --- Quarantine Token Without Waiting The Updater ---
+    async def quarantine(self,
+        bearer_token:str,
+        seconds:Optional[float] = None
+    ) -> None:
+
+        async with self._condition:
+            token = self._tokens.get(bearer_token)
+            if token:
+                token.quarantined_until = monotonic() + (seconds or self.quarantine_seconds)
+
+
+# ---------- Lease Tokens ----------
+    # --- Wait Until Pool Has Tokens ---
+    async def wait_ready(self) -> None:
+        async with self._condition:
+            while not self._tokens:
+                await self._condition.wait()
+
+    # --- Least Loaded Token ---
+    async def lease(self) -> str:
+        async with self._condition:
+            while True:
+                now = monotonic()
+                token = self._select_token(now)
+                if token:
+                    token.in_flight += 1
+                    token.total_leases += 1
+                    token.next_lease_at = now + self.lease_interval
+                    return token.bearer_token
+
+                # --- Sleep Until Next Token Is Free Or Pool Changes ---
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait(),
+                        timeout = self._next_available_in(now)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    # --- Return Token With Request Outcome ---
+    async def release(self,
+        bearer_token:str,
+        outcome:TokenOutcome,
+        latency:Optional[float] = None
+    ) -> None:
+
+        async with self._condition:
+            self._reports[bearer_token][outcome] += 1
+            token = self._tokens.get(bearer_token)
+            if not token:
+                return
+
+            now = monotonic()
+            token.in_flight = max(0, token.in_flight - 1)
+            if latency is not None:
+                token.latency = (
+                    latency if not token.latency
+                    else token.latency + self.latency_smoothing * (latency - token.latency)
+                )
+
+            match outcome:
+                case "expired" | "unauthorized":
+                    token.quarantined_until = now + self.quarantine_seconds
+                case "blocked":
+                    token.failures.append(now)
+                    if token.recent_failures(now, self.failures_window) >= self.max_failures:
+                        token.quarantined_until = now + self.blocked_cooldown
+                        token.failures.clear()
+
+            self._condition.notify_all()
+
+
+# ---------- Tools ----------
+    def _select_token(self,
+        now:float
+    ) -> Optional[TokenHealth]:
+
+        expiry_limit = time() + self.expiry_margin
+        candidates = [token for token in self._tokens.values() if token.is_available(now, expiry_limit)]
+        if not candidates:
+            return None
+
+        return min(
+            candidates,
+            key = lambda token: (
+                token.in_flight,
+                token.recent_failures(now, self.failures_window),
+                token.latency
+            )
+        )
+
+    def _next_available_in(self,
+        now:float
+    ) -> Optional[float]:
+
+        # --- Expired Tokens Never Come Back, Wait For Pool Changes ---
+        expiry_limit = time() + self.expiry_margin
+        waiting_times = [
+            max(token.next_lease_at, token.quarantined_until)
+            for token in self._tokens.values()
+            if token.expires_at is None or token.expires_at > expiry_limit
+        ]
+        if not waiting_times:
+            return None
+        return max(0.01, min(waiting_times) - now)
+
+    # --- Outcomes Since Last Call, For The Shared Health Store ---
+    def drain_reports(self) -> Dict[str, Dict[str, int]]:
+        reports = {token: dict(outcomes) for token, outcomes in self._reports.items()}
+        self._reports.clear()
+        return reports
+
+    def summary(self) -> Dict[str, Any]:
+        now = monotonic()
+        expiry_limit = time() + self.expiry_margin
+        return {
+            "tokens": len(self._tokens),
+            "available": sum(token.is_available(now, expiry_limit) for token in self._tokens.values()),
+            "expiring": sum(token.expires_at is not None and token.expires_at <= expiry_limit for token in self._tokens.values()),
+            "quarantined": sum(token.quarantined_until > now for token in self._tokens.values()),
+            "in_flight": sum(token.in_flight for token in self._tokens.values()),
+            "leases": sum(token.total_leases for token in self._tokens.values())
+        }
+
+    @staticmethod
+    def outcome_from_error(
+        err:Exception
+    ) -> TokenOutcome:
+
+        if isinstance(err, ExpiredTokenAPI):
+            return "expired"
+        if isinstance(err, UnauthorizedTokenAPI):
+            return "unauthorized"
+        if isinstance(err, RequestsBlocked):
+            return "blocked"
+        return "error"
+
+    @staticmethod
+    def _to_timestamp(
+        expires_at:Optional[datetime]
+    ) -> Optional[float]:
+        return expires_at.timestamp() if expires_at else None
@@ -1,6 +1,7 @@
 import asyncio
 from pathlib import Path
-from typing import Optional, Union, Any, Dict, Tuple, List
+from datetime import datetime
+from typing import Optional, Union, Any, Dict, Tuple, Literal
 
 from utils.DB import DBTokensManager
 from modules.AerolineasARG import (
@@ -20,6 +21,7 @@ from utils import (
     InvalidPastDate,
     GdsResponseError,
     SiteServiceDown,
+    DBTokensError
 )
 
 
@@ -37,6 +39,7 @@ class UpdaterBearerTokens(AerolineasScraper):
         self.db_tokens = DBTokensManager()
         # --- Tasks Token Checker ---
         self.tasks_tokens:Dict[str, asyncio.Task] = dict()
+        self.active_tokens:Dict[str, Optional[datetime]] = dict()
         # --- Configs ---
         self.configs:Dict[str, Dict[str, Any]] = dict()
         # --- Logger ---
@@ -54,6 +57,7 @@ class UpdaterBearerTokens(AerolineasScraper):
             "admin": await configs.get_configs("monitor_configs", "admin_configs", "webhooks"),
             "general": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas")
         }
+        self.transport.configure(**self.configs["general"].get("http_transport", dict()))
         # --- Init DB Tokens ---
         await self.db_tokens.connect_db()
 
@@ -85,6 +89,7 @@ class UpdaterBearerTokens(AerolineasScraper):
 
         finally:
             await self.db_tokens.disconnect_db()
+            await self.transport.aclose()
             await self.logger.shutdown()
 
 
@@ -92,28 +97,88 @@ class UpdaterBearerTokens(AerolineasScraper):
     # --- Checker Tokens ---
     async def checker_active_tokens(self) -> None:
         flag_message = True
+        asyncio.create_task(self.watch_active_tokens())
 
         while True:
-            db_response = await self.get_active_tokens(flag_message)
-            if not db_response:
+            try:
+                await self.retire_expired_tokens()
+            except DBTokensError as err:
+                await self.logger.error(
+                    f'Error Retiring Expired Tokens, Retrying Next Cycle... | Type: {type(err).__name__} | Message: {str(err)}'
+                )
+
+            if not self.active_tokens:
+                if flag_message:
+                    await self.logger.warning('Waiting New Tokens For Testing...')
                 flag_message = False
                 await asyncio.sleep(self.configs["general"]["delay"])
                 continue
 
-            for token_data in db_response:
-                bearer_token = token_data["bearer_token"]
+            flag_message = True
+            try:
+                tokens_health = await self.db_tokens.get_tokens_health()
+            except DBTokensError as err:
+                await self.logger.error(
+                    f'Error Reading Tokens Health, Retrying Next Cycle... | Type: {type(err).__name__} | Message: {str(err)}'
+                )
+                await asyncio.sleep(self.configs["general"]["delay_error"])
+                continue
+            for bearer_token in list(self.active_tokens):
+                match self.passive_token_status(tokens_health.get(bearer_token)):
+                    case "dead":
+                        if task := self.tasks_tokens.get(bearer_token):
+                            task.cancel()
+                        await self.updater_invalid_token(bearer_token)
+                        continue
+                    case "healthy":
+                        continue
+
                 if bearer_token not in self.tasks_tokens or self.tasks_tokens[bearer_token].done():
                     task = asyncio.create_task(self.manager_active_tokens(bearer_token))
                     self.tasks_tokens[bearer_token] = task
 
             await asyncio.sleep(self.configs["general"]["delay"])
 
+    # --- Keep Active Tokens In Memory (Push Events) ---
+    async def watch_active_tokens(self) -> None:
+        while True:
+            try:
+                async for event, bearer_tokens in self.db_tokens.watch_tokens(
+                    poll_delay = self.configs["general"]["delay"]
+                ):
+                    match event:
+                        case "snapshot":
+                            self.active_tokens = dict(bearer_tokens)
+                        case "add":
+                            self.active_tokens.update(bearer_tokens)
+                        case "deactivate":
+                            # --- Stop Checking Dead Tokens ---
+                            for bearer_token in bearer_tokens:
+                                self.active_tokens.pop(bearer_token, None)
+                                if task := self.tasks_tokens.get(bearer_token):
+                                    task.cancel()
+
+                # --- Stream Closed Without An Error, Reopen After A Pause (No Hot Loop Against Mongo) ---
+                await self.logger.warning('Active Tokens Watch Ended, Reopening...')
+                await asyncio.sleep(self.configs["general"]["delay_error"])
+
+            except DBTokensError as err:
+                await self.logger.error(
+                    f'Error Watching Active Tokens, Retrying... | Type: {type(err).__name__} | Message: {str(err)}'
+                )
+                await asyncio.sleep(self.configs["general"]["delay_error"])
+
     # --- Manager/Checker if Token Active ---
     async def manager_active_tokens(self,
         bearer_token:str
     ) -> None:
 
         try:
+            # --- JWT Tokens: Retire On Expiry, No Probes ---
+            if expires_at := self.active_tokens.get(bearer_token):
+                await self.retire_on_expiry(bearer_token, expires_at)
+                return
+
             status_token = await self.validate_token(bearer_token)
             if not status_token:
                 await self.updater_invalid_token(bearer_token)
@@ -122,6 +187,22 @@ class UpdaterBearerTokens(AerolineasScraper):
         finally:
             self.tasks_tokens.pop(bearer_token, None)
 
+    # --- Schedule Retirement Before Expiry ---
+    async def retire_on_expiry(self,
+        bearer_token:str,
+        expires_at:datetime
+    ) -> None:
+
+        refresh_margin = self.configs["general"].get("tokens_refresh_margin", 0)
+        wait_seconds = (expires_at - datetime.now()).total_seconds() - refresh_margin
+        if wait_seconds > 0:
+            await self.logger.info(
+                f'Token Scheduled For Retirement In {int(wait_seconds)}s | Token: ...{bearer_token[-25:]}',
+                to_file = False
+            )
+            await asyncio.sleep(wait_seconds)
+        await self.updater_invalid_token(bearer_token)
+
     # --- Testing Token ---
     async def validate_token(self,
         bearer_token:str
@@ -168,7 +249,34 @@ class UpdaterBearerTokens(AerolineasScraper):
                 raise
 
 
+    # --- Status From Producer Traffic, Probes Only Without Recent Traffic ---
+    def passive_token_status(self,
+        health:Optional[Dict[str, Any]]
+    ) -> Literal["dead", "healthy", "unknown"]:
+
+        if not health:
+            return "unknown"
+
+        # --- The Producer Quarantines A Token After Its First Auth Failure, Each Process Reports ~1 Per Quarantine ---
+        if health.get("auth_failures_since_success", 0) >= self.configs["general"].get("tokens_passive_max_failures", 1):
+            return "dead"
+
+        last_success = health.get("last_success")
+        passive_window = self.configs["general"].get("tokens_passive_window", 300)
+        if last_success and (datetime.now() - last_success).total_seconds() <= passive_window:
+            return "healthy"
+        return "unknown"
+
+
 # ---------- DB Tokens Methods ----------
+    # --- Bulk Retire Expired JWT Tokens ---
+    async def retire_expired_tokens(self) -> None:
+        status, total_retired = await self.db_tokens.deactivate_expired_tokens(
+            margin_seconds = self.configs["general"].get("tokens_refresh_margin", 0)
+        )
+        if status:
+            await self.logger.warning(f'Expired Tokens Retired Without Probes: {total_retired}')
+
     # --- Marker Invalid Tokens ---
     async def updater_invalid_token(self,
         bearer_token:str
@@ -182,18 +290,6 @@ class UpdaterBearerTokens(AerolineasScraper):
             hidden_msg = f'Token Marked As Invalid: {bearer_token}'
         )
 
-    # --- Get All Tokens Active ---
-    async def get_active_tokens(self,
-        flag_message:bool
-    ) -> Union[List[Dict], List]:
-        
-        db_status, db_response = await self.db_tokens.get_tokens(only_active = True)
-        if not db_status or not db_response:
-            if flag_message:
-                await self.logger.warning('Waiting New Tokens For Testing...')
-            return []
-        return db_response
-
 
 # ---------- Scraping Data ----------
     # --- Fetch Method  ---
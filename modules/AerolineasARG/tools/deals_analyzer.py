@@ -1,4 +1,5 @@
-from typing import Union, Any, Dict
+from typing import Optional, Union, Any, Dict, List, Tuple
+import numpy as np
 
 from utils.DB import AsyncFlightDBManager
 from utils.exceptions import DealsAnalyzerManager
@@ -9,6 +10,48 @@ from utils import (
 )
 
 
+# --- Alert Variant -> (Level, Description Lines) ---
+DEAL_ALERTS:Dict[str, Tuple[str, Tuple[str, str, str]]] = {
+    "extreme": ("extreme", (
+        "🔥 *Nuevo Precio Extremadamente Bajo: ${price}.*\n",
+        "Normalmente Se Encuentra Por Arriba De: ${q1}.\n",
+        "🧠 Ahorro Aproximado: {percentage_off}%."
+    )),
+    "deal": ("deal", (
+        "💸 *Nuevo Precio Bajo: ${price}.*\n",
+        "Valor de Referencia Promedio: ${q1}.\n",
+        "💰 Ahorro Estimado: {percentage_off}%."
+    )),
+    "deal_no_iqr": ("deal", (
+        "💸 *Nuevo Precio Destacado: ${price}.*\n",
+        "Valor Habitual Estimado: ${q1}.\n",
+        "🔻 Ahorro Aproximado: {percentage_off}%."
+    ))
+}
+VARIANTS:Tuple[Optional[str], ...] = (None, "extreme", "deal", "deal_no_iqr")
+
+
+# --- "np.round" Scales By 100 First, Python's "round" Rounds The Exact Value: They Only Disagree Near x.xx5 ---
+def round_percentages(
+    values:np.ndarray
+) -> np.ndarray:
+
+    rounded = np.round(values, 2)
+    scaled = np.abs(values * 100)
+    for index in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
+
+# --- Independent Of "deals_configs": A Parameter Sweep Computes It Once ---
+def percentages_off(
+    prices:np.ndarray,
+    q1:np.ndarray
+) -> np.ndarray:
+
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        return round_percentages((q1 - prices) / q1 * 100)
+
+
 class FlightDealAnalyzer:
     def __init__(self,
         configs:Dict[str, Dict[str, Any]],
@@ -24,44 +67,68 @@ class FlightDealAnalyzer:
         flight_data:Dict
     ) -> Dict[str, Dict]:
         
-        try:
-            offers = flight_data.get("offers")
-            if not offers:
-                raise DealsAnalyzerManager(
-                    f'{self._message} Error, The Flight Cannot Have No Offers',
-                    context = {
-                        "error_type": type(err).__name__,
-                        "error_msg": str(err)
-                    }
-                )
-            result = {
+        if not flight_data.get("offers"):
+            raise DealsAnalyzerManager(
+                f'{self._message} Error, The Flight Cannot Have No Offers',
+                context = {
+                    "error_type": "ValueError",
+                    "error_msg": f'No Offers: {flight_data.get("iata_origin")}-{flight_data.get("iata_destination")} {flight_data.get("time_departure")}'
+                }
+            )
+        return (await self.analyze_deals_batch([flight_data]))[0]
+
+
+    # --- Dense Form Of "analyze_batch": Both Alerts For Every Flight ---
+    async def analyze_deals_batch(self,
+        flights:List[Dict]
+    ) -> List[Dict[str, Dict]]:
+
+        hits = await self.analyze_batch(flights)
+        return [
+            hits.get(index) or {
                 "extreme_deal": {"active": False},
                 "lowest_price_month": {"active": False}
             }
-            iata_origin = flight_data["iata_origin"]
-            iata_destination = flight_data["iata_destination"]
-            offer = offers[0]
-            seat_class = offer["class"]
-            price = offer["price"]
-            
-            result.update(
-                {
-                    "extreme_deal": await self._check_extreme_deal(
-                        iata_origin, 
-                        iata_destination,
-                        flight_data["time_departure"],
-                        seat_class, 
-                        price
-                    ),
-                    "lowest_price_month": await self._check_lowest_month(
-                        iata_origin, 
-                        iata_destination,
-                        price, 
-                        flight_data["time_departure"]
-                    )
-                }
+            for index in range(len(flights))
+        ]
+
+
+    # --- Whole Message Scored As Arrays, One Deal Context Query. Only Hits Come Back: {index: alerts} ---
+    async def analyze_batch(self,
+        flights:List[Dict]
+    ) -> Dict[int, Dict[str, Dict]]:
+
+        try:
+            # --- Flights Without Offers Keep Both Alerts Off, They Don't Sink The Batch ---
+            offered = [index for index, flight in enumerate(flights) if flight.get("offers")]
+            if not offered:
+                return dict()
+
+            contexts = await self.db_flights.get_deal_context([
+                (
+                    flights[index]["iata_origin"],
+                    flights[index]["iata_destination"],
+                    flights[index]["time_departure"],
+                    flights[index]["offers"][0]["class"]
+                )
+                for index in offered
+            ])
+            stats_values = [
+                (context["stats"]["q1"], context["stats"]["q3"], context["stats"]["iqr"])
+                if context["stats"] else (np.nan, np.nan, np.nan)
+                for context in contexts
+            ]
+            hits = self.score_batch(
+                prices = np.array([flights[index]["offers"][0]["price"] for index in offered]),
+                q1 = np.array([values[0] for values in stats_values], dtype = np.float64),
+                q3 = np.array([values[1] for values in stats_values], dtype = np.float64),
+                iqr = np.array([values[2] for values in stats_values], dtype = np.float64),
+                monthly_min = np.array(
+                    [np.nan if context["min_price"] is None else context["min_price"] for context in contexts],
+                    dtype = np.float64
+                )
             )
-            return result
+            return {offered[position]: alerts for position, alerts in hits.items()}
 
         except Exception as err:
             raise DealsAnalyzerManager(
@@ -72,22 +139,81 @@ class FlightDealAnalyzer:
             )
 
 
+    # --- Same Rules As "_check_extreme_deal" & "_check_lowest_month", NaN Marks Missing Stats Or Min ---
+    def score_batch(self,
+        prices:np.ndarray,
+        q1:np.ndarray,
+        q3:np.ndarray,
+        iqr:np.ndarray,
+        monthly_min:np.ndarray
+    ) -> Dict[int, Dict[str, Dict]]:
+
+        percentage_off = percentages_off(prices, q1)
+        variant, lowest, threshold = self.deal_levels(prices, q1, iqr, monthly_min, percentage_off)
+        hits = dict()
+        for position in np.flatnonzero((variant > 0) | lowest).tolist():
+            price = prices[position].item()
+            extreme_deal = {"active": False}
+            if variant[position]:
+                # --- Stats Columns Are INTEGER, NaN Only Forced The Float Arrays ---
+                extreme_deal = self._deal_alert(
+                    VARIANTS[variant[position]],
+                    price,
+                    int(q1[position]),
+                    int(q3[position]),
+                    int(iqr[position]),
+                    threshold[position].item(),
+                    percentage_off[position].item()
+                )
+            hits[position] = {
+                "extreme_deal": extreme_deal,
+                "lowest_price_month": self._check_lowest_month(
+                    price,
+                    int(monthly_min[position]) if lowest[position] else None
+                )
+            }
+        return hits
+
+    # --- Index Into "VARIANTS" (0 = No Deal) & Lowest Month Mask, Nothing Built Per Flight ---
+    def deal_levels(self,
+        prices:np.ndarray,
+        q1:np.ndarray,
+        iqr:np.ndarray,
+        monthly_min:np.ndarray,
+        percentage_off:np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+
+        with np.errstate(invalid = "ignore"):
+            threshold = q1 - self.configs["extreme_threshold"] * iqr
+
+            # --- Comparisons Against NaN Are False: No Stats Or No Min Never Fire ---
+            eligible = ~np.isnan(q1) & (q1 != 0) & ~(prices > monthly_min * self.configs["min_real_price"])
+            extreme = eligible & (
+                ((iqr > 0) & (prices < threshold) & (percentage_off >= self.configs["extreme_min_percentage_off"]))
+                | (percentage_off >= self.configs["extreme_percentage_off"])
+            )
+            deal = eligible & ~extreme & (iqr > 0) & (
+                (prices < q1 * self.configs["deal_q1_discount"])
+                & (percentage_off >= self.configs["deal_min_percentage_off"])
+            )
+            deal_no_iqr = eligible & ~extreme & (iqr == 0) & (
+                (prices < q1 * self.configs["no_iqr_discount"])
+                & (percentage_off >= self.configs["deal_min_percentage_off"])
+            )
+            lowest = prices < monthly_min
+
+        return np.select([extreme, deal, deal_no_iqr], [1, 2, 3], default = 0), lowest, threshold
+
+
 # ---------- Checker Methods ----------
-    async def _check_extreme_deal(self,
-        iata_origin:str, 
-        iata_destination:str,
-        time_departure:str, #'departure': '2025-07-22T21:45:00'
-        seat_class:str, 
-        price:int
+    # --- "stats" & "min_price_real" Come From "get_deal_context" ---
+    def _check_extreme_deal(self,
+        price:int,
+        stats:Optional[Dict[str, Any]],
+        min_price_real:Optional[int]
     ) -> Dict[str, Union[bool, Any]]:
         
         try:
-            stats = await self.db_flights.get_stats_for_route(
-                iata_origin,
-                iata_destination,
-                time_departure,
-                seat_class
-            )
             if not stats:
                 return {"active": False}
 
@@ -98,13 +224,6 @@ class FlightDealAnalyzer:
             if not all(isinstance(v, (int, float)) for v in [q1, q3, iqr]):
                 return {"active": False}
 
-            min_price_real = await self.db_flights.get_min_price(
-                iata_origin = iata_origin,
-                iata_destination = iata_destination,
-                departure_date = time_departure,
-                type_date = "month",
-                return_full = False
-            )
             if min_price_real is not None and price > min_price_real * self.configs["min_real_price"]:
                 return {"active": False}
 
@@ -116,61 +235,18 @@ class FlightDealAnalyzer:
                 and price < threshold 
                 and percentage_off >= self.configs["extreme_min_percentage_off"]
             ) or percentage_off >= self.configs["extreme_percentage_off"]:
-
-                return {
-                    "active": True,
-                    "level": "extreme",
-                    "price": price,
-                    "q1": q1,
-                    "q3": q3,
-                    "iqr": iqr,
-                    "threshold": int(threshold),
-                    "percentage_off": percentage_off,
-                    "description": (
-                        f"🔥 *Nuevo Precio Extremadamente Bajo: ${price}.*\n"
-                        f"Normalmente Se Encuentra Por Arriba De: ${q1}.\n"
-                        f"🧠 Ahorro Aproximado: {percentage_off}%."
-                    )
-                }
+                return self._deal_alert("extreme", price, q1, q3, iqr, threshold, percentage_off)
             if (
                 iqr > 0 and
                 price < q1 * self.configs["deal_q1_discount"] and
                 percentage_off >= self.configs["deal_min_percentage_off"]
             ):    
-                return {
-                    "active": True,
-                    "level": "deal",
-                    "price": price,
-                    "q1": q1,
-                    "q3": q3,
-                    "iqr": iqr,
-                    "threshold": int(threshold),
-                    "percentage_off": percentage_off,
-                    "description": (
-                        f"💸 *Nuevo Precio Bajo: ${price}.*\n"
-                        f"Valor de Referencia Promedio: ${q1}.\n"
-                        f"💰 Ahorro Estimado: {percentage_off}%."
-                    )
-                }
+                return self._deal_alert("deal", price, q1, q3, iqr, threshold, percentage_off)
             if iqr == 0 and (
                 price < q1 * self.configs["no_iqr_discount"] and 
                 percentage_off >= self.configs["deal_min_percentage_off"]
             ):
-                return {
-                    "active": True,
-                    "level": "deal",
-                    "price": price,
-                    "q1": q1,
-                    "q3": q3,
-                    "iqr": iqr,
-                    "threshold": int(threshold),
-                    "percentage_off": percentage_off,
-                    "description": (
-                        f"💸 *Nuevo Precio Destacado: ${price}.*\n"
-                        f"Valor Habitual Estimado: ${q1}.\n"
-                        f"🔻 Ahorro Aproximado: {percentage_off}%."
-                    )
-                }
+                return self._deal_alert("deal_no_iqr", price, q1, q3, iqr, threshold, percentage_off)
             return {"active": False}
         
         except Exception as err:
@@ -182,22 +258,37 @@ class FlightDealAnalyzer:
                 }
             )
 
+    @staticmethod
+    def _deal_alert(
+        variant:str,
+        price:int,
+        q1:int,
+        q3:int,
+        iqr:int,
+        threshold:float,
+        percentage_off:float
+    ) -> Dict[str, Any]:
+
+        level, description = DEAL_ALERTS[variant]
+        return {
+            "active": True,
+            "level": level,
+            "price": price,
+            "q1": q1,
+            "q3": q3,
+            "iqr": iqr,
+            "threshold": int(threshold),
+            "percentage_off": percentage_off,
+            "description": "".join(description).format(price = price, q1 = q1, percentage_off = percentage_off)
+        }
 
-    async def _check_lowest_month(self,
-        iata_origin:str, 
-        iata_destination:str, 
-        price:int, 
-        departure_date:str #'departure': '2025-07-22T21:45:00'
+
+    def _check_lowest_month(self,
+        price:int,
+        lowest_price:Optional[int]
     ) -> Dict[str, Union[bool, Any]]:
 
         try:
-            lowest_price = await self.db_flights.get_min_price(
-                iata_origin = iata_origin,
-                iata_destination = iata_destination,
-                departure_date = departure_date,
-                type_date = "month",
-                return_full = False
-            )
             if lowest_price is not None and price < lowest_price:
                 return {
                     "active": True,
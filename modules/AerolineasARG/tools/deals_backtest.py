@@ -0,0 +1,290 @@
+import argparse, asyncio, glob, heapq, itertools, json, os
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer
+from pathlib import Path
+from typing import Optional, Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.DB import AsyncFlightDBManager
+from utils.DB.sketches import MIN_SAMPLE_SIZE
+from utils.configs.manage_configs import AsyncConfigManager
+from utils.exceptions import DealsBacktestError
+from modules.AerolineasARG.tools.deals_analyzer import FlightDealAnalyzer, percentages_off
+
+
+HISTORY_COLUMNS:Tuple[str, ...] = (
+    "id", "hash_id", "iata_origin", "iata_destination", "time_departure", "offer_class", "price", "recorded_at"
+)
+# --- Latest Export Plus Every Archived Month ---
+DEFAULT_PARQUET:Tuple[str, ...] = (
+    "./FlightsData/AerolineasARG/price_history_calendar.parquet",
+    "./FlightsData/AerolineasARG/archive/price_history_calendar/*.parquet"
+)
+
+
+# ---------- Load History ----------
+def load_parquet(
+    patterns:List[str]
+) -> pd.DataFrame:
+
+    files = sorted({file for pattern in patterns for file in glob.glob(pattern)})
+    if not files:
+        raise DealsBacktestError(f'Error, No Price History Parquet Found | Paths: {patterns}')
+    return pd.concat(
+        [pd.read_parquet(file, columns = list(HISTORY_COLUMNS)) for file in files],
+        ignore_index = True
+    )
+
+async def load_database() -> pd.DataFrame:
+    db_flights = AsyncFlightDBManager()
+    await db_flights.connect_db("export")
+    try:
+        rows = await db_flights.export_table_data("price_history_calendar")
+    finally:
+        await db_flights.disconnect_db()
+    return pd.DataFrame(rows, columns = list(HISTORY_COLUMNS))
+
+
+# ---------- Point-In-Time Replay ----------
+def _group_stats(
+    prices:Optional[Dict[str, int]]
+) -> Tuple[float, float, float]:
+
+    if not prices or len(prices) < MIN_SAMPLE_SIZE:
+        return np.nan, np.nan, np.nan
+    q1, q3 = np.percentile(list(prices.values()), [25, 75])
+    # --- "price_stats" Stores Truncated INTEGER Quartiles ---
+    return int(q1), int(q3), int(q3) - int(q1)
+
+# --- History In "recorded_at" Order, Each Price Scored Against What The Consumer Would Have Read ---
+def replay(
+    history:pd.DataFrame,
+    stats_interval_hours:float = 24.0,
+    label_quantile:float = 0.10,
+    min_price_class:str = "Economy"
+) -> Dict[str, np.ndarray]:
+
+    # --- The Export & The Archive Can Overlap, The Table Key Dedups Them ---
+    history = history.dropna(subset = ["price", "offer_class"]).drop_duplicates(
+        ["hash_id", "offer_class", "price", "time_departure"]
+    )
+    # --- "id" Is Insertion Order: Rows Of One Flush Can Share "recorded_at", The Export Itself Is Unordered ---
+    history = history.assign(
+        time_departure = pd.to_datetime(history["time_departure"]),
+        recorded_at = pd.to_datetime(history["recorded_at"])
+    ).sort_values(["recorded_at", "id"], kind = "stable").reset_index(drop = True)
+    period = history["time_departure"].dt.strftime("%Y-%m")
+
+    # --- Ground Truth In Hindsight: A Price Within The Cheapest "label_quantile" Its Route-Month Ever Showed ---
+    cutoff = history.groupby(
+        [history["iata_origin"], history["iata_destination"], period, history["offer_class"]]
+    )["price"].transform("quantile", label_quantile)
+
+    size = len(history)
+    q1, q3, iqr, monthly_min = (np.full(size, np.nan) for _ in range(4))
+    interval = stats_interval_hours * 3600
+    epoch = pd.Timestamp(0)
+    recorded_at = (history["recorded_at"] - epoch).dt.total_seconds().to_numpy()
+    departures = (history["time_departure"] - epoch).dt.total_seconds().to_numpy()
+
+    # --- Current Price Per Flight, Grouped Like "price_stats" ---
+    current:Dict[str, Tuple[tuple, float]] = dict()
+    groups:Dict[tuple, Dict[str, int]] = dict()
+    departing:List[Tuple[float, str]] = list()
+    published:Dict[tuple, Tuple[float, float, float]] = dict()
+    dirty:set = set()
+    stats_run:Optional[int] = None
+
+    rows = zip(
+        history["hash_id"].tolist(),
+        history["iata_origin"].tolist(),
+        history["iata_destination"].tolist(),
+        period.tolist(),
+        history["offer_class"].tolist(),
+        history["price"].astype("int64").tolist(),
+        departures.tolist(),
+        recorded_at.tolist()
+    )
+    for index, (hash_id, iata_origin, iata_destination, month, seat_class, price, departure, seen_at) in enumerate(rows):
+        # --- Departed Flights Leave The Calendar ---
+        while departing and departing[0][0] <= seen_at:
+            departure_at, departed = heapq.heappop(departing)
+            entry = current.get(departed)
+            if entry and entry[1] == departure_at:
+                groups[entry[0]].pop(departed, None)
+                dirty.add(entry[0])
+                del current[departed]
+
+        # --- "UpdaterFlightsStats" Run: Groups Changed Since The Last One Get New Quartiles ---
+        if interval and seen_at // interval != stats_run:
+            for group in dirty:
+                published[group] = _group_stats(groups.get(group))
+            dirty.clear()
+            stats_run = seen_at // interval
+
+        group = (iata_origin, iata_destination, month, seat_class)
+        previous = current.get(hash_id)
+        if previous:
+            groups[previous[0]].pop(hash_id, None)
+            dirty.add(previous[0])
+        groups.setdefault(group, dict())[hash_id] = price
+        dirty.add(group)
+        current[hash_id] = (group, departure)
+        if not previous or previous[1] != departure:
+            heapq.heappush(departing, (departure, hash_id))
+
+        # --- Analyzed After The Write: Real Time Stats (Sketches) & The Month Min Include This Price ---
+        q1[index], q3[index], iqr[index] = (
+            _group_stats(groups[group]) if not interval
+            else published.get(group, (np.nan, np.nan, np.nan))
+        )
+        month_prices = groups.get((iata_origin, iata_destination, month, min_price_class))
+        if month_prices:
+            monthly_min[index] = min(month_prices.values())
+
+    prices = history["price"].astype("int64").to_numpy()
+    return {
+        "prices": prices,
+        "q1": q1,
+        "q3": q3,
+        "iqr": iqr,
+        "monthly_min": monthly_min,
+        "percentage_off": percentages_off(prices, q1),
+        "is_deal": (history["price"] <= cutoff).to_numpy()
+    }
+
+
+# ---------- Evaluate ----------
+def evaluate(
+    configs:Dict[str, Any],
+    events:Dict[str, np.ndarray]
+) -> Dict[str, Any]:
+
+    variant, lowest, _ = FlightDealAnalyzer(configs, db_flights = None).deal_levels(
+        events["prices"], events["q1"], events["iqr"], events["monthly_min"], events["percentage_off"]
+    )
+    alerts = (variant > 0) | lowest
+    total_alerts = int(alerts.sum())
+    true_alerts = int((alerts & events["is_deal"]).sum())
+    labeled = int(events["is_deal"].sum())
+    return {
+        "alerts": total_alerts,
+        "extreme": int((variant == 1).sum()),
+        "deal": int((variant >= 2).sum()),
+        "lowest_month": int(lowest.sum()),
+        "true_alerts": true_alerts,
+        "precision": round(true_alerts / total_alerts, 4) if total_alerts else None,
+        "recall": round(true_alerts / labeled, 4) if labeled else None
+    }
+
+def parameter_grid(
+    base:Dict[str, Any],
+    grid:Dict[str, List[Any]]
+) -> List[Dict[str, Any]]:
+
+    unknown = set(grid) - set(base)
+    if unknown:
+        raise DealsBacktestError(f'Error, Grid Keys Not In "deals_configs": {sorted(unknown)}')
+    keys = list(grid)
+    return [
+        {**base, **dict(zip(keys, values))}
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+# ---------- Process Pool ----------
+# --- Each Worker Receives The Replayed Arrays Once, Then Only Config Chunks Travel ---
+_EVENTS:Dict[str, np.ndarray] = dict()
+
+def _init_worker(
+    events:Dict[str, np.ndarray]
+) -> None:
+    _EVENTS.update(events)
+
+def _evaluate_chunk(
+    configs_list:List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    return [evaluate(configs, _EVENTS) for configs in configs_list]
+
+def run_grid(
+    events:Dict[str, np.ndarray],
+    configs_list:List[Dict[str, Any]],
+    swept:List[str],
+    workers:int = 1,
+    chunk_size:int = 8
+) -> List[Dict[str, Any]]:
+
+    chunks = [configs_list[start:start + chunk_size] for start in range(0, len(configs_list), chunk_size)]
+    if workers <= 1:
+        results = [evaluate(configs, events) for configs in configs_list]
+    else:
+        with ProcessPoolExecutor(max_workers = workers, initializer = _init_worker, initargs = (events,)) as executor:
+            results = [result for chunk in executor.map(_evaluate_chunk, chunks) for result in chunk]
+
+    return [
+        {**{key: configs[key] for key in swept}, **result}
+        for configs, result in zip(configs_list, results)
+    ]
+
+
+async def backtest(
+    history:pd.DataFrame,
+    grid:Optional[Dict[str, List[Any]]] = None,
+    stats_interval_hours:float = 24.0,
+    label_quantile:float = 0.10,
+    workers:int = 1
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+
+    base = await AsyncConfigManager().get_configs("monitor_configs", "flights", "deals_configs")
+    start_time = default_timer()
+    events = await asyncio.to_thread(replay, history, stats_interval_hours, label_quantile)
+    replay_seconds = default_timer() - start_time
+
+    configs_list = parameter_grid(base, grid or dict())
+    start_time = default_timer()
+    results = await asyncio.to_thread(run_grid, events, configs_list, list(grid or dict()), workers)
+    summary = {
+        "events": len(events["prices"]),
+        "with_stats": int((~np.isnan(events["q1"])).sum()),
+        "labeled_deals": int(events["is_deal"].sum()),
+        "configs": len(configs_list),
+        "replay_seconds": round(replay_seconds, 2),
+        "grid_seconds": round(default_timer() - start_time, 2)
+    }
+    return summary, results
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Replays Price History Through The Deal Rules For A Grid Of deals_configs")
+    parser.add_argument("--parquet", nargs = "*", default = list(DEFAULT_PARQUET), help = "Price History Exports (Globs Allowed)")
+    parser.add_argument("--db", action = "store_true", help = 'Read "price_history_calendar" From The DB Instead')
+    parser.add_argument("--grid", default = None, help = 'JSON: {"deal_q1_discount": [0.8, 0.85], ...}, Missing Keys Keep Their Configured Value')
+    parser.add_argument("--stats-interval", type = float, default = 24.0, help = "Hours Between Stats Runs, 0 = Real Time (price_sketches)")
+    parser.add_argument("--label-quantile", type = float, default = 0.10, help = "A Price In This Bottom Quantile Of Its Route-Month Is A Real Deal")
+    parser.add_argument("--workers", type = int, default = os.cpu_count() or 1)
+    parser.add_argument("--min-alerts", type = int, default = 20, help = "Configs With Fewer Alerts Are Left Out Of The Ranking")
+    parser.add_argument("--top", type = int, default = 20)
+    parser.add_argument("--output", default = "./FlightsData/AerolineasARG/reports/deals_backtest.csv")
+    args = parser.parse_args()
+
+    history = asyncio.run(load_database()) if args.db else load_parquet(args.parquet)
+    grid = json.loads(Path(args.grid).read_text(encoding = "utf-8")) if args.grid else None
+    summary, results = asyncio.run(
+        backtest(history, grid, args.stats_interval, args.label_quantile, args.workers)
+    )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents = True, exist_ok = True)
+    pd.DataFrame(results).to_csv(output, index = False)
+
+    ranked = sorted(
+        (result for result in results if result["alerts"] >= args.min_alerts),
+        key = lambda result: (result["precision"] or 0, result["alerts"]),
+        reverse = True
+    )
+    for result in ranked[:args.top]:
+        print('[config] ' + " | ".join(f'{key}: {value}' for key, value in result.items()))
+    print(f'[summary] ' + " | ".join(f'{key}: {value}' for key, value in summary.items()) + f' | report: {output}')
@@ -0,0 +1,125 @@
+import argparse, asyncio
+from timeit import default_timer
+from typing import Optional, Any, Dict
+
+import numpy as np
+
+from modules.AerolineasARG.tools.deals_analyzer import FlightDealAnalyzer
+from utils.configs.manage_configs import AsyncConfigManager
+
+
+# ---------- Synthetic Message ----------
+# --- Some Routes Without Stats, IQR 0 Or A Monthly Min ---
+def synthetic_batch(
+    flights:int,
+    seed:int = 7
+) -> Dict[str, np.ndarray]:
+
+    rng = np.random.default_rng(seed)
+    q1 = rng.integers(20000, 300000, flights).astype(np.float64)
+    iqr = np.where(rng.random(flights) < 0.2, 0, rng.integers(1, 120000, flights)).astype(np.float64)
+    # --- Mostly Around Or Above Q1, A Few Percent Are Real Deals ---
+    discounted = rng.random(flights) < 0.03
+    prices = (q1 * np.where(discounted, rng.uniform(0.2, 0.9, flights), rng.uniform(0.8, 1.6, flights))).astype(np.int64)
+    monthly_min = (prices * rng.uniform(0.5, 1.02, flights)).astype(np.int64).astype(np.float64)
+
+    no_stats = rng.random(flights) < 0.1
+    q1[no_stats] = np.nan
+    iqr[no_stats] = np.nan
+    monthly_min[rng.random(flights) < 0.1] = np.nan
+    return {
+        "prices": prices,
+        "q1": q1,
+        "q3": q1 + iqr,
+        "iqr": iqr,
+        "monthly_min": monthly_min
+    }
+
+
+# ---------- Scalar Rules ----------
+def score_scalar(
+    analyzer:FlightDealAnalyzer,
+    batch:Dict[str, np.ndarray]
+) -> Dict[int, Dict[str, Dict]]:
+
+    hits = dict()
+    for position in range(len(batch["prices"])):
+        price = int(batch["prices"][position])
+        stats = None
+        if not np.isnan(batch["q1"][position]):
+            stats = {key: int(batch[key][position]) for key in ("q1", "q3", "iqr")}
+        monthly_min = None if np.isnan(batch["monthly_min"][position]) else int(batch["monthly_min"][position])
+
+        alerts = {
+            "extreme_deal": analyzer._check_extreme_deal(price, stats, monthly_min),
+            "lowest_price_month": analyzer._check_lowest_month(price, monthly_min)
+        }
+        if any(alert["active"] for alert in alerts.values()):
+            hits[position] = alerts
+    return hits
+
+
+# --- Vectorized Hits Must Be The Scalar Hits, Dict For Dict ---
+def check_parity(
+    analyzer:FlightDealAnalyzer,
+    batch:Dict[str, np.ndarray]
+) -> int:
+
+    expected = score_scalar(analyzer, batch)
+    result = analyzer.score_batch(**batch)
+
+    mismatches = 0
+    for position in sorted(set(expected) | set(result)):
+        if expected.get(position) != result.get(position):
+            mismatches += 1
+            print(f'Parity Mismatch | Position: {position} | Scalar: {expected.get(position)} | Vectorized: {result.get(position)}')
+    return mismatches
+
+
+def benchmark(
+    configs:Dict[str, Any],
+    flights:int = 50000,
+    rounds:int = 5,
+    seed:int = 7
+) -> Dict[str, Dict[str, float]]:
+
+    analyzer = FlightDealAnalyzer(configs, db_flights = None)
+    batch = synthetic_batch(flights, seed)
+    mismatches = check_parity(analyzer, batch)
+
+    report = dict()
+    for name, scorer in (("scalar", lambda: score_scalar(analyzer, batch)), ("vectorized", lambda: analyzer.score_batch(**batch))):
+        start_time = default_timer()
+        for _ in range(rounds):
+            hits = scorer()
+        elapsed = default_timer() - start_time
+        report[name] = {
+            "seconds": round(elapsed, 4),
+            "flights_per_second": round(flights * rounds / elapsed, 1),
+            "hits": len(hits)
+        }
+
+    report["summary"] = {
+        "flights": flights,
+        "rounds": rounds,
+        "parity_mismatches": mismatches,
+        "speedup": round(report["scalar"]["seconds"] / report["vectorized"]["seconds"], 2)
+    }
+    return report
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Scalar vs. Vectorized Deal Scoring Over A Synthetic Message")
+    parser.add_argument("--flights", type = int, default = 50000)
+    parser.add_argument("--rounds", type = int, default = 5)
+    parser.add_argument("--seed", type = int, default = 7)
+    args = parser.parse_args()
+
+    configs:Optional[Dict[str, Any]] = asyncio.run(
+        AsyncConfigManager().get_configs("monitor_configs", "flights", "deals_configs")
+    )
+    report = benchmark(configs, args.flights, args.rounds, args.seed)
+    for section, values in report.items():
+        print(f'[{section}] ' + " | ".join(f'{key}: {value}' for key, value in values.items()))
+    raise SystemExit(1 if report["summary"]["parity_mismatches"] else 0)
@@ -0,0 +1,85 @@
+import asyncio
+from pathlib import Path
+from typing import Optional, Union, Dict, Any
+
+from utils.DB import AsyncFlightDBManager
+from utils import (
+    AsyncMessageHandler,
+    AsyncConfigManager,
+    NotifyDiscord
+)
+
+
+class PartitionsManager():
+    def __init__(self,
+        log_name:Optional[str] = "PartitionsManager", 
+        log_path:Optional[Union[str, Path]] = "./aerolineasARG/Tools"
+    ):
+        # --- Configs ---
+        self.configs:Dict[str, Dict[str, Any]] = dict()
+        # --- Notify System ---
+        self.notifyer = NotifyDiscord()
+        # --- DB Manager ---
+        self.db_flights = AsyncFlightDBManager()
+        # --- Logs ---
+        self.logger = AsyncMessageHandler(
+            log_filename = log_name,
+            logs_folder = log_path,
+            printer_msg = "[AerolineasArg][Partitions Manager] Status:"
+        )
+
+
+    async def load_configs(self) -> None:
+        await self.db_flights.connect_db("maintenance")
+        
+        configs = AsyncConfigManager()
+        self.configs = {
+            "admin": await configs.get_configs("monitor_configs", "admin_configs", "webhooks"),
+            "general": await configs.get_configs("monitor_configs", "flights", "aerolineas_argentinas"),
+            "partitions": await configs.get_configs("monitor_configs", "database", "partitions") or dict()
+        }
+
+    async def start(self):
+        try:
+            await self.load_configs()
+            await self.logger.critical("Status: Init Partitions Manager!!")
+
+            # --- Scrape Horizon Plus A Margin, Inserts Never Miss A Partition ---
+            months_ahead = self.configs["general"]["max_month_scraping"] + self.configs["partitions"].get("extra_months_ahead", 1)
+            created = await self.db_flights.ensure_partitions(months_ahead)
+            await self.logger.info(f'New Partitions Created: {created} | Months Ahead: {months_ahead}')
+
+            archived = await self.db_flights.archive_partitions(
+                retention_months = self.configs["partitions"].get("retention_months", 3),
+                archive_path = self.configs["partitions"].get("archive_path", "./FlightsData/AerolineasARG/archive")
+            )
+            for partition in archived:
+                await self.logger.critical(
+                    f'Partition Archived | Table: {partition["table"]} | Period: {partition["period"]} | Rows: {partition["rows"]}'
+                )
+
+        except Exception as err:
+            message_error = f'Error Fatal, Kill Process | Type: {type(err).__name__} | Message: {str(err)}'
+            # --- Send Status to Discord ---
+            _, response_webhook = await self.notifyer.error_admin(
+                URL_Webhook = self.configs["admin"]["status_monitors"],
+                store_data = self.configs["general"],
+                problem_logs = f'[AerolineasArg][Partitions Manager] Status: {message_error}'
+            )
+            # --- Save Log ---
+            await self.logger.error(
+                message = message_error,
+                hidden_msg = response_webhook
+            )
+        finally:
+            await self.db_flights.disconnect_db()
+            await self.logger.shutdown()
+
+
+
+if __name__ == "__main__":
+    async def main():
+        manager = PartitionsManager()
+        await manager.start()
+    
+    asyncio.run(main())
@@ -27,7 +27,7 @@ class UpdaterFlightsStats():
 
 
     async def load_configs(self) -> None:
-        await self.db_flights.connect_db()
+        await self.db_flights.connect_db("stats")
         
         configs = AsyncConfigManager()
         self.configs = {
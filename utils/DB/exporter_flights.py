@@ -54,7 +54,7 @@ class ExporterFlightsData:
 
     async def load_configs(self) -> None:
         try:
-            await self.db_flights.connect_db()
+            await self.db_flights.connect_db("export")
             env_values = dotenv.dotenv_values()
             configs = AsyncConfigManager()
             self.configs = {
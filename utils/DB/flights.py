@@ -1,11 +1,17 @@
-import dotenv, asyncpg, hashlib, os
+import asyncio, dotenv, asyncpg, hashlib, os
+from time import monotonic
+from contextlib import asynccontextmanager
 from asyncpg import Record
-from datetime import datetime, date
-from typing import Optional, Union, Any, Dict, Tuple, Literal, List
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import Optional, Union, Any, Dict, Tuple, Literal, List, AsyncIterator
 import numpy as np
 import pandas as pd
 
-from utils.tools import SingletonClass
+from utils.tools import SingletonClass, WaitMetrics
+from utils.configs.manage_configs import AsyncConfigManager
+from utils.DB.statements import StatementRegistry, RegistryConnection, min_price_shape
+from utils.DB.sketches import PriceSketches, PriceDelta, SKETCH_QUERIES
 from utils.exceptions import (    
     DBFlightsError,
     DBFlightsConnectionError,
@@ -13,34 +19,68 @@ from utils.exceptions import (
     DBFlightsFindNotifysError,
     DBFlightsMarkNotifysError,
     DBFlightCheckerError,
+    DBFlightsUpdateFlightError,
     ExportTableFlightError,
+    DBFlightsPartitionError,
 
     GenerateIQRError,
     ReturnIQRError,
-    ReturnMinDailyError
+    ReturnMinDailyError,
+    ReturnDealContextError,
+    PriceSketchError
 )
 
 
+# --- One Pool Per Workload, An Export Scan Cannot Starve Ingestion ---
+DEFAULT_POOLS:Dict[str, Dict[str, Any]] = {
+    "ingest": {"min_size": 2, "max_size": 10, "replica": False},
+    # --- Reads Right After The Ingest Write: Replica Lag Would Hide The Price Just Stored ---
+    "deals": {"min_size": 1, "max_size": 5, "replica": False},
+    "notifier": {"min_size": 1, "max_size": 3, "replica": False},
+    "stats": {"min_size": 1, "max_size": 2, "replica": False},
+    "export": {"min_size": 1, "max_size": 2, "replica": True},
+    "maintenance": {"min_size": 1, "max_size": 1, "replica": False}
+}
+
+# --- Flight Keys Are BYTEA(16), Exported As Hex Under The Old Names ---
+FLIGHT_KEY_BYTES:int = 16
+EXPORT_KEY_COLUMNS:Dict[str, str] = {
+    "flight_key": "hash_id",
+    "min_price_flight_key": "min_price_flight_hash"
+}
+
+# --- Range Partitioned By Departure Month: "<table>_pYYYY_MM" ---
+PARTITIONED_TABLES:Tuple[str, ...] = ("flights_calendar", "price_history_calendar")
+
+# --- Compact Row State: 8 Bytes Per Flight ---
+INACTIVE_FINGERPRINT:bytes = bytes(8)
+
 
 class AsyncFlightDBManager(metaclass = SingletonClass):
     def __init__(self):
         self._configs = dotenv.dotenv_values()
-        self.pool:Optional[asyncpg.Pool] = None
+        self.pools:Dict[str, asyncpg.Pool] = dict()
+        self.pools_configs:Dict[str, Dict[str, Any]] = dict()
+        self.acquire_metrics:Dict[str, WaitMetrics] = dict()
+        self.statements = StatementRegistry()
+        # --- Streaming Quartiles, Only Where "load_price_sketches" Ran (Consumer) ---
+        self.sketches:Optional[PriceSketches] = None
+        self._pools_lock:Optional[asyncio.Lock] = None
         self._message:str = f'[DB Flights Manager]'
 
 
 # ---------- Manage DB Flights ----------
-    async def connect_db(self):
+    # --- Pools Not Listed Here Open Lazily On First Use ---
+    async def connect_db(self,
+        *pool_names:str
+    ) -> None:
+
         try:
-            if not self.pool:
-                # Maybe it be a good idea add the min and max ​​to settings or .env. idk
-                self.pool = await asyncpg.create_pool(
-                    dsn = self._configs["DB_POSTGRES"],
-                    min_size = 1,
-                    max_size = 10
-                )
+            await self.load_pools_configs()
+            for name in pool_names:
+                await self._get_pool(name)
 
-        except asyncpg.PostgresConnectionError as err:
+        except (asyncpg.PostgresError, OSError) as err:
             raise DBFlightsConnectionError(
                 f'{self._message} Error During Connection...',
                 context = {
@@ -51,9 +91,9 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
 
     async def disconnect_db(self):
         try:
-            if self.pool:
-                await self.pool.close()
-                self.pool = None
+            pools, self.pools = self.pools, dict()
+            for pool in pools.values():
+                await pool.close()
 
         except asyncpg.PostgresError as err:
             raise DBFlightsError(
@@ -64,6 +104,82 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                 }
             )
 
+    # --- Defaults, Then "database.pools" From The Configs, Then .env (DB_POOL_<NAME>_MAX_SIZE) ---
+    async def load_pools_configs(self) -> None:
+        if self.pools_configs:
+            return
+
+        configs = await AsyncConfigManager().get_configs("monitor_configs", "database", "pools") or dict()
+        for name in set(DEFAULT_POOLS) | set(configs):
+            pool_configs = {**DEFAULT_POOLS.get(name, DEFAULT_POOLS["ingest"]), **configs.get(name, dict())}
+            for key in ("min_size", "max_size"):
+                env_value = self._configs.get(f'DB_POOL_{name.upper()}_{key.upper()}')
+                if env_value:
+                    pool_configs[key] = int(env_value)
+            self.pools_configs[name] = pool_configs
+
+    async def _get_pool(self,
+        name:str
+    ) -> asyncpg.Pool:
+
+        pool = self.pools.get(name)
+        if pool:
+            return pool
+
+        if self._pools_lock is None:
+            self._pools_lock = asyncio.Lock()
+        async with self._pools_lock:
+            if name in self.pools:
+                return self.pools[name]
+
+            await self.load_pools_configs()
+            if name not in self.pools_configs:
+                raise DBFlightsError(f'{self._message} Error, Unknown Pool: "{name}"...')
+            pool_configs = self.pools_configs[name]
+            # --- Read Only Workloads Go To The Replica When One Is Set ---
+            replica_dsn = self._configs.get("DB_POSTGRES_REPLICA")
+            self.pools[name] = await asyncpg.create_pool(
+                dsn = replica_dsn if pool_configs.get("replica") and replica_dsn else self._configs["DB_POSTGRES"],
+                min_size = pool_configs["min_size"],
+                max_size = pool_configs["max_size"],
+                # --- Hot Statements Prepared Once Per Connection ---
+                connection_class = RegistryConnection,
+                init = self.statements.init_connection
+            )
+            self.acquire_metrics.setdefault(name, WaitMetrics())
+            return self.pools[name]
+
+    # --- Time Spent Waiting For A Free Connection ---
+    @asynccontextmanager
+    async def acquire(self,
+        pool_name:str = "ingest"
+    ) -> AsyncIterator[asyncpg.Connection]:
+
+        pool = await self._get_pool(pool_name)
+        started_at = monotonic()
+        async with pool.acquire() as conn:
+            self.acquire_metrics[pool_name].record(monotonic() - started_at)
+            yield conn
+
+    def pool_size(self,
+        pool_name:str = "ingest"
+    ) -> int:
+
+        if pool_name in self.pools:
+            return self.pools[pool_name].get_max_size()
+        return self.pools_configs.get(pool_name, DEFAULT_POOLS.get(pool_name, dict())).get("max_size", 0)
+
+    def pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "size": pool.get_size(),
+                "idle": pool.get_idle_size(),
+                "max_size": pool.get_max_size(),
+                "acquire": self.acquire_metrics[name].to_dict()
+            }
+            for name, pool in self.pools.items()
+        }
+
 
 # ---------- Fetch Data Flights ----------
     async def get_airport_info(self, 
@@ -71,11 +187,8 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
     ) -> Optional[Dict]:
 
         try:
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT * FROM airports
-                    WHERE iata_code = $1
-                """, iata_code.upper())
+            async with self.acquire("notifier") as conn:
+                row = await self.statements.fetchrow(conn, "get_airport_info", iata_code.upper())
                 return dict(row) if row else None
         
         except asyncpg.PostgresError as err:
@@ -94,25 +207,13 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
     ) -> bool:
         
         try:
-            base_query = """
-                SELECT 1 FROM notifications_sent
-                WHERE flight_hash = $1 AND price = $2
-            """
-            args = [
-                flight_hash, 
-                price
-            ]
-
-            optional_filters = [
-                ("notified_channel", notified_channel)
-            ]
-            for index, (column, value) in enumerate(optional_filters, start = 3):
-                if value:
-                    base_query += f" AND {column} = ${index}"
-                    args.append(value)
-
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(base_query, *args)
+            async with self.acquire("notifier") as conn:
+                if notified_channel:
+                    row = await self.statements.fetchrow(
+                        conn, "was_notification_sent_channel", self.flight_key(flight_hash), price, notified_channel
+                    )
+                else:
+                    row = await self.statements.fetchrow(conn, "was_notification_sent", self.flight_key(flight_hash), price)
                 return bool(row)
 
         except asyncpg.PostgresError as err:
@@ -131,12 +232,8 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
     ) -> None:
         
         try:
-            async with self.pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO notifications_sent (flight_hash, price, notified_channel)
-                    VALUES ($1, $2, $3)
-                    ON CONFLICT DO NOTHING
-                """, flight_hash, price, notified_channel)
+            async with self.acquire("notifier") as conn:
+                await self.statements.execute(conn, "mark_notification_sent", self.flight_key(flight_hash), price, notified_channel)
 
         except asyncpg.PostgresError as err:
             raise DBFlightsMarkNotifysError(
@@ -150,14 +247,14 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
 
     async def check_flight_exists(self,
         conn:asyncpg.Pool, 
-        hash_id:str
+        hash_id:str,
+        time_departure:Union[str, date, datetime]
     ) -> Optional[asyncpg.Record]:
         
         try:
-            return await conn.fetchrow("""
-                SELECT * FROM flights_calendar 
-                WHERE hash_id = $1
-            """, hash_id)
+            return await self.statements.fetchrow(
+                conn, "check_flight_exists", self.flight_key(hash_id), *self.departure_window(time_departure)
+            )
         
         except asyncpg.PostgresError as err:
             raise DBFlightCheckerError(
@@ -183,13 +280,9 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                 return_type = "datetime"
             )
 
-            await conn.execute("""
-                INSERT INTO flight_sections (
-                    flight_hash, section_index, flight_number, departure, arrival, origin, destination, equipment
-                )
-                VALUES($1, $2, $3, $4, $5, $6, $7, $8)
-            """, hash_id, index, secction["flightNumber"], time_departure, time_arrival, secction["origin"], 
-                secction["destination"], secction["equipment"]
+            await self.statements.execute(
+                conn, "insert_section", self.flight_key(hash_id), index, secction["flightNumber"], time_departure, time_arrival,
+                secction["origin"], secction["destination"], secction["equipment"]
             )
 
     async def _insert_price_history(self,
@@ -207,15 +300,8 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
         price:int
     ) -> str:
 
-        return await conn.execute("""
-            INSERT INTO price_history_calendar (
-                flight_hash, iata_origin, iata_destination, time_departure, time_arrival,
-                provider, airline, offer_class, scale, total_duration, price, recorded_at
-            )
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, NOW())
-            ON CONFLICT (flight_hash, offer_class, price) DO NOTHING
-        """,
-            hash_id, iata_origin, iata_destination, time_departure, time_arrival,
+        return await self.statements.execute(
+            conn, "insert_price_history", self.flight_key(hash_id), iata_origin, iata_destination, time_departure, time_arrival,
             provider, airline, seat_class, scale, total_duration, price
         )
 
@@ -226,7 +312,8 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
         flight_data:Dict[str, Any]
     ) -> Tuple[str, bool]:
 
-        async with self.pool.acquire() as conn:
+        deltas = self._price_deltas()
+        async with self.acquire("ingest") as conn:
             try:
                 async with conn.transaction():
                     iata_origin = flight_data["iata_origin"]
@@ -240,18 +327,22 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                         provider, 
                         flight_data["airline"]
                     )
-                    existing = await self.check_flight_exists(conn, hash_id)
+                    existing = await self.check_flight_exists(conn, hash_id, time_departure)
                     if not flight_data["active"]:
-                        return await self._handle_inactive_flight(conn, hash_id, existing)
-
-                    return await self._handle_active_flight(
-                        conn, 
-                        provider, 
-                        flight_signature, 
-                        hash_id, 
-                        existing,
-                        flight_data
-                    )
+                        result = await self._handle_inactive_flight(conn, hash_id, existing, deltas)
+                    else:
+                        result = await self._handle_active_flight(
+                            conn, 
+                            provider, 
+                            flight_signature, 
+                            hash_id, 
+                            existing,
+                            flight_data,
+                            deltas
+                        )
+                # --- Committed, Now The Sketches Can See It ---
+                self._apply_price_deltas(deltas)
+                return result
 
             except Exception as err:
                 raise DBFlightsError(
@@ -262,20 +353,194 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                     }
                 )
 
+    # --- Write-Behind Flush: One Transaction, One Savepoint Per Flight ---
+    async def insert_or_update_calendar_batch(self,
+        entries:List[Tuple[str, List[Dict[str, Any]]]]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any], bool]], List[Dict[str, Any]]]:
+
+        results:List[Tuple[str, Dict[str, Any], bool]] = list()
+        errors:List[Dict[str, Any]] = list()
+        deltas = self._price_deltas()
+        if not entries:
+            return results, errors
+
+        async with self.acquire("ingest") as conn:
+            try:
+                async with conn.transaction():
+                    hashed_entries = [
+                        (provider, transitions, *self.generate_flight_hash(
+                            transitions[-1]["iata_origin"],
+                            transitions[-1]["iata_destination"],
+                            transitions[-1]["time_departure"],
+                            provider,
+                            transitions[-1]["airline"]
+                        ))
+                        for provider, transitions in entries
+                    ]
+                    # --- One Range Over The Batch Departures, Months Outside It Are Pruned ---
+                    departures = [transitions[-1]["time_departure"] for _, transitions in entries]
+                    window_start, _ = self.departure_window(min(departures, key = self.parse_departure_date))
+                    _, window_end = self.departure_window(max(departures, key = self.parse_departure_date))
+                    existing_rows = {
+                        row["hash_id"]: row
+                        for row in await self.statements.fetch(
+                            conn,
+                            "existing_flights",
+                            [self.flight_key(hash_id) for *_, hash_id in hashed_entries],
+                            window_start,
+                            window_end
+                        )
+                    }
+
+                    for provider, transitions, flight_signature, hash_id in hashed_entries:
+                        flight_deltas = self._price_deltas()
+                        try:
+                            async with conn.transaction():
+                                results.extend(
+                                    await self._handle_flight_transitions(
+                                        conn,
+                                        provider,
+                                        flight_signature,
+                                        hash_id,
+                                        existing_rows.get(hash_id),
+                                        transitions,
+                                        flight_deltas
+                                    )
+                                )
+                            # --- A Rolled Back Savepoint Leaves Its Prices Out ---
+                            if flight_deltas:
+                                deltas.extend(flight_deltas)
+
+                        except Exception as err:
+                            errors.append(
+                                {
+                                    "hash_id": hash_id,
+                                    "error_type": type(err).__name__,
+                                    "error_msg": str(err)
+                                }
+                            )
+
+            except Exception as err:
+                raise DBFlightsError(
+                    f'{self._message} Unknown Error Occurred While Flushing Calendar Batch... | Flights: {len(entries)}',
+                    context = {
+                        "error_type": type(err).__name__,
+                        "error_msg": str(err)
+                    }
+                )
+        self._apply_price_deltas(deltas)
+        return results, errors
+
+    async def _handle_flight_transitions(self,
+        conn:asyncpg.Pool,
+        provider:str,
+        flight_signature:str,
+        hash_id:str,
+        existing:Optional[asyncpg.Record],
+        transitions:List[Dict[str, Any]],
+        deltas:Optional[List[PriceDelta]] = None
+    ) -> List[Tuple[str, Dict[str, Any], bool]]:
+
+        # --- Last State Wins The Row, Earlier Prices Only Reach The History ---
+        *intermediate, flight_data = transitions
+        if not existing and not flight_data["active"]:
+            # --- No Calendar Row Will Exist, Earlier Prices Have Nothing To Attach To ---
+            return [(hash_id, flight_data, False)]
+
+        # --- Earlier Prices First & In Order, Then The Last State; A New Row Lost To A Conflict Undoes Them ---
+        savepoint = conn.transaction()
+        await savepoint.start()
+        try:
+            results:List[Tuple[str, Dict[str, Any], bool]] = list()
+            for transition in intermediate:
+                offer = transition["offers"][0] if transition.get("active") and transition.get("offers") else {}
+                if not offer.get("price") or not offer.get("class"):
+                    continue
+                if existing and existing["price"] == offer["price"] and existing["class"] == offer["class"]:
+                    continue
+
+                history_result = await self._insert_price_history(
+                    conn, hash_id, transition["iata_origin"], transition["iata_destination"],
+                    self.parse_departure_date(transition["time_departure"], return_type = "datetime"),
+                    self.parse_departure_date(transition["time_arrival"], return_type = "datetime"),
+                    provider, transition["airline"], offer["class"], transition["scale"],
+                    transition["total_duration"], offer["price"]
+                )
+                results.append((hash_id, transition, history_result != "INSERT 0 0"))
+
+            if not flight_data["active"]:
+                _, status = await self._handle_inactive_flight(conn, hash_id, existing, deltas)
+            else:
+                _, status = await self._handle_active_flight(
+                    conn,
+                    provider,
+                    flight_signature,
+                    hash_id,
+                    existing,
+                    flight_data,
+                    deltas
+                )
+        except Exception:
+            await savepoint.rollback()
+            raise
+
+        if not existing and not status:
+            await savepoint.rollback()
+            return [(hash_id, flight_data, False)]
+        await savepoint.commit()
+        results.append((hash_id, flight_data, status))
+        return results
+
+    # --- One UPDATE Per (Route, Window) Instead Of One Per Inactive Or Vanished Flight ---
+    async def mark_missing_unavailable(self,
+        scopes:List[Dict[str, Any]]
+    ) -> List[str]:
+
+        if not scopes:
+            return list()
+
+        try:
+            flipped:List[str] = list()
+            deltas = self._price_deltas()
+            async with self.acquire("ingest") as conn:
+                async with conn.transaction():
+                    for scope in scopes:
+                        rows = await self.statements.fetch(
+                            conn,
+                            "mark_missing_unavailable",
+                            scope["iata_origin"].upper(),
+                            scope["iata_destination"].upper(),
+                            scope["provider"],
+                            self.parse_departure_date(scope["window_start"]),
+                            self.parse_departure_date(scope["window_end"]),
+                            [self.flight_key(hash_id) for hash_id in scope["active"]]
+                        )
+                        flipped.extend(row["hash_id"] for row in rows)
+                        for row in rows:
+                            self._track_price(deltas, row, -1)
+            self._apply_price_deltas(deltas)
+            return flipped
+
+        except asyncpg.PostgresError as err:
+            raise DBFlightsUpdateFlightError(
+                f'{self._message} Error Marking Missing Flights Unavailable | Windows: {len(scopes)}',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
     async def _handle_inactive_flight(self,
         conn:asyncpg.Pool,
         hash_id:str,
-        existing:bool
+        existing:Optional[asyncpg.Record],
+        deltas:Optional[List[PriceDelta]] = None
     ) -> Tuple[str, bool]:
         
         if existing:
-            await conn.execute("""
-                UPDATE flights_calendar 
-                    SET available = FALSE, 
-                    last_updated = NOW()
-                WHERE hash_id = $1
-            """, hash_id
-            )
+            await self.statements.execute(conn, "mark_unavailable", self.flight_key(hash_id), existing["time_departure"])
+            if existing["available"]:
+                self._track_price(deltas, existing, -1)
         
         return hash_id, False
 
@@ -285,7 +550,8 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
         flight_signature:str,
         hash_id:str,
         existing:Optional[Dict[str, Any]],
-        flight_data:Dict[str, Any]
+        flight_data:Dict[str, Any],
+        deltas:Optional[List[PriceDelta]] = None
     ) -> Tuple[str, bool]:
         
         scale = flight_data["scale"]
@@ -305,32 +571,24 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
         )
 
         if existing:
+            # --- A Row Flipped By The Window Reconcile Comes Back Even With Identical Values ---
             if any([
+                not existing["available"],
                 existing["price"] != price,
                 existing["scale"] != scale,
                 existing["class"] != seat_class,
                 existing["time_departure"] != time_departure,
                 existing["time_arrival"] != time_arrival
             ]):
-                await conn.execute("""
-                    UPDATE flights_calendar SET
-                        available = TRUE,
-                        time_departure = $1,         
-                        time_arrival = $2,  
-                        scale = $3,
-                        price = $4,
-                        total_duration = $5,        
-                        class = $6,
-                        last_updated = NOW()
-                    WHERE hash_id = $7
-                """, time_departure, time_arrival, scale, price, total_duration, seat_class , hash_id
+                await self.statements.execute(
+                    conn, "update_flight", time_departure, time_arrival, scale, price, total_duration, seat_class,
+                    self.flight_key(hash_id), existing["time_departure"]
                 )
+                if existing["available"]:
+                    self._track_price(deltas, existing, -1)
+                self._track_price(deltas, {**flight_data, "time_departure": time_departure, "class": seat_class, "price": price}, 1)
                 # --- Del Old Sections --.
-                await conn.execute("""
-                    DELETE FROM flight_sections 
-                    WHERE flight_hash = $1
-                """, hash_id
-                )
+                await self.statements.execute(conn, "delete_sections", self.flight_key(hash_id))
                 # --- Load New Flight Secctions ---
                 await self._insert_sections_flight(
                     conn = conn,
@@ -346,18 +604,13 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
             return hash_id, False
 
         
-        result = await conn.execute("""
-            INSERT INTO flights_calendar (
-                available, hash_id, flight_signature, provider, airline, iata_origin, iata_destination,
-                time_departure, time_arrival, scale, price, total_duration, class, last_updated
-            )
-            VALUES (TRUE, $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, NOW())
-            ON CONFLICT (iata_origin, iata_destination, time_departure, class) DO NOTHING
-        """, hash_id, flight_signature, provider, flight_data["airline"], flight_data["iata_origin"],
+        result = await self.statements.execute(
+            conn, "insert_flight", self.flight_key(hash_id), flight_signature, provider, flight_data["airline"], flight_data["iata_origin"],
             flight_data["iata_destination"], time_departure, time_arrival, scale, price, total_duration, seat_class
         )
         if result == "INSERT 0 0":
             return hash_id, False
+        self._track_price(deltas, {**flight_data, "time_departure": time_departure, "class": seat_class, "price": price}, 1)
 
         # --- Add Flight Secctions ---
         await self._insert_sections_flight(
@@ -374,10 +627,78 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
         return hash_id, True
 
 
+# ---------- Current State Fingerprints ----------
+    # --- Upcoming Flights Only, Past Departures Never Come Back From The API ---
+    async def get_calendar_fingerprints(self,
+        limit:Optional[int] = None
+    ) -> Dict[str, bytes]:
+
+        try:
+            query = """
+                SELECT encode(flight_key, 'hex') AS hash_id, available, price, scale, class, time_departure, time_arrival
+                FROM flights_calendar
+                WHERE time_departure >= NOW()
+                ORDER BY last_updated DESC
+            """
+            if limit:
+                query += f" LIMIT {int(limit)}"
+
+            async with self.acquire("ingest") as conn:
+                rows = await conn.fetch(query)
+
+            # --- Oldest First, So The Freshest Rows Are The Last To Be Evicted ---
+            return {
+                row["hash_id"]: self.calendar_fingerprint(
+                    row["available"], row["price"], row["scale"], row["class"],
+                    row["time_departure"], row["time_arrival"]
+                )
+                for row in reversed(rows)
+            }
+
+        except asyncpg.PostgresError as err:
+            raise DBFlightCheckerError(
+                f'{self._message} Error Loading Calendar Fingerprints...',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Same Map From The Latest "flights_calendar" Export, No DB Round Trip ---
+    @staticmethod
+    def load_calendar_fingerprints(
+        parquet_path:Union[str, os.PathLike],
+        limit:Optional[int] = None
+    ) -> Dict[str, bytes]:
+
+        df = pd.read_parquet(
+            parquet_path,
+            columns = ["hash_id", "available", "price", "scale", "class", "time_departure", "time_arrival", "last_updated"]
+        )
+        df = df[df["time_departure"] >= pd.Timestamp.now()].sort_values("last_updated")
+        if limit:
+            df = df.tail(limit)
+
+        return {
+            hash_id: AsyncFlightDBManager.calendar_fingerprint(
+                bool(available),
+                None if pd.isna(price) else int(price),
+                None if pd.isna(scale) else bool(scale),
+                None if pd.isna(seat_class) else seat_class,
+                None if pd.isna(time_departure) else time_departure.to_pydatetime(),
+                None if pd.isna(time_arrival) else time_arrival.to_pydatetime()
+            )
+            for hash_id, available, price, scale, seat_class, time_departure, time_arrival in zip(
+                df["hash_id"], df["available"], df["price"], df["scale"],
+                df["class"], df["time_departure"], df["time_arrival"]
+            )
+        }
+
+
 # ---------- Deals Analize Methods ----------
     # --- IQR Updater ---
     async def update_calendar_stats(self) -> None:
-        async with self.pool.acquire() as conn:
+        async with self.acquire("stats") as conn:
             try:
                 async with conn.transaction():
                     await conn.execute("""
@@ -385,6 +706,7 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                         WHERE q1 = q3 OR iqr = 0
                     """)
 
+                    # --- Past Months Are Final, Only Current & Future Partitions Are Scanned ---
                     rows = await conn.fetch("""
                         WITH stats AS (
                             SELECT
@@ -402,6 +724,7 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                                 STDDEV(price) AS stddev_price
                             FROM flights_calendar
                             WHERE available = TRUE AND price IS NOT NULL
+                            AND time_departure >= date_trunc('month', NOW())
                             GROUP BY iata_origin, iata_destination, class, period
                             HAVING COUNT(*) > 3
                         ),
@@ -413,9 +736,10 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                                 iata_destination,
                                 class AS offer_class,
                                 TO_CHAR(time_departure, 'YYYY-MM') AS period,
-                                hash_id AS min_price_flight_hash
+                                flight_key AS min_price_flight_key
                             FROM flights_calendar
                             WHERE available = TRUE AND price IS NOT NULL
+                            AND time_departure >= date_trunc('month', NOW())
                             ORDER BY iata_origin, iata_destination, class,
                                     TO_CHAR(time_departure, 'YYYY-MM'),
                                     price ASC
@@ -433,7 +757,7 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                             s.min_price,
                             s.max_price,
                             s.stddev_price,
-                            m.min_price_flight_hash
+                            m.min_price_flight_key
                         FROM stats s
                         LEFT JOIN min_flights m
                         ON s.iata_origin = m.iata_origin
@@ -453,7 +777,7 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                                 sample_size, median_price,
                                 avg_price, min_price, max_price,
                                 stddev_price, q1, q3, iqr,
-                                min_price_flight_hash, last_updated
+                                min_price_flight_key, last_updated
                             ) VALUES (
                                 $1, $2, $3, $4,
                                 $5, $6,
@@ -472,13 +796,13 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                                 q1 = EXCLUDED.q1,
                                 q3 = EXCLUDED.q3,
                                 iqr = EXCLUDED.iqr,
-                                min_price_flight_hash = EXCLUDED.min_price_flight_hash,
+                                min_price_flight_key = EXCLUDED.min_price_flight_key,
                                 last_updated = NOW()
                         """, row["iata_origin"], row["iata_destination"], row["period"],
                             row["offer_class"], row["sample_size"], int(row["median_price"]),
                             row["avg_price"], row["min_price"], row["max_price"],
                             float(row["stddev_price"]) if row["stddev_price"] is not None else 0.0,
-                            q1, q3, iqr, row["min_price_flight_hash"])
+                            q1, q3, iqr, row["min_price_flight_key"])
 
             except Exception as err:
                 raise GenerateIQRError(
@@ -503,21 +827,15 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                 departure_date, 
                 return_type = "date"
             )
-            async with self.pool.acquire() as conn:
-                query = """
-                    SELECT * FROM price_stats
-                    WHERE iata_origin = $1
-                    AND iata_destination = $2
-                    AND offer_class = $3
-                    AND period = $4
-                """
-                values = [
+            async with self.acquire("deals") as conn:
+                row = await self.statements.fetchrow(
+                    conn,
+                    "get_stats_for_route",
                     iata_origin,
                     iata_destination,
                     seat_class,
                     departure_date.strftime("%Y-%m")
-                ]
-                row = await conn.fetchrow(query, *values)
+                )
                 return dict(row) if row else None
 
         except asyncpg.PostgresError as err:
@@ -558,46 +876,24 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
             else:
                 raise ValueError(f'Invalid Format Day, use: "day" or "month".')
             
-            conditions = [
-                "iata_origin = $1",
-                "iata_destination = $2",
-                "available = TRUE",
-                "time_departure >= $3",
-                "time_departure < $4"
-            ]
+            # --- Optional Filters Map To A Bounded Set Of Prepared Shapes ---
+            statement_name, filter_values = min_price_shape(
+                return_full,
+                seat_class = seat_class,
+                provider = provider,
+                airline = airline,
+                exclude_airlines = [airline_name.upper() for airline_name in exclude_airlines or list()]
+            )
             values = [
                 iata_origin.upper(),
                 iata_destination.upper(),
                 date_start,
-                date_end
+                date_end,
+                *filter_values
             ]
 
-            for optional_value, column in [
-                (seat_class, "class"),
-                (provider, "provider"),
-                (airline, "airline")
-            ]:
-                if optional_value:
-                    values.append(optional_value)
-                    conditions.append(f"{column} = ${len(values)}")
-
-            if exclude_airlines:
-                placeholders = []
-                for airline_name in exclude_airlines:
-                    values.append(airline_name.upper())
-                    placeholders.append(f"${len(values)}")
-                conditions.append(f"airline NOT IN ({', '.join(placeholders)})")
-
-            query = f"""
-                SELECT {'*' if return_full else 'MIN(price) AS min_price'}
-                FROM flights_calendar
-                WHERE {' AND '.join(conditions)}
-            """
-            if return_full:
-                query += " ORDER BY price ASC LIMIT 1"
-
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(query, *values)
+            async with self.acquire("deals") as conn:
+                row = await self.statements.fetchrow(conn, statement_name, *values)
 
                 if not row:
                     return None
@@ -613,6 +909,339 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                 }
             )
 
+    # --- Stats + Monthly Min For A Whole Batch: (Origin, Destination, Departure, Class), One Round Trip ---
+    async def get_deal_context(self,
+        targets:List[Tuple[str, str, Union[str, date, datetime], str]],
+        min_price_class:str = "Economy"
+    ) -> List[Dict[str, Any]]:
+
+        try:
+            if not targets:
+                return list()
+
+            # --- Flights Sharing Route, Class & Month Share One Array Entry ---
+            keys = list()
+            positions:Dict[Tuple[str, str, str, datetime], int] = dict()
+            for iata_origin, iata_destination, departure_date, seat_class in targets:
+                dep_date = self.parse_departure_date(departure_date, return_type = "date")
+                key = (
+                    iata_origin.upper(),
+                    iata_destination.upper(),
+                    seat_class,
+                    datetime.combine(dep_date.replace(day = 1), datetime.min.time())
+                )
+                keys.append(key)
+                positions.setdefault(key, len(positions) + 1)
+
+            unique_keys = list(positions)
+            async with self.acquire("deals") as conn:
+                rows = await self.statements.fetch(
+                    conn,
+                    "deal_context",
+                    [key[0] for key in unique_keys],
+                    [key[1] for key in unique_keys],
+                    [key[2] for key in unique_keys],
+                    [key[3] for key in unique_keys],
+                    min_price_class
+                )
+
+            context = dict()
+            for row in rows:
+                context[row["position"]] = {
+                    "stats": {
+                        "sample_size": row["sample_size"],
+                        "median_price": row["median_price"],
+                        "min_price": row["stats_min_price"],
+                        "q1": row["q1"],
+                        "q3": row["q3"],
+                        "iqr": row["iqr"]
+                    } if row["has_stats"] else None,
+                    "min_price": int(row["min_price"]) if row["min_price"] is not None else None,
+                    "min_price_flight": {
+                        "hash_id": row["min_price_hash_id"],
+                        "provider": row["min_price_provider"],
+                        "airline": row["min_price_airline"],
+                        "time_departure": row["min_price_departure"],
+                        "price": int(row["min_price"])
+                    } if row["min_price_hash_id"] else None
+                }
+            return [context[positions[key]] for key in keys]
+
+        except Exception as err:
+            raise ReturnDealContextError(
+                f"{self._message} Error getting deal context...",
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+
+# ---------- Price Sketches ----------
+    # --- Consumer Only: From Here On Every Committed Price Change Feeds The Sketches ---
+    async def load_price_sketches(self,
+        relative_accuracy:float = 0.01
+    ) -> int:
+
+        try:
+            self.sketches = PriceSketches(relative_accuracy)
+            async with self.acquire("stats") as conn:
+                rows = await conn.fetch(SKETCH_QUERIES["load"])
+            return sum(
+                self.sketches.load(
+                    (row["iata_origin"], row["iata_destination"], row["period"], row["offer_class"]),
+                    row["sketch"]
+                )
+                for row in rows
+            )
+
+        except Exception as err:
+            self.sketches = None
+            raise PriceSketchError(
+                f'{self._message} Error Loading Price Sketches...',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Dirty Sketches -> "price_sketches" & Their Quartiles -> "price_stats", One Transaction ---
+    async def persist_price_sketches(self) -> int:
+        if self.sketches is None:
+            return 0
+
+        keys = self.sketches.take_dirty()
+        if not keys:
+            return 0
+        try:
+            sketch_rows, empty_keys, stats_rows, stale_keys = list(), list(), list(), list()
+            for key in keys:
+                sketch = self.sketches.sketches[key]
+                stats = self.sketches.stats(key)
+                if not stats:
+                    # --- Below The Floor, Its Old Quartiles Must Not Keep Scoring Deals ---
+                    stale_keys.append(key)
+                if not len(sketch):
+                    empty_keys.append(key)
+                    continue
+                sketch_rows.append((*key, len(sketch), sketch.to_bytes()))
+                if stats:
+                    stats_rows.append((
+                        *key, stats["sample_size"], stats["median_price"], stats["avg_price"], stats["min_price"],
+                        stats["max_price"], stats["stddev_price"], stats["q1"], stats["q3"], stats["iqr"]
+                    ))
+
+            async with self.acquire("stats") as conn:
+                async with conn.transaction():
+                    if sketch_rows:
+                        await conn.executemany(SKETCH_QUERIES["upsert_sketch"], sketch_rows)
+                    if empty_keys:
+                        await conn.executemany(SKETCH_QUERIES["delete_sketch"], empty_keys)
+                    if stats_rows:
+                        await conn.executemany(SKETCH_QUERIES["upsert_stats"], stats_rows)
+                    if stale_keys:
+                        await conn.executemany(SKETCH_QUERIES["delete_stats"], stale_keys)
+            return len(keys)
+
+        except Exception as err:
+            # --- Retried On The Next Persist ---
+            self.sketches.dirty.update(keys)
+            raise PriceSketchError(
+                f'{self._message} Error Persisting Price Sketches | Groups: {len(keys)}',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Exact PERCENTILE_CONT Next To The Streamed Estimate Per Group, Then Rebuilt From The Exact Prices ---
+    async def reconcile_price_sketches(self) -> List[Dict[str, Any]]:
+        if self.sketches is None:
+            return list()
+
+        try:
+            async with self.acquire("stats") as conn:
+                rows = await conn.fetch(SKETCH_QUERIES["exact_stats"])
+
+            report, seen = list(), set()
+            for row in rows:
+                key = (row["iata_origin"], row["iata_destination"], row["period"], row["offer_class"])
+                seen.add(key)
+                report.append(self.sketches.report_row(key, dict(row)))
+                self.sketches.rebuild(key, row["prices"])
+
+            # --- Groups With No Available Flight Left ---
+            for key in set(self.sketches.sketches) - seen:
+                report.append(self.sketches.report_row(key, None))
+                self.sketches.rebuild(key, list())
+            self.sketches.missed_removals = 0
+            return report
+
+        except Exception as err:
+            raise PriceSketchError(
+                f'{self._message} Error Reconciling Price Sketches...',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- None While Sketches Are Off, Writers Then Skip The Bookkeeping ---
+    def _price_deltas(self) -> Optional[List[PriceDelta]]:
+        return list() if self.sketches is not None else None
+
+    @staticmethod
+    def _track_price(
+        deltas:Optional[List[PriceDelta]],
+        row:Dict[str, Any],
+        sign:int
+    ) -> None:
+
+        if deltas is None:
+            return
+        delta = PriceSketches.delta(
+            row["iata_origin"],
+            row["iata_destination"],
+            row["time_departure"],
+            row["class"],
+            row["price"],
+            sign
+        )
+        if delta:
+            deltas.append(delta)
+
+    def _apply_price_deltas(self,
+        deltas:Optional[List[PriceDelta]]
+    ) -> None:
+
+        if self.sketches is not None and deltas:
+            self.sketches.apply(deltas)
+
+
+# ---------- Partitions ----------
+    # --- Current Month Up To "months_ahead", Both Tables. Idempotent ---
+    async def ensure_partitions(self,
+        months_ahead:int,
+        pool_name:str = "maintenance"
+    ) -> int:
+
+        try:
+            async with self.acquire(pool_name) as conn:
+                return await conn.fetchval("SELECT ensure_month_partitions($1)", months_ahead)
+
+        except asyncpg.PostgresError as err:
+            raise DBFlightsPartitionError(
+                f'{self._message} Error Creating Partitions Ahead | Months: {months_ahead}',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    async def list_partitions(self,
+        conn:asyncpg.Connection,
+        table_name:str
+    ) -> List[Tuple[str, date]]:
+
+        rows = await conn.fetch("""
+            SELECT child.relname AS partition_name
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = $1::regclass
+            ORDER BY child.relname
+        """, table_name)
+
+        partitions = list()
+        prefix = f'{table_name}_p'
+        for row in rows:
+            suffix = row["partition_name"].removeprefix(prefix)
+            try:
+                partitions.append((row["partition_name"], datetime.strptime(suffix, "%Y_%m").date()))
+            except ValueError:
+                continue
+        return partitions
+
+    # --- Months Older Than "retention_months": Parquet First, Then Detach & Drop ---
+    async def archive_partitions(self,
+        retention_months:int,
+        archive_path:Union[str, os.PathLike] = "FlightsData/AerolineasARG/archive"
+    ) -> List[Dict[str, Any]]:
+
+        today = date.today()
+        month_index = today.year * 12 + today.month - 1 - retention_months
+        cutoff = date(month_index // 12, month_index % 12 + 1, 1)
+        archived = list()
+
+        try:
+            async with self.acquire("maintenance") as conn:
+                for table_name in PARTITIONED_TABLES:
+                    for partition_name, month in await self.list_partitions(conn, table_name):
+                        if month >= cutoff:
+                            continue
+
+                        period = month.strftime("%Y-%m")
+                        rows = await conn.fetch(f'SELECT * FROM "{partition_name}"')
+                        files = [self._save_archive(archive_path, table_name, period, rows)]
+
+                        async with conn.transaction():
+                            await conn.execute(f'ALTER TABLE {table_name} DETACH PARTITION "{partition_name}"')
+                            # --- Rows Keyed By These Flights Leave With Them (No FKs On A Partitioned Parent) ---
+                            if table_name == "flights_calendar":
+                                sections = await conn.fetch(f"""
+                                    SELECT fs.* FROM flight_sections fs
+                                    JOIN "{partition_name}" fc ON fs.flight_key = fc.flight_key
+                                """)
+                                files.append(self._save_archive(archive_path, "flight_sections", period, sections))
+                                for query in (
+                                    'DELETE FROM flight_sections WHERE flight_key IN (SELECT flight_key FROM "{}")',
+                                    'DELETE FROM notifications_sent WHERE flight_key IN (SELECT flight_key FROM "{}")',
+                                    'UPDATE price_stats SET min_price_flight_key = NULL WHERE min_price_flight_key IN (SELECT flight_key FROM "{}")'
+                                ):
+                                    await conn.execute(query.format(partition_name))
+                            await conn.execute(f'DROP TABLE "{partition_name}"')
+
+                        archived.append(
+                            {
+                                "table": table_name,
+                                "period": period,
+                                "rows": len(rows),
+                                "files": files
+                            }
+                        )
+            return archived
+
+        except (asyncpg.PostgresError, OSError) as err:
+            raise DBFlightsPartitionError(
+                f'{self._message} Error Archiving Old Partitions | Archived: {len(archived)}',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Same Hex Key Columns As The Exports ---
+    @staticmethod
+    def _save_archive(
+        archive_path:Union[str, os.PathLike],
+        table_name:str,
+        period:str,
+        rows:List[asyncpg.Record]
+    ) -> str:
+
+        folder = Path(archive_path) / table_name
+        folder.mkdir(parents = True, exist_ok = True)
+        file_path = folder / f'{table_name}_{period}.parquet'
+        pd.DataFrame(
+            [
+                {
+                    EXPORT_KEY_COLUMNS.get(column, column): value.hex() if column in EXPORT_KEY_COLUMNS and value is not None else value
+                    for column, value in row.items()
+                }
+                for row in rows
+            ]
+        ).to_parquet(file_path, index = False)
+        return str(file_path.resolve())
+
 
 # ---------- Export Data ----------
     async def export_table_data(self,
@@ -626,7 +1255,7 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
                 "flights_calendar": "SELECT * FROM flights_calendar",
                 "flight_sections": (
                     "SELECT fs.* FROM flight_sections fs "
-                    "JOIN flights_calendar fc ON fs.flight_hash = fc.hash_id"
+                    "JOIN flights_calendar fc ON fs.flight_key = fc.flight_key"
                 ),
                 "price_history_calendar": "SELECT * FROM price_history_calendar",
                 "airports": "SELECT * FROM airports",
@@ -651,9 +1280,17 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
             if limit:
                 base_query += f" LIMIT {limit}"
 
-            async with self.pool.acquire() as conn:
+            async with self.acquire("export") as conn:
                 rows = await conn.fetch(base_query, *query_args)
-                return [dict(row) for row in rows]
+
+            # --- Public Files Keep The Hex Form & Old Column Names ---
+            return [
+                {
+                    EXPORT_KEY_COLUMNS.get(column, column): value.hex() if column in EXPORT_KEY_COLUMNS and value is not None else value
+                    for column, value in row.items()
+                }
+                for row in rows
+            ]
 
         except Exception as err:
             raise ExportTableFlightError(
@@ -666,6 +1303,47 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
 
 
 # ---------- Tools Methods ----------
+    # --- Same Columns "_handle_active_flight" Compares, Unavailable Rows Share One Value ---
+    @staticmethod
+    def calendar_fingerprint(
+        available:bool,
+        price:Optional[int],
+        scale:Optional[bool],
+        seat_class:Optional[str],
+        time_departure:Union[str, date, datetime, None],
+        time_arrival:Union[str, date, datetime, None]
+    ) -> bytes:
+
+        if not available:
+            return INACTIVE_FINGERPRINT
+        raw = "|".join(
+            (
+                str(price),
+                str(scale),
+                str(seat_class),
+                AsyncFlightDBManager.parse_departure_date(time_departure).isoformat() if time_departure else "",
+                AsyncFlightDBManager.parse_departure_date(time_arrival).isoformat() if time_arrival else ""
+            )
+        )
+        return hashlib.blake2b(raw.encode(), digest_size = 8).digest()
+
+    @staticmethod
+    def flight_fingerprint(
+        flight_data:Dict[str, Any]
+    ) -> bytes:
+
+        if not flight_data["active"]:
+            return INACTIVE_FINGERPRINT
+        offer = flight_data["offers"][0] if flight_data.get("offers") else {}
+        return AsyncFlightDBManager.calendar_fingerprint(
+            True,
+            offer.get("price"),
+            flight_data["scale"],
+            offer.get("class"),
+            flight_data["time_departure"],
+            flight_data["time_arrival"]
+        )
+
     @staticmethod
     def generate_flight_hash(
         iata_origin:str,
@@ -680,7 +1358,52 @@ class AsyncFlightDBManager(metaclass = SingletonClass):
             return_type = "date"
         )
         raw = f'{provider}_{airline}_{iata_origin.upper()}_{iata_destination.upper()}_{date_only}'
-        return raw, hashlib.sha256(raw.encode()).hexdigest()
+        # --- 16 Byte Key, Its Hex Is The Prefix Of The Old 64 Char "hash_id" ---
+        return raw, hashlib.sha256(raw.encode()).digest()[:FLIGHT_KEY_BYTES].hex()
+
+    # --- Departure Day As A Half-Open Range, Lets The Planner Prune Month Partitions ---
+    @staticmethod
+    def departure_window(
+        time_departure:Union[str, date, datetime]
+    ) -> Tuple[datetime, datetime]:
+
+        day_start = datetime.combine(
+            AsyncFlightDBManager.parse_departure_date(time_departure, return_type = "date"),
+            datetime.min.time()
+        )
+        return day_start, day_start + timedelta(days = 1)
+
+    # --- Full Calendar Response -> Days It Covers & Flights Still Offered (JSON Safe, Travels In Kafka) ---
+    @staticmethod
+    def calendar_scope(
+        provider:str,
+        iata_origin:str,
+        iata_destination:str,
+        departures:List[Union[str, date, datetime]],
+        active_hash_ids:List[str]
+    ) -> Optional[Dict[str, Any]]:
+
+        # --- An Empty Response Proves Nothing, Never Wipe A Window With It ---
+        if not departures:
+            return None
+        days = [AsyncFlightDBManager.parse_departure_date(departure, return_type = "date") for departure in departures]
+        window_start, _ = AsyncFlightDBManager.departure_window(min(days))
+        _, window_end = AsyncFlightDBManager.departure_window(max(days))
+        return {
+            "provider": provider,
+            "iata_origin": iata_origin,
+            "iata_destination": iata_destination,
+            "window_start": window_start.isoformat(),
+            "window_end": window_end.isoformat(),
+            "active": list(active_hash_ids)
+        }
+
+    # --- Hex (Kafka, Discord, Exports) -> BYTEA Column ---
+    @staticmethod
+    def flight_key(
+        hash_id:str
+    ) -> bytes:
+        return bytes.fromhex(hash_id)
 
     @staticmethod
     def parse_departure_date(
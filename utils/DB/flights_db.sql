@@ -8,11 +8,14 @@ CREATE TABLE IF NOT EXISTS airports (
     longitude DOUBLE PRECISION
 );
 
+--- Flights Calendar & Price History: One Partition Per Departure Month ---
+--- Range Queries On "time_departure" Only Touch The Months They Need. ---
+--- A Flight Key Pins One Departure Day, So A Per-Partition Unique Index Keeps It Unique. ---
 CREATE TABLE IF NOT EXISTS flights_calendar (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     available BOOLEAN DEFAULT TRUE,
 
-    hash_id TEXT UNIQUE NOT NULL,
+    flight_key BYTEA NOT NULL CHECK (octet_length(flight_key) = 16),
     flight_signature TEXT,
 
     provider VARCHAR(30),
@@ -30,12 +33,14 @@ CREATE TABLE IF NOT EXISTS flights_calendar (
     class VARCHAR(15),
 
     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, time_departure),
     UNIQUE (iata_origin, iata_destination, time_departure, class)
-);
+) PARTITION BY RANGE (time_departure);
 
+--- No FK To "flights_calendar": Rows Leave With Their Partition (See "archive_partitions") ---
 CREATE TABLE IF NOT EXISTS flight_sections (
     id SERIAL PRIMARY KEY,
-    flight_hash TEXT NOT NULL REFERENCES flights_calendar(hash_id) ON DELETE CASCADE,
+    flight_key BYTEA NOT NULL,
 
     section_index INTEGER NOT NULL,
     flight_number VARCHAR(10),
@@ -47,13 +52,13 @@ CREATE TABLE IF NOT EXISTS flight_sections (
     destination CHAR(3) REFERENCES airports(iata_code),
     equipment VARCHAR(10),
 
-    UNIQUE(flight_hash, section_index)
+    UNIQUE(flight_key, section_index)
 );
 
 CREATE TABLE IF NOT EXISTS price_history_calendar (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
 
-    flight_hash TEXT NOT NULL REFERENCES flights_calendar(hash_id) ON DELETE CASCADE,
+    flight_key BYTEA NOT NULL,
 
     iata_origin CHAR(3) NOT NULL,
     iata_destination CHAR(3) NOT NULL,
@@ -69,8 +74,9 @@ CREATE TABLE IF NOT EXISTS price_history_calendar (
 
     recorded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
-    UNIQUE (flight_hash, offer_class, price)
-);
+    PRIMARY KEY (id, time_departure),
+    UNIQUE (flight_key, offer_class, price, time_departure)
+) PARTITION BY RANGE (time_departure);
 
 CREATE TABLE IF NOT EXISTS price_stats (
     iata_origin CHAR(3) NOT NULL,
@@ -87,7 +93,22 @@ CREATE TABLE IF NOT EXISTS price_stats (
     q1 INTEGER NOT NULL,
     q3 INTEGER NOT NULL,
     iqr INTEGER NOT NULL,
-    min_price_flight_hash TEXT REFERENCES flights_calendar(hash_id),
+    min_price_flight_key BYTEA,
+
+    last_updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (iata_origin, iata_destination, period, offer_class)
+);
+
+--- Streaming Quantile Sketch Per "price_stats" Group, Kept By The Consumer ---
+CREATE TABLE IF NOT EXISTS price_sketches (
+    iata_origin CHAR(3) NOT NULL,
+    iata_destination CHAR(3) NOT NULL,
+    period TEXT NOT NULL,
+    offer_class VARCHAR(15) NOT NULL,
+
+    sample_size INTEGER NOT NULL,
+    sketch BYTEA NOT NULL,
 
     last_updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
@@ -96,24 +117,79 @@ CREATE TABLE IF NOT EXISTS price_stats (
 
 CREATE TABLE IF NOT EXISTS notifications_sent (
     id SERIAL PRIMARY KEY,
-    flight_hash TEXT NOT NULL REFERENCES flights_calendar(hash_id),
+    flight_key BYTEA NOT NULL,
     price INTEGER NOT NULL,
     notified_channel TEXT NOT NULL,
     sent_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
-    UNIQUE(flight_hash, price, notified_channel)
+    UNIQUE(flight_key, price, notified_channel)
 );
 
 
 
-CREATE INDEX IF NOT EXISTS idx_calendar_prices_month ON flights_calendar (
-    iata_origin, iata_destination, class,
-    date_trunc('month', time_departure)
-);
+--- "get_min_price": Route, Class & Departure Range Over Available Rows, Price Read From The Index ---
+CREATE INDEX IF NOT EXISTS idx_calendar_available_route ON flights_calendar (
+    iata_origin, iata_destination, class, time_departure
+) INCLUDE (price, provider, airline)
+WHERE available = TRUE;
+
+--- Price History By Route & Departure ---
+CREATE INDEX IF NOT EXISTS idx_price_history_route ON price_history_calendar (
+    iata_origin, iata_destination, offer_class, time_departure
+) INCLUDE (price, recorded_at);
+
 CREATE INDEX IF NOT EXISTS idx_notifications_sent_time
 ON notifications_sent(sent_at DESC);
 
 
+--- Monthly Partitions: "<table>_pYYYY_MM" Holds Departures In [month, month + 1) ---
+CREATE OR REPLACE FUNCTION create_month_partition(
+    parent TEXT,
+    month_date DATE
+) RETURNS BOOLEAN AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month_date)::DATE;
+    partition_name TEXT := format('%s_p%s', parent, to_char(month_start, 'YYYY_MM'));
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, parent, month_start, (month_start + INTERVAL '1 month')::DATE
+    );
+    IF parent = 'flights_calendar' THEN
+        EXECUTE format('CREATE UNIQUE INDEX %I ON %I (flight_key)', partition_name || '_flight_key', partition_name);
+    END IF;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+--- Current Month Up To "months_ahead", Both Tables. Returns How Many Were Created ---
+CREATE OR REPLACE FUNCTION ensure_month_partitions(
+    months_ahead INTEGER
+) RETURNS INTEGER AS $$
+DECLARE
+    created INTEGER := 0;
+    parent TEXT;
+    offset_month INTEGER;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['flights_calendar', 'price_history_calendar'] LOOP
+        FOR offset_month IN 0..months_ahead LOOP
+            IF create_month_partition(parent, (date_trunc('month', NOW()) + make_interval(months => offset_month))::DATE) THEN
+                created := created + 1;
+            END IF;
+        END LOOP;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+--- Scrape Horizon ("max_month_scraping": 12) Plus One ---
+SELECT ensure_month_partitions(13);
+
+
 --- Data Airports ---
 INSERT INTO airports (iata_code, name, city, state, country, latitude, longitude) VALUES
 ('BHI', 'Comandante Espora', 'Bahía Blanca', 'Buenos Aires', 'ARG', -38.720278, -62.157500),
@@ -0,0 +1,58 @@
+--- Migration 001: "hash_id TEXT" (64 Hex Chars) -> "flight_key BYTEA" (16 Bytes) ---
+--- The New Key Is The First 16 Bytes Of The Same SHA-256, So It Is Derived From The Old Value. ---
+--- Run Once With Producer/Consumer/Notifier Stopped: psql "$DB_POSTGRES" -f 001_binary_flight_keys.sql ---
+
+BEGIN;
+
+--- Flights Calendar: New Key Next To The Old One ---
+ALTER TABLE flights_calendar ADD COLUMN IF NOT EXISTS flight_key BYTEA;
+UPDATE flights_calendar SET flight_key = decode(substr(hash_id, 1, 32), 'hex') WHERE flight_key IS NULL;
+ALTER TABLE flights_calendar ALTER COLUMN flight_key SET NOT NULL;
+ALTER TABLE flights_calendar ADD CONSTRAINT flights_calendar_flight_key_key UNIQUE (flight_key);
+ALTER TABLE flights_calendar ADD CONSTRAINT flights_calendar_flight_key_check CHECK (octet_length(flight_key) = 16);
+
+--- Flight Sections ---
+ALTER TABLE flight_sections ADD COLUMN flight_key BYTEA;
+UPDATE flight_sections SET flight_key = decode(substr(flight_hash, 1, 32), 'hex');
+ALTER TABLE flight_sections ALTER COLUMN flight_key SET NOT NULL;
+ALTER TABLE flight_sections DROP COLUMN flight_hash;
+ALTER TABLE flight_sections
+    ADD CONSTRAINT flight_sections_flight_key_fkey FOREIGN KEY (flight_key) REFERENCES flights_calendar(flight_key) ON DELETE CASCADE,
+    ADD CONSTRAINT flight_sections_flight_key_section_index_key UNIQUE (flight_key, section_index);
+
+--- Price History ---
+ALTER TABLE price_history_calendar ADD COLUMN flight_key BYTEA;
+UPDATE price_history_calendar SET flight_key = decode(substr(flight_hash, 1, 32), 'hex');
+ALTER TABLE price_history_calendar ALTER COLUMN flight_key SET NOT NULL;
+ALTER TABLE price_history_calendar DROP COLUMN flight_hash;
+ALTER TABLE price_history_calendar
+    ADD CONSTRAINT price_history_calendar_flight_key_fkey FOREIGN KEY (flight_key) REFERENCES flights_calendar(flight_key) ON DELETE CASCADE,
+    ADD CONSTRAINT price_history_calendar_flight_key_offer_class_price_key UNIQUE (flight_key, offer_class, price);
+
+--- Price Stats (Nullable) ---
+ALTER TABLE price_stats ADD COLUMN min_price_flight_key BYTEA;
+UPDATE price_stats SET min_price_flight_key = decode(substr(min_price_flight_hash, 1, 32), 'hex')
+WHERE min_price_flight_hash IS NOT NULL;
+ALTER TABLE price_stats DROP COLUMN min_price_flight_hash;
+ALTER TABLE price_stats
+    ADD CONSTRAINT price_stats_min_price_flight_key_fkey FOREIGN KEY (min_price_flight_key) REFERENCES flights_calendar(flight_key);
+
+--- Notifications Sent ---
+ALTER TABLE notifications_sent ADD COLUMN flight_key BYTEA;
+UPDATE notifications_sent SET flight_key = decode(substr(flight_hash, 1, 32), 'hex');
+ALTER TABLE notifications_sent ALTER COLUMN flight_key SET NOT NULL;
+ALTER TABLE notifications_sent DROP COLUMN flight_hash;
+ALTER TABLE notifications_sent
+    ADD CONSTRAINT notifications_sent_flight_key_fkey FOREIGN KEY (flight_key) REFERENCES flights_calendar(flight_key),
+    ADD CONSTRAINT notifications_sent_flight_key_price_notified_channel_key UNIQUE (flight_key, price, notified_channel);
+
+--- Old Text Key Goes Last, Nothing References It Anymore ---
+ALTER TABLE flights_calendar DROP COLUMN hash_id;
+
+COMMIT;
+
+--- Reclaim The Space Of The Dropped Columns & Rebuild Statistics ---
+VACUUM (FULL, ANALYZE) flights_calendar;
+VACUUM (FULL, ANALYZE) flight_sections;
+VACUUM (FULL, ANALYZE) price_history_calendar;
+VACUUM (FULL, ANALYZE) notifications_sent;
@@ -0,0 +1,179 @@
+--- Migration 002: "flights_calendar" & "price_history_calendar" -> Range Partitioned By Departure Month ---
+--- Requires 001. Unique Keys Now Include "time_departure" And Child Tables Lose Their FKs To The Calendar, ---
+--- Partitioned Tables Cannot Back A Unique Constraint On "flight_key" Alone. ---
+--- Run Once With Producer/Consumer/Notifier Stopped: psql "$DB_POSTGRES" -f 002_monthly_partitions.sql ---
+
+BEGIN;
+
+--- Monthly Partitions: "<table>_pYYYY_MM" Holds Departures In [month, month + 1) ---
+CREATE OR REPLACE FUNCTION create_month_partition(
+    parent TEXT,
+    month_date DATE
+) RETURNS BOOLEAN AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month_date)::DATE;
+    partition_name TEXT := format('%s_p%s', parent, to_char(month_start, 'YYYY_MM'));
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, parent, month_start, (month_start + INTERVAL '1 month')::DATE
+    );
+    IF parent = 'flights_calendar' THEN
+        EXECUTE format('CREATE UNIQUE INDEX %I ON %I (flight_key)', partition_name || '_flight_key', partition_name);
+    END IF;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+--- Current Month Up To "months_ahead", Both Tables. Returns How Many Were Created ---
+CREATE OR REPLACE FUNCTION ensure_month_partitions(
+    months_ahead INTEGER
+) RETURNS INTEGER AS $$
+DECLARE
+    created INTEGER := 0;
+    parent TEXT;
+    offset_month INTEGER;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['flights_calendar', 'price_history_calendar'] LOOP
+        FOR offset_month IN 0..months_ahead LOOP
+            IF create_month_partition(parent, (date_trunc('month', NOW()) + make_interval(months => offset_month))::DATE) THEN
+                created := created + 1;
+            END IF;
+        END LOOP;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+--- Children Stop Referencing The Calendar ---
+ALTER TABLE flight_sections DROP CONSTRAINT IF EXISTS flight_sections_flight_key_fkey;
+ALTER TABLE price_history_calendar DROP CONSTRAINT IF EXISTS price_history_calendar_flight_key_fkey;
+ALTER TABLE price_stats DROP CONSTRAINT IF EXISTS price_stats_min_price_flight_key_fkey;
+ALTER TABLE notifications_sent DROP CONSTRAINT IF EXISTS notifications_sent_flight_key_fkey;
+
+--- Old Tables Step Aside, Their Index Names Are Freed For The New Ones ---
+ALTER TABLE flights_calendar RENAME TO flights_calendar_old;
+ALTER TABLE price_history_calendar RENAME TO price_history_calendar_old;
+DROP INDEX IF EXISTS idx_calendar_prices_month;
+
+DO $$
+DECLARE
+    old_table TEXT;
+    old_constraint TEXT;
+BEGIN
+    FOREACH old_table IN ARRAY ARRAY['flights_calendar_old', 'price_history_calendar_old'] LOOP
+        FOR old_constraint IN
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = old_table::regclass AND contype IN ('p', 'u')
+        LOOP
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', old_table, old_constraint);
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+--- New Partitioned Tables (Same As flights_db.sql) ---
+CREATE TABLE flights_calendar (
+    id BIGSERIAL,
+    available BOOLEAN DEFAULT TRUE,
+
+    flight_key BYTEA NOT NULL CHECK (octet_length(flight_key) = 16),
+    flight_signature TEXT,
+
+    provider VARCHAR(30),
+    airline VARCHAR(30), 
+
+    iata_origin CHAR(3) NOT NULL REFERENCES airports(iata_code) ON DELETE CASCADE,
+    iata_destination CHAR(3) NOT NULL REFERENCES airports(iata_code) ON DELETE CASCADE,
+
+    time_departure TIMESTAMP NOT NULL,
+    time_arrival TIMESTAMP,
+
+    scale BOOLEAN DEFAULT FALSE,
+    price INTEGER,
+    total_duration INTEGER,
+    class VARCHAR(15),
+
+    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, time_departure),
+    UNIQUE (iata_origin, iata_destination, time_departure, class)
+) PARTITION BY RANGE (time_departure);
+
+CREATE TABLE price_history_calendar (
+    id BIGSERIAL,
+
+    flight_key BYTEA NOT NULL,
+
+    iata_origin CHAR(3) NOT NULL,
+    iata_destination CHAR(3) NOT NULL,
+    time_departure TIMESTAMP NOT NULL,
+    time_arrival TIMESTAMP NOT NULL,
+
+    provider VARCHAR(30) NOT NULL,
+    airline VARCHAR(30) NOT NULL,
+    offer_class VARCHAR(20) NOT NULL,
+    scale BOOLEAN DEFAULT FALSE,
+    total_duration INTEGER,
+    price INTEGER NOT NULL,
+
+    recorded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (id, time_departure),
+    UNIQUE (flight_key, offer_class, price, time_departure)
+) PARTITION BY RANGE (time_departure);
+
+CREATE INDEX idx_calendar_prices_month ON flights_calendar (
+    iata_origin, iata_destination, class,
+    date_trunc('month', time_departure)
+);
+
+--- Every Month Already In The Data, Then The Scrape Horizon ---
+DO $$
+DECLARE
+    month_date DATE;
+BEGIN
+    FOR month_date IN
+        SELECT date_trunc('month', time_departure)::DATE FROM flights_calendar_old
+        UNION
+        SELECT date_trunc('month', time_departure)::DATE FROM price_history_calendar_old
+    LOOP
+        PERFORM create_month_partition('flights_calendar', month_date);
+        PERFORM create_month_partition('price_history_calendar', month_date);
+    END LOOP;
+END;
+$$;
+SELECT ensure_month_partitions(13);
+
+--- Copy Rows, Ids Included ---
+INSERT INTO flights_calendar (
+    id, available, flight_key, flight_signature, provider, airline, iata_origin, iata_destination,
+    time_departure, time_arrival, scale, price, total_duration, class, last_updated
+)
+SELECT
+    id, available, flight_key, flight_signature, provider, airline, iata_origin, iata_destination,
+    time_departure, time_arrival, scale, price, total_duration, class, last_updated
+FROM flights_calendar_old;
+
+INSERT INTO price_history_calendar (
+    id, flight_key, iata_origin, iata_destination, time_departure, time_arrival,
+    provider, airline, offer_class, scale, total_duration, price, recorded_at
+)
+SELECT
+    id, flight_key, iata_origin, iata_destination, time_departure, time_arrival,
+    provider, airline, offer_class, scale, total_duration, price, recorded_at
+FROM price_history_calendar_old;
+
+SELECT setval(pg_get_serial_sequence('flights_calendar', 'id'), COALESCE(MAX(id), 0) + 1, FALSE) FROM flights_calendar;
+SELECT setval(pg_get_serial_sequence('price_history_calendar', 'id'), COALESCE(MAX(id), 0) + 1, FALSE) FROM price_history_calendar;
+
+DROP TABLE flights_calendar_old;
+DROP TABLE price_history_calendar_old;
+
+COMMIT;
+
+ANALYZE flights_calendar;
+ANALYZE price_history_calendar;
@@ -0,0 +1,24 @@
+--- Migration 003: Indexes Matched To The Registry Predicates (Check With utils/DB/plan_check.py) ---
+--- Requires 002. Built On Every Month Partition, Run With Producer/Consumer Stopped: ---
+--- psql "$DB_POSTGRES" -f 003_access_path_indexes.sql ---
+
+BEGIN;
+
+--- Nothing Filters On The Truncated Month, "get_min_price" Uses A Plain Departure Range ---
+DROP INDEX IF EXISTS idx_calendar_prices_month;
+
+--- "get_min_price": Route, Class & Departure Range Over Available Rows, Price Read From The Index ---
+CREATE INDEX IF NOT EXISTS idx_calendar_available_route ON flights_calendar (
+    iata_origin, iata_destination, class, time_departure
+) INCLUDE (price, provider, airline)
+WHERE available = TRUE;
+
+--- Price History By Route & Departure ---
+CREATE INDEX IF NOT EXISTS idx_price_history_route ON price_history_calendar (
+    iata_origin, iata_destination, offer_class, time_departure
+) INCLUDE (price, recorded_at);
+
+COMMIT;
+
+ANALYZE flights_calendar;
+ANALYZE price_history_calendar;
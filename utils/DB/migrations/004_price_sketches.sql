@@ -0,0 +1,21 @@
+--- Migration 004: Streaming Quantile Sketches Next To "price_stats" ---
+--- Safe With Modules Running, The Consumer Bootstraps Empty Sketches From The Exact Stats: ---
+--- psql "$DB_POSTGRES" -f 004_price_sketches.sql ---
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS price_sketches (
+    iata_origin CHAR(3) NOT NULL,
+    iata_destination CHAR(3) NOT NULL,
+    period TEXT NOT NULL,
+    offer_class VARCHAR(15) NOT NULL,
+
+    sample_size INTEGER NOT NULL,
+    sketch BYTEA NOT NULL,
+
+    last_updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (iata_origin, iata_destination, period, offer_class)
+);
+
+COMMIT;
@@ -0,0 +1,42 @@
+import argparse, asyncio, dotenv
+from pymongo import ASCENDING
+from motor.motor_asyncio import AsyncIOMotorClient
+
+
+# --- One-Off: Copies Saved Before The Unique Index On "bearer_token", The Active/Oldest One Stays ---
+async def drop_duplicate_tokens(
+    collection
+) -> int:
+
+    duplicates = await collection.aggregate([
+        {"$sort": {"active": -1, "_id": 1}},
+        {"$group": {"_id": "$bearer_token", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ]).to_list(length = None)
+
+    extra_ids = [document_id for group in duplicates for document_id in group["ids"][1:]]
+    if extra_ids:
+        await collection.delete_many({"_id": {"$in": extra_ids}})
+    return len(extra_ids)
+
+async def migrate(
+    website:str = "AerolineasArg"
+) -> None:
+
+    mongo = AsyncIOMotorClient(dotenv.dotenv_values()["DB_MONGO"])
+    try:
+        collection = mongo["Tokens"][website]
+        dropped = await drop_duplicate_tokens(collection)
+        await collection.create_index([("bearer_token", ASCENDING)], unique = True)
+        print(f'[migration 005] collection: {website} | duplicates dropped: {dropped} | unique index: bearer_token')
+    finally:
+        mongo.close()
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Drops Duplicate Bearer Tokens & Creates The Unique Index (Modules Stopped)")
+    parser.add_argument("--website", default = "AerolineasArg")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.website))
@@ -0,0 +1,45 @@
+import argparse, asyncio, dotenv
+from pymongo import UpdateOne
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from utils.DB.tokens import DBTokensManager
+
+
+# --- One-Off: Tokens Saved Before "expires_at" Existed Get It From Their JWT "exp", The Rest Keep Being Probed ---
+async def backfill_token_expiry(
+    collection
+) -> int:
+
+    tokens = await collection.find(
+        {"expires_at": {"$exists": False}},
+        {"bearer_token": 1}
+    ).to_list(length = None)
+
+    updates = [
+        UpdateOne({"_id": token["_id"]}, {"$set": {"expires_at": expires_at}})
+        for token in tokens
+        if (expires_at := DBTokensManager.parse_token_expiry(token["bearer_token"]))
+    ]
+    if updates:
+        await collection.bulk_write(updates, ordered = False)
+    return len(updates)
+
+async def migrate(
+    website:str = "AerolineasArg"
+) -> None:
+
+    mongo = AsyncIOMotorClient(dotenv.dotenv_values()["DB_MONGO"])
+    try:
+        backfilled = await backfill_token_expiry(mongo["Tokens"][website])
+        print(f'[migration 006] collection: {website} | tokens with expires_at backfilled: {backfilled}')
+    finally:
+        mongo.close()
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Backfills "expires_at" From The JWT "exp" Of Older Tokens (Modules Stopped)')
+    parser.add_argument("--website", default = "AerolineasArg")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.website))
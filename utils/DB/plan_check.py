@@ -0,0 +1,274 @@
+import argparse, asyncio, dotenv, json, sys
+from datetime import timedelta
+from typing import Optional, Any, Dict, List, Tuple, Iterator
+
+import asyncpg
+
+from utils.DB.flights import AsyncFlightDBManager
+from utils.DB.statements import STATEMENTS, MIN_PRICE_FILTERS, min_price_sql
+from utils.exceptions import DBFlightsError
+
+
+# --- Tiny Lookup Tables, A Seq Scan There Is The Cheapest Plan ---
+SEQ_SCAN_ALLOWED:Tuple[str, ...] = ("airports",)
+
+
+# ---------- Seed ----------
+# --- Synthetic Rows Over 10 Airports (90 Routes) & The Partitioned Months, Re-Running Is A No-Op ---
+SEED_QUERIES:Tuple[str, ...] = (
+    """
+        INSERT INTO flights_calendar (
+            available, flight_key, flight_signature, provider, airline, iata_origin, iata_destination,
+            time_departure, time_arrival, scale, price, total_duration, class, last_updated
+        )
+        SELECT
+            g % 5 <> 0,
+            substring(sha256(convert_to('plan_seed_' || g, 'UTF8')) FROM 1 FOR 16),
+            'plan_seed_' || g,
+            'PlanSeed',
+            (ARRAY['AerolineasARG', 'LATAM', 'Flybondi'])[1 + (g / 3) % 3],
+            codes[1 + g % 10],
+            codes[1 + (g + 1 + (g / 10) % 9) % 10],
+            departure,
+            departure + INTERVAL '2 hours',
+            g % 4 = 0,
+            20000 + (g * 7919) % 180000,
+            120 + g % 300,
+            (ARRAY['Economy', 'Premium Economy', 'Business'])[1 + g % 3],
+            NOW()
+        FROM (
+            SELECT
+                g,
+                ARRAY['AEP', 'EZE', 'COR', 'MDZ', 'BRC', 'USH', 'IGR', 'SLA', 'NQN', 'TUC'] AS codes,
+                date_trunc('month', NOW()) + make_interval(mins => (g * 97) % 600000) AS departure
+            FROM generate_series(1, $1::INTEGER) AS g
+        ) AS seed
+        ON CONFLICT DO NOTHING
+    """,
+    """
+        INSERT INTO flight_sections (
+            flight_key, section_index, flight_number, departure, arrival, origin, destination, equipment
+        )
+        SELECT flight_key, 0, 'AR' || id % 10000, time_departure, time_arrival, iata_origin, iata_destination, 'E90'
+        FROM flights_calendar
+        WHERE provider = 'PlanSeed'
+        ON CONFLICT DO NOTHING
+    """,
+    """
+        INSERT INTO price_history_calendar (
+            flight_key, iata_origin, iata_destination, time_departure, time_arrival,
+            provider, airline, offer_class, scale, total_duration, price, recorded_at
+        )
+        SELECT
+            flight_key, iata_origin, iata_destination, time_departure, time_arrival,
+            provider, airline, class, scale, total_duration, price + step * 1500, NOW() - make_interval(days => step)
+        FROM flights_calendar, generate_series(0, 2) AS step
+        WHERE provider = 'PlanSeed'
+        ON CONFLICT DO NOTHING
+    """,
+    """
+        INSERT INTO notifications_sent (flight_key, price, notified_channel)
+        SELECT flight_key, price, 'plan_seed'
+        FROM flights_calendar
+        WHERE provider = 'PlanSeed' AND id % 10 = 0
+        ON CONFLICT DO NOTHING
+    """,
+    """
+        INSERT INTO price_stats (
+            iata_origin, iata_destination, period, offer_class, sample_size, median_price,
+            avg_price, min_price, max_price, stddev_price, q1, q3, iqr
+        )
+        SELECT
+            iata_origin, iata_destination, period, offer_class, sample_size, median_price,
+            avg_price, min_price, max_price, stddev_price, q1, q3, q3 - q1
+        FROM (
+            SELECT
+                iata_origin,
+                iata_destination,
+                TO_CHAR(time_departure, 'YYYY-MM') AS period,
+                class AS offer_class,
+                COUNT(*) AS sample_size,
+                PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY price)::INT AS median_price,
+                AVG(price)::INT AS avg_price,
+                MIN(price) AS min_price,
+                MAX(price) AS max_price,
+                COALESCE(STDDEV(price), 0) AS stddev_price,
+                PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY price)::INT AS q1,
+                PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY price)::INT AS q3
+            FROM flights_calendar
+            WHERE provider = 'PlanSeed' AND available = TRUE
+            GROUP BY iata_origin, iata_destination, period, class
+        ) AS stats
+        ON CONFLICT DO NOTHING
+    """
+)
+
+async def seed(
+    conn:asyncpg.Connection,
+    flights:int
+) -> None:
+
+    await conn.fetchval("SELECT ensure_month_partitions(13)")
+    async with conn.transaction():
+        await conn.execute(SEED_QUERIES[0], flights)
+        for query in SEED_QUERIES[1:]:
+            await conn.execute(query)
+    for table_name in ("flights_calendar", "flight_sections", "price_history_calendar", "notifications_sent", "price_stats"):
+        await conn.execute(f'ANALYZE {table_name}')
+
+
+# ---------- Cases ----------
+# --- Registry Statement -> Arguments Taken From One Real Row ---
+def plan_cases(
+    flight:asyncpg.Record
+) -> Dict[str, Tuple[str, Tuple[Any, ...]]]:
+
+    key = flight["flight_key"]
+    departure = flight["time_departure"]
+    window = AsyncFlightDBManager.departure_window(departure)
+    month_start = departure.replace(day = 1, hour = 0, minute = 0, second = 0, microsecond = 0)
+    month_end = (month_start + timedelta(days = 32)).replace(day = 1)
+    route = (flight["iata_origin"], flight["iata_destination"])
+
+    cases = {
+        "check_flight_exists": (key, *window),
+        "existing_flights": ([key], *window),
+        "mark_unavailable": (key, departure),
+        "mark_missing_unavailable": (*route, flight["provider"], *window, [key]),
+        "update_flight": (
+            departure, flight["time_arrival"], flight["scale"], flight["price"], flight["total_duration"],
+            flight["class"], key, departure
+        ),
+        "insert_flight": (
+            key, flight["flight_signature"], flight["provider"], flight["airline"], *route, departure,
+            flight["time_arrival"], flight["scale"], flight["price"], flight["total_duration"], flight["class"]
+        ),
+        "delete_sections": (key,),
+        "insert_section": (key, 99, "AR0000", departure, flight["time_arrival"], *route, "E90"),
+        "insert_price_history": (
+            key, *route, departure, flight["time_arrival"], flight["provider"], flight["airline"],
+            flight["class"], flight["scale"], flight["total_duration"], flight["price"]
+        ),
+        "get_stats_for_route": (*route, flight["class"], departure.strftime("%Y-%m")),
+        "deal_context": ([route[0]], [route[1]], [flight["class"]], [month_start], flight["class"]),
+        "get_airport_info": (route[0],),
+        "was_notification_sent": (key, flight["price"]),
+        "was_notification_sent_channel": (key, flight["price"], "plan_seed"),
+        "mark_notification_sent": (key, flight["price"], "plan_seed")
+    }
+    cases = {name: (STATEMENTS[name], args) for name, args in cases.items()}
+
+    # --- Every "get_min_price" Shape ---
+    filter_values = {
+        "seat_class": flight["class"],
+        "provider": flight["provider"],
+        "airline": flight["airline"],
+        "exclude_airlines": ["NOT_AN_AIRLINE"]
+    }
+    for mode in ("min", "full"):
+        for shape in range(2 ** len(MIN_PRICE_FILTERS)):
+            mask = format(shape, f'0{len(MIN_PRICE_FILTERS)}b')
+            name = f'min_price:{mode}:{mask}'
+            args = [
+                filter_values[key_name]
+                for enabled, (key_name, _) in zip(mask, MIN_PRICE_FILTERS)
+                if enabled == "1"
+            ]
+            cases[name] = (min_price_sql(name), (*route, month_start, month_end, *args))
+    return cases
+
+
+# ---------- Explain ----------
+# --- Writes Run Too, Inside A Transaction That Is Always Rolled Back ---
+async def explain(
+    conn:asyncpg.Connection,
+    query:str,
+    args:Tuple[Any, ...]
+) -> Dict[str, Any]:
+
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        raw_plan = await conn.fetchval(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}', *args)
+    finally:
+        await transaction.rollback()
+    return json.loads(raw_plan)[0] if isinstance(raw_plan, str) else raw_plan[0]
+
+def plan_nodes(
+    node:Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+
+    yield node
+    for child in node.get("Plans", list()):
+        yield from plan_nodes(child)
+
+def seq_scans(
+    plan:Dict[str, Any],
+    allowed:Tuple[str, ...] = SEQ_SCAN_ALLOWED
+) -> List[str]:
+
+    return [
+        node.get("Relation Name", "?")
+        for node in plan_nodes(plan["Plan"])
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") not in allowed
+    ]
+
+
+async def check_plans(
+    dsn:str,
+    seed_flights:int = 0,
+    allowed:Tuple[str, ...] = SEQ_SCAN_ALLOWED
+) -> Dict[str, Dict[str, Any]]:
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        if seed_flights:
+            await seed(conn, seed_flights)
+
+        flight = await conn.fetchrow("""
+            SELECT * FROM flights_calendar
+            WHERE available = TRUE AND price IS NOT NULL AND time_departure >= NOW()
+            ORDER BY flight_key
+            LIMIT 1
+        """)
+        if not flight:
+            raise DBFlightsError("Error, No Upcoming Available Flight To Sample, Run With --seed...")
+
+        report = dict()
+        for name, (query, args) in plan_cases(flight).items():
+            plan = await explain(conn, query, args)
+            root = plan["Plan"]
+            report[name] = {
+                "seq_scans": seq_scans(plan, allowed),
+                "execution_ms": round(plan.get("Execution Time", 0.0), 3),
+                "shared_hit": root.get("Shared Hit Blocks", 0),
+                "shared_read": root.get("Shared Read Blocks", 0),
+                "node": root["Node Type"]
+            }
+        return report
+
+    finally:
+        await conn.close()
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "EXPLAIN (ANALYZE, BUFFERS) Of Every Registry Statement, Fails On Seq Scans")
+    parser.add_argument("--dsn", default = None, help = 'Local Postgres, Defaults To "DB_POSTGRES_PLANS" From .env')
+    parser.add_argument("--seed", type = int, default = 0, help = "Synthetic Flights To Insert First (Max 600000)")
+    parser.add_argument("--allow", nargs = "*", default = list(SEQ_SCAN_ALLOWED), help = "Tables Where A Seq Scan Is Fine")
+    args = parser.parse_args()
+
+    dsn:Optional[str] = args.dsn or dotenv.dotenv_values().get("DB_POSTGRES_PLANS")
+    if not dsn:
+        sys.exit('Error, Set --dsn Or "DB_POSTGRES_PLANS", The Seed Is Not Meant For The Production Database...')
+
+    report = asyncio.run(check_plans(dsn, args.seed, tuple(args.allow)))
+    failures = 0
+    for name, values in report.items():
+        failures += bool(values["seq_scans"])
+        status = "SEQ SCAN " + ",".join(values["seq_scans"]) if values["seq_scans"] else "ok"
+        print(f'[{name}] {status} | ' + " | ".join(f'{key}: {value}' for key, value in values.items() if key != "seq_scans"))
+
+    print(f'[summary] statements: {len(report)} | seq_scan_failures: {failures}')
+    sys.exit(1 if failures else 0)
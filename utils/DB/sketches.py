@@ -0,0 +1,238 @@
+import csv
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union, Any, Dict, List, Set, Tuple
+
+from utils.tools import QuantileSketch
+
+
+# --- (Origin, Destination, Period "YYYY-MM", Class): Same Key As "price_stats" ---
+SketchKey = Tuple[str, str, str, str]
+# --- (Key, Price, +1 Now Available / -1 Gone Or Repriced) ---
+PriceDelta = Tuple[SketchKey, int, int]
+
+# --- Same Floor As "update_calendar_stats" (HAVING COUNT(*) > 3) ---
+MIN_SAMPLE_SIZE:int = 4
+REPORT_QUANTILES:Tuple[Tuple[str, float], ...] = (("q1", 0.25), ("median", 0.50), ("q3", 0.75))
+
+
+SKETCH_QUERIES:Dict[str, str] = {
+    "load": """
+        SELECT iata_origin, iata_destination, period, offer_class, sketch
+        FROM price_sketches
+        WHERE period >= TO_CHAR(NOW(), 'YYYY-MM')
+    """,
+    "upsert_sketch": """
+        INSERT INTO price_sketches (
+            iata_origin, iata_destination, period, offer_class, sample_size, sketch, last_updated
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, NOW())
+        ON CONFLICT (iata_origin, iata_destination, period, offer_class)
+        DO UPDATE SET
+            sample_size = EXCLUDED.sample_size,
+            sketch = EXCLUDED.sketch,
+            last_updated = NOW()
+    """,
+    "delete_sketch": """
+        DELETE FROM price_sketches
+        WHERE iata_origin = $1 AND iata_destination = $2 AND period = $3 AND offer_class = $4
+    """,
+    # --- Below The Sample Floor The Full Rebuild Would Not Produce The Row Either ---
+    "delete_stats": """
+        DELETE FROM price_stats
+        WHERE iata_origin = $1 AND iata_destination = $2 AND period = $3 AND offer_class = $4
+    """,
+    # --- "min_price_flight_key" Stays With The Exact Updater ---
+    "upsert_stats": """
+        INSERT INTO price_stats (
+            iata_origin, iata_destination, period, offer_class,
+            sample_size, median_price,
+            avg_price, min_price, max_price,
+            stddev_price, q1, q3, iqr, last_updated
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, NOW())
+        ON CONFLICT (iata_origin, iata_destination, period, offer_class)
+        DO UPDATE SET
+            sample_size = EXCLUDED.sample_size,
+            median_price = EXCLUDED.median_price,
+            avg_price = EXCLUDED.avg_price,
+            min_price = EXCLUDED.min_price,
+            max_price = EXCLUDED.max_price,
+            stddev_price = EXCLUDED.stddev_price,
+            q1 = EXCLUDED.q1,
+            q3 = EXCLUDED.q3,
+            iqr = EXCLUDED.iqr,
+            last_updated = NOW()
+    """,
+    # --- Exact Side Of The Reconcile, Same Groups As "update_calendar_stats" ---
+    "exact_stats": """
+        SELECT
+            iata_origin,
+            iata_destination,
+            TO_CHAR(time_departure, 'YYYY-MM') AS period,
+            class AS offer_class,
+            COUNT(*) AS sample_size,
+            PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY price) AS q1,
+            PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY price) AS median,
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY price) AS q3,
+            ARRAY_AGG(price) AS prices
+        FROM flights_calendar
+        WHERE available = TRUE AND price IS NOT NULL
+        AND time_departure >= date_trunc('month', NOW())
+        GROUP BY iata_origin, iata_destination, class, period
+    """
+}
+
+
+class PriceSketches:
+    def __init__(self,
+        relative_accuracy:float = 0.01
+    ):
+        self.relative_accuracy = relative_accuracy
+        self.sketches:Dict[SketchKey, QuantileSketch] = dict()
+        self.dirty:Set[SketchKey] = set()
+        # --- Removals Of Prices The Sketch Never Saw, Cleared By The Next Reconcile ---
+        self.missed_removals:int = 0
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+    @staticmethod
+    def delta(
+        iata_origin:str,
+        iata_destination:str,
+        time_departure:datetime,
+        seat_class:Optional[str],
+        price:Optional[int],
+        sign:int
+    ) -> Optional[PriceDelta]:
+
+        if not price or not seat_class:
+            return None
+        key = (iata_origin.upper(), iata_destination.upper(), time_departure.strftime("%Y-%m"), seat_class)
+        return key, price, sign
+
+
+# ---------- Updates ----------
+    def apply(self,
+        deltas:List[PriceDelta]
+    ) -> None:
+
+        for key, price, sign in deltas:
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = QuantileSketch(self.relative_accuracy)
+            if sign > 0:
+                sketch.add(price)
+            elif not sketch.remove(price):
+                self.missed_removals += 1
+            self.dirty.add(key)
+
+    # --- A Sketch Saved With Another Accuracy Is Left For The Reconcile To Rebuild ---
+    def load(self,
+        key:SketchKey,
+        payload:bytes
+    ) -> bool:
+
+        sketch = QuantileSketch.from_bytes(payload)
+        if sketch.relative_accuracy != self.relative_accuracy:
+            return False
+        self.sketches[key] = sketch
+        return True
+
+    def rebuild(self,
+        key:SketchKey,
+        prices:List[int]
+    ) -> None:
+
+        sketch = QuantileSketch(self.relative_accuracy)
+        for price in prices:
+            sketch.add(price)
+        self.sketches[key] = sketch
+        self.dirty.add(key)
+
+    def take_dirty(self) -> List[SketchKey]:
+        keys, self.dirty = sorted(self.dirty), set()
+        return keys
+
+
+# ---------- Estimates ----------
+    # --- "price_stats" Row Values, None Below The Sample Floor ---
+    def stats(self,
+        key:SketchKey
+    ) -> Optional[Dict[str, Any]]:
+
+        sketch = self.sketches.get(key)
+        if sketch is None or len(sketch) < MIN_SAMPLE_SIZE:
+            return None
+        q1 = int(sketch.quantile(0.25))
+        q3 = int(sketch.quantile(0.75))
+        return {
+            "sample_size": len(sketch),
+            "median_price": int(sketch.quantile(0.50)),
+            "avg_price": round(sketch.mean()),
+            "min_price": round(sketch.quantile(0.0)),
+            "max_price": round(sketch.quantile(1.0)),
+            "stddev_price": sketch.stddev() or 0.0,
+            "q1": q1,
+            "q3": q3,
+            "iqr": q3 - q1
+        }
+
+    # --- Exact Values Next To The Streamed Estimates, Before The Rebuild Replaces Them ---
+    def report_row(self,
+        key:SketchKey,
+        exact:Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+
+        sketch = self.sketches.get(key)
+        row = {
+            "iata_origin": key[0],
+            "iata_destination": key[1],
+            "period": key[2],
+            "offer_class": key[3],
+            "exact_sample_size": exact["sample_size"] if exact else 0,
+            "sketch_sample_size": len(sketch) if sketch else 0
+        }
+        for name, q in REPORT_QUANTILES:
+            exact_value = float(exact[name]) if exact else None
+            sketch_value = sketch.quantile(q) if sketch else None
+            row[f'exact_{name}'] = exact_value
+            row[f'sketch_{name}'] = round(sketch_value, 2) if sketch_value is not None else None
+            row[f'{name}_error_pct'] = (
+                round(abs(sketch_value - exact_value) / exact_value * 100, 3)
+                if exact_value and sketch_value is not None else None
+            )
+        return row
+
+
+# ---------- Report ----------
+def report_summary(
+    report:List[Dict[str, Any]]
+) -> Dict[str, Any]:
+
+    errors = [
+        row[f'{name}_error_pct']
+        for row in report
+        for name, _ in REPORT_QUANTILES
+        if row[f'{name}_error_pct'] is not None
+    ]
+    return {
+        "groups": len(report),
+        "sample_drift": sum(abs(row["exact_sample_size"] - row["sketch_sample_size"]) for row in report),
+        "max_error_pct": max(errors, default = 0.0),
+        "mean_error_pct": round(sum(errors) / len(errors), 3) if errors else 0.0
+    }
+
+def save_report(
+    report:List[Dict[str, Any]],
+    path:Union[str, Path]
+) -> Path:
+
+    path = Path(path)
+    path.parent.mkdir(parents = True, exist_ok = True)
+    with path.open("w", newline = "", encoding = "utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames = list(report[0]) if report else ["iata_origin"])
+        writer.writeheader()
+        writer.writerows(report)
+    return path
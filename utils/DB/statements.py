@@ -0,0 +1,294 @@
+import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+from time import monotonic
+from typing import Optional, Any, Dict, List, Tuple
+
+from utils.tools import WaitMetrics
+
+
+# ---------- Canonical Statements ----------
+STATEMENTS:Dict[str, str] = {
+    # --- Ingestion: Every Key Lookup Carries Its Departure, Only One Month Partition Is Read ---
+    "check_flight_exists": """
+        SELECT *, encode(flight_key, 'hex') AS hash_id FROM flights_calendar
+        WHERE flight_key = $1
+        AND time_departure >= $2
+        AND time_departure < $3
+    """,
+    "existing_flights": """
+        SELECT *, encode(flight_key, 'hex') AS hash_id FROM flights_calendar
+        WHERE flight_key = ANY($1::BYTEA[])
+        AND time_departure >= $2
+        AND time_departure < $3
+    """,
+    "mark_unavailable": """
+        UPDATE flights_calendar
+            SET available = FALSE,
+            last_updated = NOW()
+        WHERE flight_key = $1
+        AND time_departure = $2
+    """,
+    # --- Snapshot Reconciliation: Available Rows Of The Window Missing From The Response ---
+    "mark_missing_unavailable": """
+        UPDATE flights_calendar
+            SET available = FALSE,
+            last_updated = NOW()
+        WHERE iata_origin = $1
+        AND iata_destination = $2
+        AND provider = $3
+        AND time_departure >= $4
+        AND time_departure < $5
+        AND available = TRUE
+        AND flight_key <> ALL($6::BYTEA[])
+        RETURNING encode(flight_key, 'hex') AS hash_id, iata_origin, iata_destination, time_departure, class, price
+    """,
+    "update_flight": """
+        UPDATE flights_calendar SET
+            available = TRUE,
+            time_departure = $1,
+            time_arrival = $2,
+            scale = $3,
+            price = $4,
+            total_duration = $5,
+            class = $6,
+            last_updated = NOW()
+        WHERE flight_key = $7
+        AND time_departure = $8
+    """,
+    "insert_flight": """
+        INSERT INTO flights_calendar (
+            available, flight_key, flight_signature, provider, airline, iata_origin, iata_destination,
+            time_departure, time_arrival, scale, price, total_duration, class, last_updated
+        )
+        VALUES (TRUE, $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, NOW())
+        ON CONFLICT (iata_origin, iata_destination, time_departure, class) DO NOTHING
+    """,
+    "delete_sections": """
+        DELETE FROM flight_sections
+        WHERE flight_key = $1
+    """,
+    "insert_section": """
+        INSERT INTO flight_sections (
+            flight_key, section_index, flight_number, departure, arrival, origin, destination, equipment
+        )
+        VALUES($1, $2, $3, $4, $5, $6, $7, $8)
+    """,
+    # --- clock_timestamp(): Transitions Flushed In One Transaction Keep Their Order ---
+    "insert_price_history": """
+        INSERT INTO price_history_calendar (
+            flight_key, iata_origin, iata_destination, time_departure, time_arrival,
+            provider, airline, offer_class, scale, total_duration, price, recorded_at
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, clock_timestamp())
+        ON CONFLICT (flight_key, offer_class, price, time_departure) DO NOTHING
+    """,
+    # --- Deals ---
+    "get_stats_for_route": """
+        SELECT * FROM price_stats
+        WHERE iata_origin = $1
+        AND iata_destination = $2
+        AND offer_class = $3
+        AND period = $4
+    """,
+    # --- Stats, Monthly Min & The Flight Holding It, One Row Per (Route, Class, Month) Of The Arrays ---
+    "deal_context": """
+        SELECT
+            target.position,
+            stats.period IS NOT NULL AS has_stats,
+            stats.sample_size,
+            stats.median_price,
+            stats.min_price AS stats_min_price,
+            stats.q1,
+            stats.q3,
+            stats.iqr,
+            min_flight.price AS min_price,
+            encode(min_flight.flight_key, 'hex') AS min_price_hash_id,
+            min_flight.provider AS min_price_provider,
+            min_flight.airline AS min_price_airline,
+            min_flight.time_departure AS min_price_departure
+        FROM unnest($1::CHAR(3)[], $2::CHAR(3)[], $3::TEXT[], $4::TIMESTAMP[]) WITH ORDINALITY
+            AS target(iata_origin, iata_destination, seat_class, month_start, position)
+        LEFT JOIN price_stats stats
+            ON stats.iata_origin = target.iata_origin
+            AND stats.iata_destination = target.iata_destination
+            AND stats.offer_class = target.seat_class
+            AND stats.period = TO_CHAR(target.month_start, 'YYYY-MM')
+        LEFT JOIN LATERAL (
+            SELECT flight_key, provider, airline, time_departure, price
+            FROM flights_calendar
+            WHERE iata_origin = target.iata_origin
+            AND iata_destination = target.iata_destination
+            AND class = $5
+            AND available = TRUE
+            AND price IS NOT NULL
+            AND time_departure >= target.month_start
+            AND time_departure < target.month_start + INTERVAL '1 month'
+            ORDER BY price ASC
+            LIMIT 1
+        ) min_flight ON TRUE
+        ORDER BY target.position
+    """,
+    # --- Notifier ---
+    "get_airport_info": """
+        SELECT * FROM airports
+        WHERE iata_code = $1
+    """,
+    "was_notification_sent": """
+        SELECT 1 FROM notifications_sent
+        WHERE flight_key = $1 AND price = $2
+    """,
+    "was_notification_sent_channel": """
+        SELECT 1 FROM notifications_sent
+        WHERE flight_key = $1 AND price = $2 AND notified_channel = $3
+    """,
+    "mark_notification_sent": """
+        INSERT INTO notifications_sent (flight_key, price, notified_channel)
+        VALUES ($1, $2, $3)
+        ON CONFLICT DO NOTHING
+    """
+}
+
+
+# ---------- Min Price Shapes ----------
+# --- Optional Filters In A Fixed Order, "exclude_airlines" Is One Array Parameter ---
+MIN_PRICE_FILTERS:Tuple[Tuple[str, str], ...] = (
+    ("seat_class", "class = ${}"),
+    ("provider", "provider = ${}"),
+    ("airline", "airline = ${}"),
+    ("exclude_airlines", "airline <> ALL(${}::TEXT[])")
+)
+
+def min_price_shape(
+    return_full:bool,
+    **filters:Any
+) -> Tuple[str, List[Any]]:
+
+    # --- At Most 2^4 x 2 Shapes, Whatever The Argument Values ---
+    mask = "".join("1" if filters.get(key) else "0" for key, _ in MIN_PRICE_FILTERS)
+    values = [filters[key] for key, _ in MIN_PRICE_FILTERS if filters.get(key)]
+    return f'min_price:{"full" if return_full else "min"}:{mask}', values
+
+def min_price_sql(
+    name:str
+) -> str:
+
+    _, mode, mask = name.split(":")
+    conditions = [
+        "iata_origin = $1",
+        "iata_destination = $2",
+        "available = TRUE",
+        "time_departure >= $3",
+        "time_departure < $4"
+    ]
+    index = 4
+    for enabled, (_, condition) in zip(mask, MIN_PRICE_FILTERS):
+        if enabled == "1":
+            index += 1
+            conditions.append(condition.format(index))
+
+    query = f"""
+        SELECT {"*, encode(flight_key, 'hex') AS hash_id" if mode == "full" else 'MIN(price) AS min_price'}
+        FROM flights_calendar
+        WHERE {' AND '.join(conditions)}
+    """
+    return query + " ORDER BY price ASC LIMIT 1" if mode == "full" else query
+
+
+# ---------- Registry ----------
+class RegistryConnection(asyncpg.Connection):
+    __slots__ = ("prepared",)
+
+
+class StatementRegistry:
+    def __init__(self,
+        statements:Optional[Dict[str, str]] = None
+    ):
+        self.statements:Dict[str, str] = dict(statements or STATEMENTS)
+        self.metrics:Dict[str, WaitMetrics] = dict()
+
+    # --- Pool "init" Hook: Every New Connection Prepares The Canonical Set Once ---
+    async def init_connection(self,
+        conn:RegistryConnection
+    ) -> None:
+
+        conn.prepared = dict()
+        for name, query in self.statements.items():
+            conn.prepared[name] = await conn.prepare(query)
+
+    def sql(self,
+        name:str
+    ) -> str:
+
+        if name not in self.statements:
+            if not name.startswith("min_price:"):
+                raise KeyError(f'Unknown Statement: "{name}"')
+            self.statements[name] = min_price_sql(name)
+        return self.statements[name]
+
+    async def _statement(self,
+        conn:RegistryConnection,
+        name:str,
+        refresh:bool = False
+    ) -> PreparedStatement:
+
+        prepared = getattr(conn, "prepared", None)
+        if prepared is None:
+            prepared = conn.prepared = dict()
+        if refresh or name not in prepared:
+            prepared[name] = await conn.prepare(self.sql(name))
+        return prepared[name]
+
+
+# ---------- Execute ----------
+    async def _run(self,
+        conn:RegistryConnection,
+        name:str,
+        method:str,
+        *args:Any
+    ) -> Tuple[PreparedStatement, Any]:
+
+        started_at = monotonic()
+        statement = await self._statement(conn, name)
+        try:
+            result = await getattr(statement, method)(*args)
+        except asyncpg.InvalidCachedStatementError:
+            # --- Table Changed Under The Plan (Migration): Inside A Transaction The Connection Is Aborted ---
+            # --- & Only The Caller Can Retry It, Autocommit Calls Prepare Again Once ---
+            if conn.is_in_transaction():
+                conn.prepared.pop(name, None)
+                raise
+            statement = await self._statement(conn, name, refresh = True)
+            result = await getattr(statement, method)(*args)
+
+        self.metrics.setdefault(name, WaitMetrics()).record(monotonic() - started_at)
+        return statement, result
+
+    async def fetch(self,
+        conn:RegistryConnection,
+        name:str,
+        *args:Any
+    ) -> List[asyncpg.Record]:
+        return (await self._run(conn, name, "fetch", *args))[1]
+
+    async def fetchrow(self,
+        conn:RegistryConnection,
+        name:str,
+        *args:Any
+    ) -> Optional[asyncpg.Record]:
+        return (await self._run(conn, name, "fetchrow", *args))[1]
+
+    # --- Same Status String As "conn.execute" ("INSERT 0 1") ---
+    async def execute(self,
+        conn:RegistryConnection,
+        name:str,
+        *args:Any
+    ) -> str:
+
+        statement, _ = await self._run(conn, name, "fetch", *args)
+        return statement.get_statusmsg()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: metrics.to_dict()
+            for name, metrics in sorted(self.metrics.items())
+        }
@@ -1,10 +1,10 @@
 
-import dotenv
-from datetime import datetime
-from pymongo import ASCENDING
-from pymongo.errors import PyMongoError
+import asyncio, dotenv, jwt
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import PyMongoError, OperationFailure, DuplicateKeyError
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, Dict, Tuple, List
+from typing import Optional, Dict, Tuple, List, Literal, AsyncIterator
 
 from utils.tools import SingletonClass
 from utils.exceptions import (    
@@ -14,10 +14,28 @@ from utils.exceptions import (
     CannotUpdateTokenError,
     CannotDeleteTokenError,
     InexistTokenError,
+    TokenAlreadyExists,
     DBTokensError
 )
 
 
+TokenEvent = Literal["snapshot", "add", "deactivate"]
+TokensExpiry = Dict[str, Optional[datetime]]
+# --- Mongo Error Code: Change Streams Need A Replica Set ---
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+DUPLICATE_KEY = 11000
+# --- Only Updates Touching "active" / "expires_at", Health Writes Never Reach The Watchers ---
+TOKEN_CHANGES_PIPELINE:List[Dict] = [
+    {"$match": {"$or": [
+        {"operationType": {"$in": ["insert", "replace", "delete"]}},
+        {"operationType": "update", "$or": [
+            {"updateDescription.updatedFields.active": {"$exists": True}},
+            {"updateDescription.updatedFields.expires_at": {"$exists": True}},
+            {"updateDescription.removedFields": {"$in": ["active", "expires_at"]}}
+        ]}
+    ]}}
+]
+
 
 class DBTokensManager(metaclass = SingletonClass):
     def __init__(self):
@@ -39,6 +57,20 @@ class DBTokensManager(metaclass = SingletonClass):
             )
             self._collection = self._mongo["Tokens"][website]
             await self._collection.create_index([("active", ASCENDING)])
+            await self._collection.create_index([("active", ASCENDING), ("expires_at", ASCENDING)])
+            # --- Concurrent Harvests Can Find The Same Token, The Index Keeps One ---
+            try:
+                await self._collection.create_index([("bearer_token", ASCENDING)], unique = True)
+            except OperationFailure as err:
+                if err.code != DUPLICATE_KEY:
+                    raise
+                raise DBCannotConnectError(
+                    f'{self._message} Duplicate Bearer Tokens Stored, Run "utils/DB/migrations/005_unique_bearer_tokens.py" First...',
+                    context = {
+                        "error_type": type(err).__name__,
+                        "error_msg": str(err)
+                    }
+                )
             return True, f'{self._message} Database Connected | Collection: {website}'
 
         except PyMongoError as err:
@@ -78,9 +110,13 @@ class DBTokensManager(metaclass = SingletonClass):
             await self._collection.insert_one({
                 "active": True,
                 "bearer_token": bearer_token,
-                "inserted_at": datetime.now()
+                "inserted_at": datetime.now(),
+                "expires_at": type(self).parse_token_expiry(bearer_token)
             })
             return True, f'{self._message} Token Saved Successfully'
+
+        except DuplicateKeyError:
+            raise TokenAlreadyExists(f'{self._message} Token ...{bearer_token[-25:]} Already Saved')
         
         except PyMongoError as err:
             raise CannotSetTokenError(
@@ -110,6 +146,28 @@ class DBTokensManager(metaclass = SingletonClass):
                 }
             )
 
+    # --- Count Tokens Usable By The Producer ---
+    async def count_usable_tokens(self,
+        margin_seconds:float = 0
+    ) -> int:
+
+        try:
+            return await self._collection.count_documents({
+                "active": True,
+                "$or": [
+                    {"expires_at": None},
+                    {"expires_at": {"$gt": datetime.now() + timedelta(seconds = margin_seconds)}}
+                ]
+            })
+
+        except PyMongoError as err:
+            raise CannotGetTokenError(
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
     # --- Update Specific Token ---
     async def update_token(self, 
         bearer_token:str
@@ -132,6 +190,91 @@ class DBTokensManager(metaclass = SingletonClass):
                 }
             )
 
+    # --- Retire Expired Tokens Without Probes ---
+    async def deactivate_expired_tokens(self,
+        margin_seconds:float = 0
+    ) -> Tuple[bool, int]:
+
+        try:
+            result = await self._collection.update_many(
+                {
+                    "active": True,
+                    "expires_at": {"$ne": None, "$lte": datetime.now() + timedelta(seconds = margin_seconds)}
+                },
+                {"$set": {"active": False}}
+            )
+            return bool(result.modified_count), result.modified_count
+
+        except PyMongoError as err:
+            raise CannotUpdateTokenError(
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Passive Health From Producer Traffic ---
+    async def report_tokens_health(self,
+        reports:Dict[str, Dict[str, int]]
+    ) -> Tuple[bool, int]:
+
+        try:
+            now = datetime.now()
+            operations = list()
+            for bearer_token, outcomes in reports.items():
+                successes = outcomes.get("success", 0)
+                auth_failures = outcomes.get("expired", 0) + outcomes.get("unauthorized", 0)
+
+                update = {
+                    "$inc": {f'health.{outcome}': total for outcome, total in outcomes.items()},
+                    "$set": {"health.last_seen": now}
+                }
+                if successes:
+                    update["$set"]["health.last_success"] = now
+                if auth_failures:
+                    update["$set"]["health.last_auth_failure"] = now
+
+                # --- Auth Failures Since Last Success ---
+                if successes and not auth_failures:
+                    update["$set"]["health.auth_failures_since_success"] = 0
+                elif auth_failures and not successes:
+                    update["$inc"]["health.auth_failures_since_success"] = auth_failures
+                elif auth_failures:
+                    update["$set"]["health.auth_failures_since_success"] = auth_failures
+
+                operations.append(UpdateOne({"bearer_token": bearer_token}, update))
+
+            if not operations:
+                return False, 0
+            result = await self._collection.bulk_write(operations, ordered = False)
+            return True, result.modified_count
+
+        except PyMongoError as err:
+            raise CannotUpdateTokenError(
+                f'{self._message} Error Reporting Tokens Health...',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Return Active Tokens Health ---
+    async def get_tokens_health(self) -> Dict[str, Dict]:
+        try:
+            tokens = await self._collection.find(
+                {"active": True},
+                {"bearer_token": 1, "health": 1}
+            ).to_list(length = None)
+            return {token["bearer_token"]: token.get("health", dict()) for token in tokens}
+
+        except PyMongoError as err:
+            raise CannotGetTokenError(
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
     # --- Delete Specific Token ---
     async def delete_token(self, 
         bearer_token:str
@@ -172,3 +315,125 @@ class DBTokensManager(metaclass = SingletonClass):
                 }
             )
 
+
+# ---------- Watch Tokens ----------
+    # --- Push Tokens Events (Change Streams Or Polling) ---
+    async def watch_tokens(self,
+        poll_delay:float = 10
+    ) -> AsyncIterator[Tuple[TokenEvent, TokensExpiry]]:
+
+        polling = False
+        try:
+            async with self._collection.watch(
+                TOKEN_CHANGES_PIPELINE,
+                full_document = "updateLookup"
+            ) as stream:
+                # --- Snapshot After Opening Stream, No Change Is Lost ---
+                known_tokens = await self._active_tokens_by_id()
+                yield "snapshot", dict(known_tokens.values())
+
+                async for change in stream:
+                    event = type(self)._parse_token_change(change, known_tokens)
+                    if event:
+                        yield event
+
+        except OperationFailure as err:
+            if err.code != CHANGE_STREAM_NOT_SUPPORTED:
+                raise CannotGetTokenError(
+                    f'{self._message} Error While Watching Tokens...',
+                    context = {
+                        "error_type": type(err).__name__,
+                        "error_msg": str(err)
+                    }
+                )
+            # --- Standalone Mongo, Fallback To Polling (Outside The Handler, Its Errors Get Wrapped Too) ---
+            polling = True
+
+        except PyMongoError as err:
+            raise CannotGetTokenError(
+                f'{self._message} Error While Watching Tokens...',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+        if not polling:
+            return
+        try:
+            async for event in self._poll_tokens(poll_delay):
+                yield event
+
+        except PyMongoError as err:
+            raise CannotGetTokenError(
+                f'{self._message} Error While Polling Tokens...',
+                context = {
+                    "error_type": type(err).__name__,
+                    "error_msg": str(err)
+                }
+            )
+
+    # --- Polling Fallback ---
+    async def _poll_tokens(self,
+        poll_delay:float
+    ) -> AsyncIterator[Tuple[TokenEvent, TokensExpiry]]:
+
+        current_tokens:TokensExpiry = dict((await self._active_tokens_by_id()).values())
+        yield "snapshot", current_tokens
+
+        while True:
+            await asyncio.sleep(poll_delay)
+            new_tokens:TokensExpiry = dict((await self._active_tokens_by_id()).values())
+
+            if added := new_tokens.keys() - current_tokens.keys():
+                yield "add", {token: new_tokens[token] for token in added}
+            if removed := current_tokens.keys() - new_tokens.keys():
+                yield "deactivate", {token: current_tokens[token] for token in removed}
+            current_tokens = new_tokens
+
+    async def _active_tokens_by_id(self) -> Dict[object, Tuple[str, Optional[datetime]]]:
+        tokens = await self._collection.find(
+            {"active": True},
+            {"bearer_token": 1, "expires_at": 1}
+        ).to_list(length = None)
+        return {
+            token["_id"]: (token["bearer_token"], token.get("expires_at"))
+            for token in tokens
+        }
+
+    @staticmethod
+    def _parse_token_change(
+        change:Dict,
+        known_tokens:Dict[object, Tuple[str, Optional[datetime]]]
+    ) -> Optional[Tuple[TokenEvent, TokensExpiry]]:
+
+        document_id = change["documentKey"]["_id"]
+        document = change.get("fullDocument") or dict()
+
+        if change["operationType"] != "delete" and document.get("active"):
+            if document_id in known_tokens:
+                return None
+            known_tokens[document_id] = (document["bearer_token"], document.get("expires_at"))
+            return "add", dict([known_tokens[document_id]])
+
+        token_data = known_tokens.pop(document_id, None)
+        return ("deactivate", dict([token_data])) if token_data else None
+
+
+# ---------- Tools ----------
+    # --- JWT "exp" Claim, None If Token Carries No Expiry ---
+    @staticmethod
+    def parse_token_expiry(
+        bearer_token:str
+    ) -> Optional[datetime]:
+
+        try:
+            payload = jwt.decode(
+                bearer_token,
+                options = {"verify_signature": False, "verify_exp": False}
+            )
+        except jwt.PyJWTError:
+            return None
+
+        expiry = payload.get("exp")
+        return datetime.fromtimestamp(expiry) if isinstance(expiry, (int, float)) else None
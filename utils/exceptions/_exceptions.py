@@ -45,6 +45,18 @@ class GdsResponseError(ScrapersError):
     gen_message = "Error, GDS Response Invalid..."
 class SiteServiceDown(ScrapersError):
     gen_message = "Error, API Currently Out Of Service..."
+class SchemaDriftError(ScrapersError):
+    gen_message = "Error, Response Schema Has Drifted From The Parser Spec..."
+class ReplayFixturesError(ScrapersError):
+    gen_message = "Error, Replay Fixtures Store Is Empty Or Invalid..."
+
+
+# ---------- Producer Exceptions ----------
+class ProducerFlightsError(CronosFlightsExceptions):
+    gen_message = "General Error Related To ProducerFlights..."
+
+class ProducerWorkerProcessError(ProducerFlightsError):
+    gen_message = "Error, A Producer Worker Process Has Died Unexpectedly..."
 
 
 # ---------- MongoDB Exceptions ----------
@@ -89,6 +101,8 @@ class DBFlightsUpdateFlightError(DBFlightsError):
     gen_message = "Error Updating Flight To Database..."
 class ExportTableFlightError(DBFlightsError):
     gen_message = "Error Cannot Export Table..."
+class DBFlightsPartitionError(DBFlightsError):
+    gen_message = "Error Managing Monthly Partitions..."
 
 # ---------- Kafka Exceptions ----------
 class KafkaManagerError(CronosFlightsExceptions):
@@ -118,11 +132,17 @@ class ReturnMinMonthlyError(DealsAnalyzerManager):
     gen_message = "Error Occurred While Getting IQR...."
 class ReturnMinDailyError(DealsAnalyzerManager):
     gen_message = "Error Occurred While Returning Daily Min..."
+class ReturnDealContextError(DealsAnalyzerManager):
+    gen_message = "Error Occurred While Returning Deal Context..."
+class PriceSketchError(DealsAnalyzerManager):
+    gen_message = "Error Occurred While Managing Price Sketches..."
 
 class CheckerDealsExtremeError(DealsAnalyzerManager):
     gen_message = "Error Occurred While Checking Extreme Deal...."
 class CheckerDealsLowestMonthError(DealsAnalyzerManager):
     gen_message = "Error Occurred When Analyze Lowest Monthly Price...."
+class DealsBacktestError(DealsAnalyzerManager):
+    gen_message = "Error Occurred While Backtesting Deal Rules..."
 
 
 # ---------- Notifys Exceptions ----------
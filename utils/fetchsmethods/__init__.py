@@ -1 +1,7 @@
-from .fetchs import FetchsMethodsClass
\ No newline at end of file
+from .fetchs import FetchsMethodsClass
+from .pooled_transport import (
+    PooledFetchsMethodsClass,
+    PooledTransport,
+    TransportMetrics,
+    TRANSPORT_ERRORS
+)
\ No newline at end of file
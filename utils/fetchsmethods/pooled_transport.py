@@ -0,0 +1,418 @@
+import asyncio, socket, ssl, zlib, orjson, httpcore
+from time import monotonic
+from urllib.parse import urlsplit
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Optional, Any, Dict, List, Tuple, Iterable, AsyncIterator
+
+from utils.tools import SingletonClass
+from utils.fetchsmethods.fetchs import FetchsMethodsClass
+
+# --- HTTP/2 Needs "h2", Without It Pools Stay On HTTP/1.1 Keep-Alive ---
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+TRANSPORT_ERRORS = (
+    httpcore.TimeoutException,
+    httpcore.NetworkError,
+    httpcore.ProtocolError,
+    httpcore.UnsupportedProtocol,
+    httpcore.ProxyError
+)
+# --- Only Encodings Decoded Here, "br"/"zstd" Would Need Extra Packages ---
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+@dataclass(slots = True)
+class TransportMetrics:
+    requests:int = 0
+    errors:int = 0
+    new_connections:int = 0
+    reused_connections:int = 0
+    connect_time:float = 0.0
+    tls_time:float = 0.0
+    wait_time:float = 0.0
+    max_wait_time:float = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.new_connections + self.reused_connections
+        return self.reused_connections / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        served = max(1, self.new_connections + self.reused_connections)
+        return {
+            **asdict(self),
+            "reuse_ratio": round(self.reuse_ratio, 4),
+            "avg_wait_time": round(self.wait_time / served, 6),
+            "avg_tls_time": round(self.tls_time / max(1, self.new_connections), 6)
+        }
+
+
+# ---------- DNS Cache ----------
+class CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self,
+        ttl:float = 300,
+        backend:Optional[httpcore.AsyncNetworkBackend] = None
+    ):
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache:Dict[Tuple[str, int], Tuple[float, List[str]]] = dict()
+        self._locks:Dict[Tuple[str, int], asyncio.Lock] = dict()
+        self.hits:int = 0
+        self.misses:int = 0
+
+    # --- TLS Still Uses The Hostname (SNI), Only TCP Gets The IP ---
+    async def connect_tcp(self,
+        host:str,
+        port:int,
+        timeout:Optional[float] = None,
+        local_address:Optional[str] = None,
+        socket_options:Optional[Iterable] = None
+    ) -> httpcore.AsyncNetworkStream:
+
+        addresses = await self.resolve(host, port)
+        last_error:Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout = timeout,
+                    local_address = local_address,
+                    socket_options = socket_options
+                )
+            except httpcore.ConnectError as err:
+                last_error = err
+
+        # --- Every Cached Address Failed, Resolve Again Next Time ---
+        self._cache.pop((host, port), None)
+        raise last_error or httpcore.ConnectError(f'No Addresses Resolved For {host}')
+
+    async def resolve(self,
+        host:str,
+        port:int
+    ) -> List[str]:
+
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached and cached[0] > monotonic():
+            self.hits += 1
+            return cached[1]
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            cached = self._cache.get(key)
+            if cached and cached[0] > monotonic():
+                self.hits += 1
+                return cached[1]
+
+            self.misses += 1
+            try:
+                records = await asyncio.get_running_loop().getaddrinfo(host, port, type = socket.SOCK_STREAM)
+            except socket.gaierror as err:
+                raise httpcore.ConnectError(f'DNS Resolution Failed For {host} | {str(err)}') from err
+
+            addresses = list(dict.fromkeys(record[4][0] for record in records))
+            self._cache[key] = (monotonic() + self.ttl, addresses)
+            return addresses
+
+    async def connect_unix_socket(self,
+        path:str,
+        timeout:Optional[float] = None,
+        socket_options:Optional[Iterable] = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout = timeout, socket_options = socket_options)
+
+    async def sleep(self,
+        seconds:float
+    ) -> None:
+        await self._backend.sleep(seconds)
+
+
+# ---------- Shared Pools, One Per Host ----------
+class PooledTransport(metaclass = SingletonClass):
+    def __init__(self):
+        self.enabled:bool = True
+        self.max_connections_per_host:int = 64
+        self.max_keepalive_per_host:Optional[int] = None
+        self.keepalive_expiry:float = 30
+        self.http2:bool = HTTP2_AVAILABLE
+        self.pool_timeout:float = 10
+        self._ssl_context = ssl.create_default_context()
+        self._dns = CachedDNSBackend()
+        self._pools:Dict[str, httpcore.AsyncConnectionPool] = dict()
+        self._metrics:Dict[str, TransportMetrics] = dict()
+
+    # --- Applies To Pools Created Afterwards ---
+    def configure(self,
+        enabled:Optional[bool] = None,
+        max_connections_per_host:Optional[int] = None,
+        max_keepalive_per_host:Optional[int] = None,
+        keepalive_expiry:Optional[float] = None,
+        http2:Optional[bool] = None,
+        dns_ttl:Optional[float] = None,
+        pool_timeout:Optional[float] = None
+    ) -> None:
+
+        if enabled is not None:
+            self.enabled = enabled
+        if max_connections_per_host:
+            self.max_connections_per_host = max_connections_per_host
+        if max_keepalive_per_host:
+            self.max_keepalive_per_host = max_keepalive_per_host
+        if keepalive_expiry is not None:
+            self.keepalive_expiry = keepalive_expiry
+        if http2 is not None:
+            self.http2 = http2 and HTTP2_AVAILABLE
+        if dns_ttl is not None:
+            self._dns.ttl = dns_ttl
+        if pool_timeout is not None:
+            self.pool_timeout = pool_timeout
+
+
+# ---------- Requests ----------
+    async def request(self,
+        method:str,
+        url:str,
+        headers:List[Tuple[str, str]],
+        timeout:float = 10
+    ) -> Tuple[int, bytes]:
+
+        async with self.stream(method, url, headers, timeout) as response:
+            return response.status, await type(self).read_decoded(response)
+
+    @asynccontextmanager
+    async def stream(self,
+        method:str,
+        url:str,
+        headers:List[Tuple[str, str]],
+        timeout:float = 10
+    ) -> AsyncIterator[httpcore.Response]:
+
+        host = urlsplit(url).netloc
+        metrics = self._metrics.setdefault(host, TransportMetrics())
+        trace = _RequestTrace(monotonic())
+        metrics.requests += 1
+        try:
+            async with self._get_pool(url, host).stream(
+                method,
+                url,
+                headers = headers,
+                extensions = {
+                    "timeout": {
+                        "connect": timeout,
+                        "read": timeout,
+                        "write": timeout,
+                        "pool": self.pool_timeout
+                    },
+                    "trace": trace
+                }
+            ) as response:
+                trace.record(metrics)
+                yield response
+
+        except TRANSPORT_ERRORS:
+            metrics.errors += 1
+            raise
+
+    def _get_pool(self,
+        url:str,
+        host:str
+    ) -> httpcore.AsyncConnectionPool:
+
+        pool = self._pools.get(host)
+        if not pool:
+            pool = httpcore.AsyncConnectionPool(
+                ssl_context = self._ssl_context,
+                max_connections = self.max_connections_per_host,
+                max_keepalive_connections = self.max_keepalive_per_host or self.max_connections_per_host,
+                keepalive_expiry = self.keepalive_expiry,
+                http1 = True,
+                http2 = self.http2 and url.startswith("https"),
+                network_backend = self._dns
+            )
+            self._pools[host] = pool
+        return pool
+
+
+# ---------- Metrics ----------
+    def metrics(self,
+        host:Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+
+        return {
+            pool_host: metrics.to_dict()
+            for pool_host, metrics in self._metrics.items()
+            if host is None or pool_host == host
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        total = TransportMetrics()
+        for metrics in self._metrics.values():
+            total.requests += metrics.requests
+            total.errors += metrics.errors
+            total.new_connections += metrics.new_connections
+            total.reused_connections += metrics.reused_connections
+            total.wait_time += metrics.wait_time
+            total.max_wait_time = max(total.max_wait_time, metrics.max_wait_time)
+        return {
+            "hosts": len(self._pools),
+            "requests": total.requests,
+            "errors": total.errors,
+            "connections": total.new_connections,
+            "reuse_ratio": round(total.reuse_ratio, 4),
+            "max_wait_time": round(total.max_wait_time, 4),
+            "dns_hits": self._dns.hits,
+            "dns_misses": self._dns.misses
+        }
+
+
+# ---------- Tools ----------
+    async def aclose(self) -> None:
+        for pool in self._pools.values():
+            await pool.aclose()
+        self._pools.clear()
+
+    @staticmethod
+    def decoder(
+        response:httpcore.Response
+    ) -> Optional[Any]:
+
+        encoding = dict(
+            (name.lower(), value.lower()) for name, value in response.headers
+        ).get(b'content-encoding', b'')
+        if encoding == b'gzip':
+            return zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if encoding == b'deflate':
+            return zlib.decompressobj()
+        return None
+
+    @staticmethod
+    async def iter_decoded(
+        response:httpcore.Response
+    ) -> AsyncIterator[bytes]:
+
+        decoder = PooledTransport.decoder(response)
+        async for chunk in response.aiter_stream():
+            yield decoder.decompress(chunk) if decoder else chunk
+
+    @staticmethod
+    async def read_decoded(
+        response:httpcore.Response
+    ) -> bytes:
+        return b''.join([chunk async for chunk in PooledTransport.iter_decoded(response)])
+
+
+# ---------- Per-Request Trace ----------
+class _RequestTrace:
+    __slots__ = ("started_at", "events")
+
+    def __init__(self,
+        started_at:float
+    ):
+        self.started_at = started_at
+        self.events:Dict[str, float] = dict()
+
+    async def __call__(self,
+        event_name:str,
+        info:Dict[str, Any]
+    ) -> None:
+        self.events.setdefault(event_name, monotonic())
+
+    # --- Wait = Time Before Sending Headers Not Spent Connecting ---
+    def record(self,
+        metrics:TransportMetrics
+    ) -> None:
+
+        events = self.events
+        sent_at = events.get("http11.send_request_headers.started") or events.get("http2.send_request_headers.started")
+        connect_time = type(self)._duration(events, "connection.connect_tcp")
+        tls_time = type(self)._duration(events, "connection.start_tls")
+
+        if "connection.connect_tcp.started" in events:
+            metrics.new_connections += 1
+            metrics.connect_time += connect_time
+            metrics.tls_time += tls_time
+        else:
+            metrics.reused_connections += 1
+
+        if sent_at:
+            wait_time = max(0.0, sent_at - self.started_at - connect_time - tls_time)
+            metrics.wait_time += wait_time
+            metrics.max_wait_time = max(metrics.max_wait_time, wait_time)
+
+    @staticmethod
+    def _duration(
+        events:Dict[str, float],
+        name:str
+    ) -> float:
+
+        started, completed = events.get(f'{name}.started'), events.get(f'{name}.complete')
+        return completed - started if started and completed else 0.0
+
+
+# ---------- FetchsMethodsClass Over The Shared Pools ----------
+class PooledFetchsMethodsClass(FetchsMethodsClass):
+    @property
+    def transport(self) -> PooledTransport:
+        return PooledTransport()
+
+    # --- Same Contract As "FetchsMethodsClass.fetch_GET": (Status, Response) Or (False, Error) ---
+    async def fetch_GET(self,
+        url:str,
+        proxy:Optional[str] = None,
+        timeout_seconds:float = 10,
+        return_json:bool = False,
+        headers:Optional[Dict[str, str]] = None,
+        header_order:Optional[List[str]] = None,
+        **kwargs
+    ) -> Tuple[Any, Any]:
+
+        # --- Proxied Requests Or Disabled Pool Keep The Original Client ---
+        if proxy or not self.transport.enabled:
+            return await super().fetch_GET(
+                url = url,
+                proxy = proxy,
+                timeout_seconds = timeout_seconds,
+                return_json = return_json,
+                headers = headers,
+                header_order = header_order,
+                **kwargs
+            )
+
+        try:
+            status_code, content = await self.transport.request(
+                "GET",
+                url,
+                headers = type(self).ordered_headers(url, headers or dict(), header_order),
+                timeout = timeout_seconds
+            )
+        except TRANSPORT_ERRORS as err:
+            return False, f'{type(err).__name__}: {str(err)}'
+
+        if return_json:
+            try:
+                return status_code, orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        return status_code, content.decode("utf-8", errors = "replace")
+
+    @staticmethod
+    def ordered_headers(
+        url:str,
+        headers:Dict[str, str],
+        header_order:Optional[List[str]] = None
+    ) -> List[Tuple[str, str]]:
+
+        headers = {name.lower(): value for name, value in headers.items()}
+        headers.setdefault("host", urlsplit(url).netloc)
+        if "accept-encoding" in headers:
+            headers["accept-encoding"] = ACCEPT_ENCODING
+
+        order = ["host"] + [name for name in (header_order or list()) if name in headers and name != "host"]
+        order += [name for name in headers if name not in order]
+        return [(name, headers[name]) for name in order]
@@ -1,6 +1,6 @@
 import json, asyncio, dotenv
-from typing import Optional, Callable, Awaitable, Any, Set
-from aiokafka import AIOKafkaConsumer
+from typing import Optional, Callable, Awaitable, Any, Dict, Set
+from aiokafka import AIOKafkaConsumer, TopicPartition, ConsumerRebalanceListener
 from aiokafka.errors import KafkaConnectionError, KafkaError
 from utils.tools import SingletonClass
 from utils.exceptions import (
@@ -10,14 +10,35 @@ from utils.exceptions import (
     KafkaConsumerError
 )
 
+# --- Revoked Partitions: Commit What Finished, Then Forget Their Offsets ---
+class OffsetsRebalanceListener(ConsumerRebalanceListener):
+    def __init__(self,
+        manager:"KafkaConsumerManager"
+    ):
+        self.manager = manager
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        await self.manager.commit_offsets()
+        self.manager.forget_partitions(revoked)
+
+    async def on_partitions_assigned(self, assigned) -> None:
+        pass
+
+
 class KafkaConsumerManager(metaclass = SingletonClass):
     def __init__(self,
         topic:str,
         group_id:str,
-        max_workers:int = 1000
+        max_workers:int = 1000,
+        enable_auto_commit:bool = True,
+        max_retries:int = 3,
+        retry_delay:float = 1.0
     ):
         self.topic = topic
         self.group_id = group_id
+        self.enable_auto_commit = enable_auto_commit
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
         self._configs = dotenv.dotenv_values()
         self.client:Optional[AIOKafkaConsumer] = None
         
@@ -26,6 +47,13 @@ class KafkaConsumerManager(metaclass = SingletonClass):
         self.tasks:Set[asyncio.Task] = set()
         self._running = False
         self._message:str = f'[Kafka Consumer Manager]'
+        # --- Manual Commits: Offsets Still Being Handled & Highest Finished, Per Partition ---
+        self._in_flight:Dict[TopicPartition, Set[int]] = dict()
+        self._highest_done:Dict[TopicPartition, int] = dict()
+        self._commit_task:Optional[asyncio.Task] = None
+        # --- First Message That Kept Failing, It Stops The Consumer ---
+        self._failure:Optional[Exception] = None
+        self._consume_task:Optional[asyncio.Task] = None
 
 # ---------- Load Configs ----------
     async def load_configs(self) -> None:
@@ -38,12 +66,12 @@ class KafkaConsumerManager(metaclass = SingletonClass):
                 await self.load_configs()
 
                 self.client = AIOKafkaConsumer(
-                    self.topic,
                     bootstrap_servers = self._configs["KAFKA_HOST"],
                     group_id = self.group_id,
                     auto_offset_reset = "latest",
-                    enable_auto_commit = True
+                    enable_auto_commit = self.enable_auto_commit
                 )
+                self.client.subscribe([self.topic], listener = OffsetsRebalanceListener(self))
                 await self.client.start()
 
         except KafkaError as err:
@@ -77,19 +105,23 @@ class KafkaConsumerManager(metaclass = SingletonClass):
         handler:Callable[[dict], Awaitable[Any]]
     ) -> None:
         
+        self._consume_task = asyncio.current_task()
         try:
             await self.connect_broker()
             self._running = True
         
             async for msg in self.client:
+                partition = TopicPartition(msg.topic, msg.partition)
+                self._in_flight.setdefault(partition, set()).add(msg.offset)
                 try:
                     message = json.loads(msg.value.decode("utf-8"))
                 except Exception as err:
                     # I must find a better way to process these errors
                     #print(f'{self._message} Error Invalid JSON: {err}')
+                    self._mark_done(partition, msg.offset)
                     continue
 
-                task = asyncio.create_task(self._process_message(message, handler))
+                task = asyncio.create_task(self._process_message(message, handler, partition, msg.offset))
                 self.tasks.add(task)
                 task.add_done_callback(self.tasks.discard)
 
@@ -106,8 +138,20 @@ class KafkaConsumerManager(metaclass = SingletonClass):
                     "error_msg": str(err)
                 }
             )
+
+        except asyncio.CancelledError:
+            if self._failure is None:
+                raise
+            raise KafkaConsumerError(
+                f'{self._message} Message Still Failing After {self.max_retries} Retries, Consumer Stopped...',
+                context = {
+                    "error_type": type(self._failure).__name__,
+                    "error_msg": str(self._failure)
+                }
+            )
         
         finally:
+            self._running = False
             await self._shutdown_tasks()
             await self.disconnect_broker()
 
@@ -115,21 +159,98 @@ class KafkaConsumerManager(metaclass = SingletonClass):
         if self.tasks:
             await asyncio.gather(*self.tasks, return_exceptions = True)
         self.tasks.clear()
+        await self.commit_offsets()
 
     async def _process_message(self, 
         message:dict,
-        handler:Callable[[dict], Awaitable[Any]]
+        handler:Callable[[dict], Awaitable[Any]],
+        partition:TopicPartition,
+        offset:int
     ) -> None:
         
         async with self.semaphore:
-            try:
-                await handler(message)
-
-            except Exception as err:
-                raise KafkaManagerError(
-                    context = {
-                        "error_type": type(err).__name__,
-                        "error_msg": str(err)
-                    }
-                )
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await handler(message)
+                    self._mark_done(partition, offset)
+                    return
+
+                except Exception as err:
+                    failure = err
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+            if self.enable_auto_commit:
+                # --- Auto Commit Already Moved Past It, Only The Bookkeeping Is Released ---
+                self._mark_done(partition, offset)
+            else:
+                self._stop_consuming(failure)
+            raise KafkaManagerError(
+                context = {
+                    "error_type": type(failure).__name__,
+                    "error_msg": str(failure)
+                }
+            )
+
+    # --- Manual Commits Would Stall Behind The Failed Offset: Stop, The Partition Replays From It On Restart ---
+    def _stop_consuming(self,
+        err:Exception
+    ) -> None:
+
+        if self._failure is not None or not self._running:
+            return
+        self._failure = err
+        self._running = False
+        if self._consume_task and not self._consume_task.done():
+            self._consume_task.cancel()
+
+
+
 
+# ---------- Manual Commits ----------
+    # --- Failed Messages Stay In Flight, Their Partition Replays From Them On Restart ---
+    def _mark_done(self,
+        partition:TopicPartition,
+        offset:int
+    ) -> None:
+
+        in_flight = self._in_flight.get(partition)
+        if in_flight is None:
+            # --- Revoked While Handled, The New Owner Replays It ---
+            return
+        in_flight.discard(offset)
+        self._highest_done[partition] = max(offset, self._highest_done.get(partition, -1))
+        if self.enable_auto_commit:
+            return
+        # --- One Commit Covers Every Handler Released By The Same Flush ---
+        if not self._commit_task or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self.commit_offsets())
+
+    def forget_partitions(self,
+        partitions:Set[TopicPartition]
+    ) -> None:
+
+        for partition in partitions:
+            self._in_flight.pop(partition, None)
+            self._highest_done.pop(partition, None)
+
+    async def commit_offsets(self) -> None:
+        if self.enable_auto_commit or not self.client:
+            return
+
+        assigned = self.client.assignment()
+        offsets = dict()
+        for partition, highest_done in self._highest_done.items():
+            if partition not in assigned:
+                continue
+            in_flight = self._in_flight.get(partition)
+            # --- Everything Below The Oldest Unfinished Offset Is Safe ---
+            offsets[partition] = min(in_flight) if in_flight else highest_done + 1
+
+        if not offsets:
+            return
+        try:
+            await self.client.commit(offsets)
+        except KafkaError:
+            # --- Rebalanced Or Broker Hiccup, The Next Flush Retries ---
+            pass
@@ -1,4 +1,4 @@
-import json, asyncio, dotenv
+import asyncio, dotenv, orjson
 from datetime import datetime
 from aiokafka import AIOKafkaProducer
 from aiokafka.errors import KafkaError
@@ -56,19 +56,23 @@ class KafkaProducerManager(metaclass = SingletonClass):
 # ---------- Main Method ----------
     async def publish_message(self,
         topic:str,
-        message:dict,
+        message:Union[dict, object],
         key:str = None
     ) -> Tuple[bool, str]:
         
-        if not isinstance(message, dict):
-            raise ValueError(f'{self._message} Message Must Be A Dictionary')
+        if not isinstance(message, dict) and not hasattr(message, "to_dict"):
+            raise ValueError(f'{self._message} Message Must Be A Dictionary Or Record With "to_dict"')
 
         try:
             await self.connect_broker()
 
             await self.client.send_and_wait(
                 topic = topic,
-                value = json.dumps(message, default = self.serialize_flight).encode("utf-8"),
+                value = orjson.dumps(
+                    message,
+                    default = self.serialize_flight,
+                    option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+                ),
                 key = key.encode("utf-8") if key else None,
             )
             return True, f'{self._message} Message Successfully Send | Topic: "{topic}"'
@@ -85,9 +89,12 @@ class KafkaProducerManager(metaclass = SingletonClass):
 # ---------- Tools  ----------
     def serialize_flight(self, 
         obj:Union[datetime, object]
-    ) -> str:
+    ) -> Union[str, dict]:
         
         if isinstance(obj, datetime):
             return obj.isoformat()
+        # --- Parser Records Keep The Published Message Shape ---
+        if hasattr(obj, "to_dict"):
+            return obj.to_dict()
         raise TypeError(f"Error Serializing Message. | Type: {type(obj)}")
 
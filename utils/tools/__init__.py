@@ -1,4 +1,10 @@
 from .singleton import SingletonClass
+from .lru_cache import PersistentLRUCache
+from .quantile_sketch import QuantileSketch
 from .date_tools import (
     random_date
-)
\ No newline at end of file
+)
+from .admission import (
+    AdmissionController,
+    WaitMetrics
+)
@@ -0,0 +1,128 @@
+import asyncio
+from time import monotonic
+from dataclasses import dataclass, asdict
+from typing import Optional, Any, Dict, List, Tuple, Callable, Awaitable
+
+
+@dataclass(slots = True)
+class WaitMetrics:
+    count:int = 0
+    total_time:float = 0.0
+    max_time:float = 0.0
+
+    def record(self,
+        elapsed:float
+    ) -> None:
+
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "avg_time": round(self.total_time / self.count, 6) if self.count else 0.0
+        }
+
+
+# ---------- Admission Controller ----------
+class AdmissionController:
+    def __init__(self,
+        workers:int = 20,
+        queue_size:int = 200
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue:Optional[asyncio.Queue] = None
+        self._workers:List[asyncio.Task] = list()
+        # --- Metrics ---
+        self.queue_wait = WaitMetrics()
+        self.submitted:int = 0
+        self.completed:int = 0
+        self.failed:int = 0
+        self.busy:int = 0
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize = self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.workers)
+        ]
+
+    async def close(self) -> None:
+        if not self._workers:
+            return
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions = True)
+        self._workers.clear()
+
+
+# ---------- Submit Work ----------
+    # --- Waits While The Queue Is Full: Bursts Back Up Into Kafka, Not Into Memory ---
+    async def submit(self,
+        func:Callable[..., Awaitable[Any]],
+        *args:Any
+    ) -> asyncio.Future:
+
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((monotonic(), future, func, args))
+        self.submitted += 1
+        return future
+
+    async def run(self,
+        func:Callable[..., Awaitable[Any]],
+        *args:Any
+    ) -> Any:
+        return await (await self.submit(func, *args))
+
+    async def map(self,
+        func:Callable[..., Awaitable[Any]],
+        args_list:List[Tuple[Any, ...]]
+    ) -> List[Any]:
+
+        futures = [await self.submit(func, *args) for args in args_list]
+        return await asyncio.gather(*futures, return_exceptions = True)
+
+    async def _worker(self) -> None:
+        while True:
+            enqueued_at, future, func, args = await self._queue.get()
+            self.queue_wait.record(monotonic() - enqueued_at)
+            self.busy += 1
+            try:
+                result = await func(*args)
+                if not future.done():
+                    future.set_result(result)
+                self.completed += 1
+
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+
+            except Exception as err:
+                if not future.done():
+                    future.set_exception(err)
+                self.failed += 1
+
+            finally:
+                self.busy -= 1
+                self._queue.task_done()
+
+
+# ---------- Metrics ----------
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait": self.queue_wait.to_dict()
+        }
@@ -0,0 +1,86 @@
+import json, os
+from pathlib import Path
+from collections import OrderedDict
+from typing import Optional, Union, Any, Dict, Hashable
+
+
+class PersistentLRUCache:
+    def __init__(self,
+        max_entries:int = 50_000,
+        path:Optional[Union[str, Path]] = None
+    ):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self._entries:OrderedDict = OrderedDict()
+        self.hits:int = 0
+        self.misses:int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self,
+        key:Hashable
+    ) -> bool:
+        return key in self._entries
+
+
+# ---------- Entries ----------
+    def get(self,
+        key:Hashable,
+        default:Any = None
+    ) -> Any:
+
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def set(self,
+        key:Hashable,
+        value:Any
+    ) -> None:
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last = False)
+
+    def pop(self,
+        key:Hashable,
+        default:Any = None
+    ) -> Any:
+        return self._entries.pop(key, default)
+
+
+# ---------- Persistence ----------
+    # --- Oldest First, So Reloading Keeps The Recency Order ---
+    def load(self) -> int:
+        if not self.path or not self.path.exists():
+            return 0
+        try:
+            entries = json.loads(self.path.read_text(encoding = "utf-8"))
+        except ValueError:
+            return 0
+
+        self._entries = OrderedDict(list(entries.items())[-self.max_entries:])
+        return len(self._entries)
+
+    # --- Write Then Rename, A Crash Never Leaves Half A File ---
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents = True, exist_ok = True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        temp_path.write_text(json.dumps(self._entries), encoding = "utf-8")
+        os.replace(temp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
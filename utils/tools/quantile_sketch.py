@@ -0,0 +1,165 @@
+import math, struct
+from array import array
+from typing import Optional, Union, Dict
+
+
+# --- Relative Accuracy, Zero Count, Sum, Sum Of Squares, First Bucket Key, Buckets ---
+HEADER = struct.Struct("<dIddiI")
+
+
+# --- Log-Bucketed Sketch (DDSketch): Every Estimate Within "relative_accuracy" Of The True Value ---
+# --- Counts Only, So Same-Accuracy Sketches Merge Exactly & A Changed Price Can Be Removed ---
+class QuantileSketch:
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "buckets", "zero_count", "total", "total_squares")
+
+    def __init__(self,
+        relative_accuracy:float = 0.01
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f'Invalid Relative Accuracy: {relative_accuracy}, Expected 0 < x < 1')
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets:Dict[int, int] = dict()
+        self.zero_count:int = 0
+        self.total:float = 0
+        self.total_squares:float = 0
+
+    def __len__(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def _key(self,
+        value:float
+    ) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self,
+        key:int
+    ) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+
+# ---------- Updates ----------
+    def add(self,
+        value:Union[int, float],
+        count:int = 1
+    ) -> None:
+
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.total += value * count
+        self.total_squares += value * value * count
+
+    # --- A Value Never Added Leaves The Sketch Untouched ---
+    def remove(self,
+        value:Union[int, float],
+        count:int = 1
+    ) -> bool:
+
+        if value <= 0:
+            if self.zero_count < count:
+                return False
+            self.zero_count -= count
+        else:
+            key = self._key(value)
+            if self.buckets.get(key, 0) < count:
+                return False
+            self.buckets[key] -= count
+            if not self.buckets[key]:
+                del self.buckets[key]
+        self.total -= value * count
+        self.total_squares -= value * value * count
+        return True
+
+    def merge(self,
+        other:"QuantileSketch"
+    ) -> None:
+
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f'Cannot Merge Sketches With Different Accuracy: {self.relative_accuracy} & {other.relative_accuracy}'
+            )
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.total += other.total
+        self.total_squares += other.total_squares
+
+
+# ---------- Estimates ----------
+    # --- Same Interpolation As PERCENTILE_CONT: Between The floor/ceil Of q * (n - 1) ---
+    def quantile(self,
+        q:float
+    ) -> Optional[float]:
+
+        count = len(self)
+        if not count:
+            return None
+        rank = q * (count - 1)
+        lower, upper = math.floor(rank), math.ceil(rank)
+        lower_value = self._ranked(lower)
+        upper_value = lower_value if upper == lower else self._ranked(upper)
+        return lower_value + (rank - lower) * (upper_value - lower_value)
+
+    def _ranked(self,
+        rank:int
+    ) -> float:
+
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return self._value(key)
+        return self._value(max(self.buckets))
+
+    def mean(self) -> Optional[float]:
+        count = len(self)
+        return self.total / count if count else None
+
+    # --- Sample Deviation, Same As STDDEV ---
+    def stddev(self) -> Optional[float]:
+        count = len(self)
+        if count < 2:
+            return None
+        variance = (self.total_squares - self.total * self.total / count) / (count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+# ---------- Serialization ----------
+    # --- Dense Run Of uint32 Counts: A Route-Month Spans A Few Hundred Bytes ---
+    def to_bytes(self) -> bytes:
+        first_key = min(self.buckets) if self.buckets else 0
+        counts = array("I", [0] * ((max(self.buckets) - first_key + 1) if self.buckets else 0))
+        for key, count in self.buckets.items():
+            counts[key - first_key] = count
+        return HEADER.pack(
+            self.relative_accuracy,
+            self.zero_count,
+            self.total,
+            self.total_squares,
+            first_key,
+            len(counts)
+        ) + counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls,
+        payload:bytes
+    ) -> "QuantileSketch":
+
+        relative_accuracy, zero_count, total, total_squares, first_key, size = HEADER.unpack_from(payload)
+        counts = array("I")
+        counts.frombytes(payload[HEADER.size:])
+        if len(counts) != size:
+            raise ValueError(f'Corrupt Sketch: Expected {size} Buckets, Found {len(counts)}')
+
+        sketch = cls(relative_accuracy)
+        sketch.zero_count = zero_count
+        sketch.total = total
+        sketch.total_squares = total_squares
+        sketch.buckets = {first_key + offset: count for offset, count in enumerate(counts) if count}
+        return sketch